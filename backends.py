@@ -0,0 +1,655 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import cv2
+
+# GPU/CPU kütüphaneleri opsiyonel - CPU-only makinelerde de import edilebilmeli
+try:
+    import tensorrt as trt
+except ImportError:
+    trt = None
+
+try:
+    import pycuda.driver as cuda
+except ImportError:
+    cuda = None
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# ONNX Runtime tensor tipi -> NumPy
+ORT_DTYPES = {
+    "tensor(float)": np.float32,
+    "tensor(float16)": np.float16,
+    "tensor(uint8)": np.uint8
+}
+
+
+def _is_fixed(dim):
+    """Boyut sabit mi? (dinamik eksenler -1, None veya isim olarak gelir)"""
+    return isinstance(dim, (int, np.integer)) and dim > 0
+
+
+class InferenceBackend:
+    """
+    Inference backend arayüzü
+
+    Detector preprocessing çıktısını get_input_buffer() ile dönen buffer'a yazar,
+    ardından infer() çağrılır ve ham model çıktısı (N, 4 + nc, anchors) döner.
+    Tensor adları, shape'leri ve veri tipleri model/engine'den okunur; buffer'lar
+    max_batch frame alacak şekilde ayrılır: ör. (max_batch, 3, 640, 640) float32
+    veya normalizasyonu grafa gömülmüş modellerde (prepare_model.py)
+    (max_batch, 640, 640, 3) uint8 - letterbox canvas'ı doğrudan. 320/416
+    girişli modeller aynı şekilde çalışır.
+
+    Asenkron kullanım için num_slots adet bağımsız input buffer'ı (slot) vardır:
+    submit(batch_size, slot) inference'ı başlatır ve hemen döner, wait(slot)
+    çıktıyı bekler. Bir slot çalışırken diğerine sonraki frame yazılabilir.
+    Varsayılan uygulama infer()'i bir worker thread havuzunda çalıştırır
+    (CPU backend'leri); TensorRT slot başına CUDA stream kullanır.
+    """
+    name = "base"
+
+    def __init__(self, input_shape=(1, 3, 640, 640), output_shape=(1, 5, 8400), verbose=False, max_batch=1,
+                 num_slots=1, workers=1):
+        self.max_batch = max_batch
+        self.input_shape = (max_batch,) + tuple(input_shape[1:])
+        self.output_shape = (max_batch,) + tuple(output_shape[1:])
+        self.input_dtype = np.float32
+        self.output_dtype = np.float32
+        self.uint8_input = False
+        self.input_name = "images"
+        self.output_name = "output0"
+        self.dynamic_batch = True
+        self.num_slots = max(1, num_slots)
+        self.workers = workers
+        self.verbose = verbose
+        self.input_buffer = None
+        self.input_buffers = []
+        self._executor = None
+        self._futures = {}
+        self._cleaned_up = False
+
+    def _configure_io(self, input_name, input_shape, input_dtype, output_name, output_shape):
+        """
+        Model/engine'den okunan tensor bilgileriyle buffer boyutlarını ayarla
+
+        Sadece batch ekseni dinamik olabilir; output'un diğer eksenleri
+        bilinmiyorsa output_shape None kalır (_probe_output_shape ile bulunur).
+        """
+        if len(input_shape) != 4 or not all(_is_fixed(d) for d in input_shape[1:]):
+            raise RuntimeError(f"❌ {input_name}: sabit (N, C, H, W) / (N, H, W, C) input bekleniyordu: {input_shape}")
+
+        self.input_name = input_name
+        self.output_name = output_name
+        self.dynamic_batch = not _is_fixed(input_shape[0])
+        self.input_dtype = np.dtype(input_dtype).type
+        self.uint8_input = self.input_dtype == np.uint8
+        if self.uint8_input and input_shape[-1] != 3:
+            raise RuntimeError(f"❌ {input_name}: uint8 input NHWC olmalı: {input_shape}")
+
+        self.input_shape = (self.max_batch,) + tuple(int(d) for d in input_shape[1:])
+        if len(output_shape) == 3 and all(_is_fixed(d) for d in output_shape[1:]):
+            self.output_shape = (self.max_batch,) + tuple(int(d) for d in output_shape[1:])
+        else:
+            self.output_shape = None
+
+    def _probe_output_shape(self):
+        """Output shape'i modelden okunamadıysa boş bir frame ile çalıştırarak bul"""
+        self.input_buffers[0][:1] = 0
+        output = self.infer(1)
+        self.output_shape = (self.max_batch,) + tuple(output.shape[1:])
+
+    @property
+    def input_size(self):
+        """Model giriş boyutu (yükseklik, genişlik)"""
+        if self.uint8_input:
+            return tuple(self.input_shape[1:3])
+        return tuple(self.input_shape[2:4])
+
+    @property
+    def num_classes(self):
+        return self.output_shape[1] - 4
+
+    @property
+    def num_anchors(self):
+        return self.output_shape[2]
+
+    def describe(self):
+        """Tensor adları, shape'leri ve veri tipleri (log / tanı için)"""
+        return {
+            "backend": self.name,
+            "input": self.input_name,
+            "input_shape": self.input_shape,
+            "input_dtype": np.dtype(self.input_dtype).name,
+            "input_size": self.input_size,
+            "output": self.output_name,
+            "output_shape": self.output_shape,
+            "output_dtype": np.dtype(self.output_dtype).name,
+            "num_classes": self.num_classes,
+            "num_anchors": self.num_anchors,
+            "dynamic_batch": self.dynamic_batch
+        }
+
+    def _set_uint8_input(self):
+        """Input'u uint8 NHWC düzenine geçir (cast/normalize/transpose modelde)"""
+        _, c, h, w = self.input_shape
+        self.input_shape = (self.max_batch, h, w, c)
+        self.input_dtype = np.uint8
+        self.uint8_input = True
+        if self.verbose:
+            print(f"✅ uint8 NHWC input: {self.input_shape}")
+
+    def _allocate_input_buffers(self):
+        """Slot başına host input buffer'ı (slot 0 = input_buffer)"""
+        self.input_buffers = [np.empty(self.input_shape, dtype=self.input_dtype) for _ in range(self.num_slots)]
+        self.input_buffer = self.input_buffers[0]
+
+    def get_input_buffer(self, slot=0):
+        """Preprocessing'in yazacağı input buffer"""
+        if self.input_buffers:
+            return self.input_buffers[slot]
+        return self.input_buffer
+
+    def infer(self, batch_size=1, slot=0):
+        """
+        Input buffer'ın ilk batch_size frame'i üzerinde inference çalıştır
+
+        Args:
+            batch_size: Buffer'a yazılmış frame sayısı (<= max_batch)
+            slot: Kullanılacak input buffer'ı
+
+        Returns:
+            output: Ham model çıktısı (batch_size, 4 + nc, anchors)
+        """
+        raise NotImplementedError
+
+    def submit(self, batch_size=1, slot=0):
+        """Slot'taki input için inference'ı başlat (beklemeden döner)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._futures[slot] = self._executor.submit(self.infer, batch_size, slot)
+
+    def wait(self, slot=0):
+        """
+        submit() edilen inference'ın çıktısını bekle
+
+        Returns:
+            output: Ham model çıktısı (batch_size, 4 + nc, anchors) - slot tekrar
+                    submit() edilene kadar geçerli
+        """
+        return self._futures.pop(slot).result()
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._futures.clear()
+
+    def cleanup(self):
+        """Kaynakları serbest bırak"""
+        self._cleaned_up = True
+        self._shutdown_executor()
+
+
+class TensorRTBackend(InferenceBackend):
+    name = "tensorrt"
+
+    def __init__(self, engine_path, input_shape=(1, 3, 640, 640), output_shape=(1, 5, 8400),
+                 verbose=False, max_batch=1, num_slots=1):
+        """
+        TensorRT + PyCUDA backend (Jetson)
+
+        Her slot'un kendi page-locked host buffer'ları, GPU buffer'ları ve CUDA
+        stream'i vardır: slot N+1'in yüklemesi slot N'in hesabı ve indirmesiyle
+        örtüşür. Hesaplar tek execution context'i paylaşır ve CUDA event'leriyle
+        sıralanır (context aynı anda iki stream'de çalışmaz).
+
+        Args:
+            engine_path: Serialize edilmiş TensorRT engine dosyası
+            max_batch: Tek execution'da işlenecek maksimum frame sayısı
+                       (engine dinamik batch profili ile build edilmiş olmalı)
+            num_slots: Buffer seti / stream sayısı (asenkron submit için >= 2)
+        """
+        super().__init__(input_shape, output_shape, verbose, max_batch, num_slots)
+
+        if trt is None or cuda is None:
+            raise RuntimeError("❌ TensorRT/PyCUDA bulunamadı! CPU backend kullanın (onnxruntime/opencv)")
+
+        # CUDA context'i sadece bu backend seçildiğinde oluştur
+        import pycuda.autoinit  # noqa: F401
+
+        self.engine = None
+        self.context = None
+        self.gpu_buffers = []
+        self.host_buffers = []
+        self.bindings = []
+        self.stream = None
+        self.slots = []
+        self._last_compute = None  # En son kuyruğa alınan hesabın event'i
+
+        try:
+            runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+            with open(engine_path, "rb") as f:
+                self.engine = runtime.deserialize_cuda_engine(f.read())
+
+            self.context = self.engine.create_execution_context()
+            self._configure_engine_io()
+            self._check_batch_profile()
+            self._allocate_gpu_memory_modern()
+
+        except Exception:
+            self.cleanup()
+            raise
+
+    def _engine_io(self):
+        """
+        Engine'deki I/O tensor'ları
+
+        Returns:
+            [(ad, input_mu, shape, dtype, binding_index), ...] (dinamik eksenler -1)
+        """
+        engine = self.engine
+        if hasattr(engine, "num_io_tensors"):
+            tensors = []
+            for i in range(engine.num_io_tensors):
+                name = engine.get_tensor_name(i)
+                tensors.append((
+                    name,
+                    engine.get_tensor_mode(name) == trt.TensorIOMode.INPUT,
+                    tuple(engine.get_tensor_shape(name)),
+                    trt.nptype(engine.get_tensor_dtype(name)),
+                    i
+                ))
+            return tensors
+        return [
+            (engine.get_binding_name(i), engine.binding_is_input(i), tuple(engine.get_binding_shape(i)),
+             trt.nptype(engine.get_binding_dtype(i)), i)
+            for i in range(engine.num_bindings)
+        ]
+
+    def _configure_engine_io(self):
+        """Tensor adı/shape/dtype bilgilerini engine'den al"""
+        tensors = self._engine_io()
+        inputs = [t for t in tensors if t[1]]
+        outputs = [t for t in tensors if not t[1]]
+        if len(inputs) != 1 or len(outputs) != 1:
+            raise RuntimeError(f"❌ Tek input / tek output bekleniyordu: {[t[0] for t in tensors]}")
+
+        input_name, _, input_shape, input_dtype, input_index = inputs[0]
+        output_name, _, output_shape, output_dtype, output_index = outputs[0]
+        self._configure_io(input_name, input_shape, input_dtype, output_name, output_shape)
+        if self.output_shape is None:
+            raise RuntimeError(f"❌ {output_name}: output'ta sadece batch ekseni dinamik olabilir: {output_shape}")
+        # Host/cihaz output buffer'ları engine'in tipinde ayrılır (ör. FP16 output), wait() float32'ye çevirir
+        self.output_dtype = np.dtype(output_dtype).type
+        if self.output_dtype not in (np.float32, np.float16):
+            raise RuntimeError(f"❌ {output_name}: desteklenmeyen output tipi: {np.dtype(output_dtype).name}")
+
+        self._engine_batch = input_shape[0]
+        self._binding_indices = (input_index, output_index)
+        if self.verbose:
+            print(f"✅ Engine I/O: {self.describe()}")
+
+    def _check_batch_profile(self):
+        """Sabit batch'li engine'de max_batch'i engine batch'ine indir"""
+        engine_batch = self._engine_batch
+
+        if not self.dynamic_batch and self.max_batch != engine_batch:
+            print(f"⚠️  Engine sabit batch={engine_batch} ile build edilmiş, max_batch={self.max_batch} yok sayılıyor")
+            self.max_batch = engine_batch
+            self.input_shape = (engine_batch,) + self.input_shape[1:]
+            self.output_shape = (engine_batch,) + self.output_shape[1:]
+
+    def _set_batch_size(self, batch_size):
+        """Dinamik batch engine'de execution context input shape'ini ayarla"""
+        shape = (batch_size,) + self.input_shape[1:]
+        if hasattr(self.context, "set_input_shape"):
+            self.context.set_input_shape(self.input_name, shape)
+        else:
+            self.context.set_binding_shape(self._binding_indices[0], shape)
+
+    def _allocate_gpu_memory_modern(self):
+        """Modern TensorRT API için memory allocation (slot başına bir set)"""
+        try:
+            # INPUT için ör. (max_batch, 3, 640, 640) float32 veya (max_batch, 640, 640, 3) uint8
+            input_size = int(np.prod(self.input_shape) * np.dtype(self.input_dtype).itemsize)
+            # OUTPUT için - ör. (max_batch, 5, 8400) float32 veya float16
+            output_size = int(np.prod(self.output_shape) * np.dtype(self.output_dtype).itemsize)
+
+            for _ in range(self.num_slots):
+                input_gpu = cuda.mem_alloc(input_size)
+                input_host = cuda.pagelocked_empty(self.input_shape, dtype=self.input_dtype)
+                output_gpu = cuda.mem_alloc(output_size)
+                output_host = cuda.pagelocked_empty(self.output_shape, dtype=self.output_dtype)
+                self.gpu_buffers.extend([input_gpu, output_gpu])
+                # execute_async_v2 binding sırasını bekler
+                bindings = [0, 0]
+                bindings[self._binding_indices[0]] = int(input_gpu)
+                bindings[self._binding_indices[1]] = int(output_gpu)
+                self.slots.append({
+                    "stream": cuda.Stream(),
+                    "compute_done": cuda.Event(),
+                    "bindings": bindings,
+                    "host": [input_host, output_host],
+                    "gpu": [input_gpu, output_gpu],
+                    "batch_size": 0
+                })
+
+            # Slot 0 senkron infer() yolunun buffer'larıdır
+            first = self.slots[0]
+            self.stream = first["stream"]
+            self.bindings = first["bindings"]
+            self.host_buffers = first["host"]
+            self.input_buffers = [slot["host"][0] for slot in self.slots]
+            self.input_buffer = self.input_buffers[0]
+
+            # MODERN TENSORRT: Tensor address'leri set et (submit'te slot'a göre güncellenir)
+            if hasattr(self.context, 'set_tensor_address'):
+                self.context.set_tensor_address(self.input_name, int(first["gpu"][0]))
+                self.context.set_tensor_address(self.output_name, int(first["gpu"][1]))
+                if self.verbose:
+                    print("✅ Modern TensorRT - Tensor address'ler set edildi")
+
+            if self.verbose:
+                print(f"✅ Input shape: {self.input_shape}")
+                print(f"✅ Output shape: {self.output_shape}")
+                if self.num_slots > 1:
+                    print(f"✅ {self.num_slots} buffer seti / CUDA stream")
+
+        except Exception as e:
+            print(f"❌ GPU memory allocation failed: {e}")
+            raise
+
+    def infer(self, batch_size=1, slot=0):
+        self.submit(batch_size, slot)
+        return self.wait(slot)
+
+    def submit(self, batch_size=1, slot=0):
+        """Yükleme, hesap ve indirmeyi slot'un stream'ine kuyrukla (beklemeden döner)"""
+        entry = self.slots[slot]
+        stream = entry["stream"]
+        input_gpu, output_gpu = entry["gpu"]
+        input_host, output_host = entry["host"]
+
+        if self.dynamic_batch:
+            self._set_batch_size(batch_size)
+
+        # Sadece kullanılan frame'leri kopyala (dilimler bitişik)
+        n = batch_size if self.dynamic_batch else self.max_batch
+        cuda.memcpy_htod_async(input_gpu, input_host[:n], stream)
+
+        # Context paylaşıldığı için önceki hesap bitmeden bu hesap başlamaz
+        # (yükleme beklemez - önceki slot'un hesabıyla örtüşür)
+        if self._last_compute is not None:
+            stream.wait_for_event(self._last_compute)
+
+        # Modern TensorRT için execute
+        if hasattr(self.context, 'execute_async_v3'):
+            self.context.set_tensor_address(self.input_name, int(input_gpu))
+            self.context.set_tensor_address(self.output_name, int(output_gpu))
+            self.context.execute_async_v3(stream.handle)
+        else:
+            self.context.execute_async_v2(bindings=entry["bindings"], stream_handle=stream.handle)
+        entry["compute_done"].record(stream)
+        self._last_compute = entry["compute_done"]
+
+        # Output'u al
+        cuda.memcpy_dtoh_async(output_host[:n], output_gpu, stream)
+        entry["batch_size"] = batch_size
+
+    def wait(self, slot=0):
+        entry = self.slots[slot]
+        entry["stream"].synchronize()
+        output = entry["host"][1][:entry["batch_size"]]
+        if self.output_dtype != np.float32:
+            output = output.astype(np.float32)
+        return output
+
+    def cleanup(self):
+        if self._cleaned_up:
+            return
+        self._cleaned_up = True
+
+        # Stream sync
+        for entry in self.slots:
+            try:
+                entry["stream"].synchronize()
+            except:
+                pass
+
+        # GPU memory
+        for gpu_buffer in self.gpu_buffers:
+            if gpu_buffer:
+                try:
+                    gpu_buffer.free()
+                except:
+                    pass
+
+        self.gpu_buffers.clear()
+        self.host_buffers = []
+        self.bindings = []
+        self.slots = []
+        self.input_buffers = []
+        self.input_buffer = None
+        self._last_compute = None
+
+        # Context ve engine
+        self.context = None
+        self.engine = None
+        self.stream = None
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    name = "onnxruntime"
+
+    def __init__(self, onnx_path, input_shape=(1, 3, 640, 640), output_shape=(1, 5, 8400),
+                 verbose=False, max_batch=1, providers=None, num_threads=None, num_slots=1, workers=1):
+        """
+        ONNX Runtime CPU backend
+
+        Args:
+            onnx_path: ONNX model dosyası (ör. model2.onnx)
+            max_batch: Tek çağrıda işlenecek maksimum frame sayısı
+            providers: ONNX Runtime execution provider listesi (varsayılan: CPU)
+            num_threads: intra-op thread sayısı (None: ORT varsayılanı)
+            num_slots: Input buffer sayısı (asenkron submit için >= 2)
+            workers: submit() worker thread sayısı (session.run thread-safe)
+        """
+        super().__init__(input_shape, output_shape, verbose, max_batch, num_slots, workers)
+
+        if ort is None:
+            raise RuntimeError("❌ onnxruntime bulunamadı! (pip install onnxruntime)")
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=providers or ["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        model_output = self.session.get_outputs()[0]
+        if model_input.type not in ORT_DTYPES:
+            raise RuntimeError(f"❌ Desteklenmeyen input tipi: {model_input.type}")
+
+        # Batch ekseni sabitse (export'ta batch=1) frame'ler tek tek çalıştırılır
+        self._configure_io(model_input.name, tuple(model_input.shape), ORT_DTYPES[model_input.type],
+                           model_output.name, tuple(model_output.shape))
+        self._allocate_input_buffers()
+        if self.output_shape is None:
+            self._probe_output_shape()
+
+        if self.verbose:
+            print(f"✅ ONNX Runtime providers: {self.session.get_providers()}")
+            print(f"✅ Model I/O: {self.describe()}")
+
+    def infer(self, batch_size=1, slot=0):
+        input_buffer = self.input_buffers[slot]
+        if self.dynamic_batch:
+            return self.session.run([self.output_name], {self.input_name: input_buffer[:batch_size]})[0]
+
+        outputs = [
+            self.session.run([self.output_name], {self.input_name: input_buffer[i:i + 1]})[0]
+            for i in range(batch_size)
+        ]
+        return np.concatenate(outputs, axis=0)
+
+    def cleanup(self):
+        self._cleaned_up = True
+        self._shutdown_executor()
+        self.session = None
+        self.input_buffer = None
+        self.input_buffers = []
+
+
+class OpenCVDNNBackend(InferenceBackend):
+    name = "opencv"
+
+    def __init__(self, onnx_path, input_shape=(1, 3, 640, 640), output_shape=(1, 5, 8400),
+                 verbose=False, max_batch=1, num_slots=1):
+        """
+        OpenCV DNN CPU backend (ek bağımlılık gerektirmez)
+
+        Sadece float32 NCHW girişli (orijinal) ONNX modelleriyle kullanılır.
+
+        Args:
+            onnx_path: ONNX model dosyası (ör. model2.onnx)
+            max_batch: Buffer kapasitesi - frame'ler tek tek çalıştırılır
+            num_slots: Input buffer sayısı (asenkron submit için >= 2)
+        """
+        super().__init__(input_shape, output_shape, verbose, max_batch, num_slots)
+
+        self.net = cv2.dnn.readNetFromONNX(onnx_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self._net_lock = threading.Lock()  # cv2.dnn.Net thread-safe değil
+
+        # cv2.dnn I/O bilgisi vermez: onnx paketi varsa modelden oku
+        io = _onnx_io(onnx_path)
+        if io is not None:
+            self._configure_io(*io)
+            if self.uint8_input:
+                raise RuntimeError("❌ OpenCV DNN uint8 input'lu modelleri desteklemez (onnxruntime kullanın)")
+        self._allocate_input_buffers()
+        if self.output_shape is None or io is None:
+            self._probe_output_shape()
+
+    def infer(self, batch_size=1, slot=0):
+        # cv2.dnn sabit batch'li ONNX export'larında batch>1 desteklemez
+        input_buffer = self.input_buffers[slot]
+        outputs = []
+        with self._net_lock:
+            for i in range(batch_size):
+                self.net.setInput(input_buffer[i:i + 1])
+                outputs.append(self.net.forward())
+        return outputs[0] if batch_size == 1 else np.concatenate(outputs, axis=0)
+
+    def cleanup(self):
+        self._cleaned_up = True
+        self._shutdown_executor()
+        self.net = None
+        self.input_buffer = None
+        self.input_buffers = []
+
+
+class SyntheticBackend(InferenceBackend):
+    name = "synthetic"
+
+    def __init__(self, output, verbose=False, max_batch=1, uint8_input=False, num_slots=1):
+        """
+        Modelsiz backend - her çağrıda sabit bir çıktı döndürür
+
+        GPU veya model dosyası olmadan preprocess/post-process/çizim yolunu
+        ölçmek için (benchmark, kuru çalıştırma).
+
+        Args:
+            output: Döndürülecek ham çıktı (1, 5, 8400)
+            uint8_input: uint8 NHWC input düzeni (hazırlanmış model gibi)
+            num_slots: Input buffer sayısı (asenkron submit için >= 2)
+        """
+        output = np.asarray(output, dtype=np.float32)
+        super().__init__((1, 3, 640, 640), output.shape, verbose, max_batch, num_slots)
+        if uint8_input:
+            self._set_uint8_input()
+        self._allocate_input_buffers()
+        self.output = np.repeat(output[:1], max_batch, axis=0)
+
+    def infer(self, batch_size=1, slot=0):
+        return self.output[:batch_size]
+
+
+def _onnx_io(onnx_path):
+    """
+    ONNX dosyasından (input_name, input_shape, input_dtype, output_name, output_shape)
+
+    onnx paketi yoksa None (CPU backend'i varsayılan shape ile çalışır).
+    """
+    try:
+        import onnx
+        from onnx import helper
+    except ImportError:
+        return None
+
+    graph = onnx.load(onnx_path, load_external_data=False).graph
+    initializers = {init.name for init in graph.initializer}
+    model_input = [inp for inp in graph.input if inp.name not in initializers][0]
+    model_output = graph.output[0]
+
+    def shape_of(value):
+        return tuple(d.dim_value if d.HasField("dim_value") else d.dim_param or None
+                     for d in value.type.tensor_type.shape.dim)
+
+    elem_type = model_input.type.tensor_type.elem_type
+    if hasattr(helper, "tensor_dtype_to_np_dtype"):
+        dtype = helper.tensor_dtype_to_np_dtype(elem_type)
+    else:
+        dtype = onnx.mapping.TENSOR_TYPE_TO_NP_TYPE[elem_type]  # onnx < 1.13
+    return model_input.name, shape_of(model_input), dtype, model_output.name, shape_of(model_output)
+
+
+BACKENDS = {
+    TensorRTBackend.name: TensorRTBackend,
+    OnnxRuntimeBackend.name: OnnxRuntimeBackend,
+    OpenCVDNNBackend.name: OpenCVDNNBackend,
+}
+
+
+def resolve_backend_name(name, model_path):
+    """
+    'auto' seçimini çöz: TensorRT (.engine) > ONNX Runtime > OpenCV DNN
+
+    Args:
+        name: Backend adı veya "auto"
+        model_path: Model dosyası
+    """
+    if name != "auto":
+        if name not in BACKENDS:
+            raise ValueError(f"❌ Bilinmeyen backend: {name} (seçenekler: auto, {', '.join(BACKENDS)})")
+        return name
+
+    if model_path.endswith(".engine") and trt is not None and cuda is not None:
+        return TensorRTBackend.name
+    if ort is not None:
+        return OnnxRuntimeBackend.name
+    return OpenCVDNNBackend.name
+
+
+def create_backend(name, model_path, verbose=False, **kwargs):
+    """
+    İsme göre backend oluştur
+
+    Args:
+        name: "tensorrt", "onnxruntime", "opencv" veya "auto"
+        model_path: .engine (TensorRT) veya .onnx (CPU backend'leri) dosyası
+        **kwargs: Backend'e özel ek parametreler
+    """
+    name = resolve_backend_name(name, model_path)
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"❌ Model dosyası bulunamadı: {model_path}")
+
+    return BACKENDS[name](model_path, verbose=verbose, **kwargs)
@@ -0,0 +1,344 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+import cv2
+from postprocess import decode_yolov8
+from nms import NMS, greedy_nms
+from preprocess import letterbox, LetterboxPreprocessor
+from backends import SyntheticBackend
+from detector import Detector
+from detections import Detections
+from metrics import Metrics
+from visualizer import Visualizer, RENDER_COPY, RENDER_INPLACE, RENDER_BUFFER
+
+DENSITIES = (10, 100, 1000, 4000)
+NMS_DENSITIES = (10, 100, 1000, 8400)
+RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))
+
+
+def make_synthetic_output(num_detections, num_anchors=8400, seed=0):
+    """
+    Sentetik (1, 5, 8400) YOLOv8 çıktısı üret
+
+    Args:
+        num_detections: Eşik üstü skora sahip aday sayısı
+        num_anchors: Toplam anchor sayısı
+        seed: Rastgelelik tohumu (tekrarlanabilirlik için)
+    """
+    rng = np.random.RandomState(seed)
+    output = np.zeros((1, 5, num_anchors), dtype=np.float32)
+    output[0, 0] = rng.uniform(0, 640, num_anchors)
+    output[0, 1] = rng.uniform(80, 560, num_anchors)
+    output[0, 2] = rng.uniform(8, 80, num_anchors)
+    output[0, 3] = rng.uniform(8, 80, num_anchors)
+    output[0, 4] = rng.uniform(0.0, 0.2, num_anchors)
+    hot = rng.choice(num_anchors, size=min(num_detections, num_anchors), replace=False)
+    output[0, 4, hot] = rng.uniform(0.3, 1.0, hot.size)
+    return output
+
+
+def make_synthetic_frame(width, height, seed=0):
+    """Sabit içerikli BGR test frame'i"""
+    return np.random.RandomState(seed).randint(0, 255, (height, width, 3), dtype=np.uint8)
+
+
+def legacy_post_process(output, params, conf):
+    """Eski satır satır Python döngüsü (karşılaştırma referansı)"""
+    predictions = output[0].transpose(1, 0)
+    valid_predictions = predictions[predictions[:, 4] >= conf]
+
+    scale = params['scale']
+    pad_left = params['pad_left']
+    pad_top = params['pad_top']
+    orig_w = params['original_w']
+    orig_h = params['original_h']
+
+    results = []
+    for pred in valid_predictions:
+        x_center, y_center, width, height, confidence = pred
+        x1 = int((x_center - width / 2 - pad_left) / scale)
+        y1 = int((y_center - height / 2 - pad_top) / scale)
+        x2 = int((x_center + width / 2 - pad_left) / scale)
+        y2 = int((y_center + height / 2 - pad_top) / scale)
+
+        x1 = max(0, min(x1, orig_w - 1))
+        y1 = max(0, min(y1, orig_h - 1))
+        x2 = max(0, min(x2, orig_w - 1))
+        y2 = max(0, min(y2, orig_h - 1))
+
+        if x2 - x1 >= 10 and y2 - y1 >= 10:
+            results.append({"box": [x1, y1, x2, y2], "score": float(confidence), "class_id": 0})
+    return results
+
+
+def measure(fn, repeats=50, warmup=5):
+    """
+    Her çağrının süresini ayrı ölç
+
+    Returns:
+        samples: Isınma turları hariç süreler (ms)
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = np.empty(repeats, dtype=np.float64)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples[i] = (time.perf_counter() - start) * 1000
+    return samples
+
+
+def summarize(samples):
+    """Süre dağılımı özeti (ms)"""
+    p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+    return {
+        "n": int(samples.size),
+        "mean": float(samples.mean()),
+        "std": float(samples.std()),
+        "min": float(samples.min()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(samples.max())
+    }
+
+
+class BenchmarkSuite:
+    def __init__(self, repeats=50, warmup=5, verbose=True):
+        """
+        Pipeline aşamalarını sabit girdilerle ayrı ayrı ve uçtan uca ölçer
+
+        GPU gerektirmez: inference yerine sabit çıktı döndüren SyntheticBackend
+        kullanılır (veya --model ile gerçek bir CPU backend'i).
+
+        Args:
+            repeats: Ölçüm tekrarı (ısınma hariç)
+            warmup: Isınma turu
+        """
+        self.repeats = repeats
+        self.warmup = warmup
+        self.verbose = verbose
+        self.results = {}
+
+    def add(self, name, fn, repeats=None, **params):
+        """Bir vakayı ölç ve kaydet"""
+        samples = measure(fn, repeats or self.repeats, self.warmup)
+        stats = summarize(samples)
+        stats["params"] = params
+        self.results[name] = stats
+
+        if self.verbose:
+            print(f"  {name:<42} {stats['mean']:>9.3f} {stats['p50']:>9.3f} {stats['p95']:>9.3f} {stats['p99']:>9.3f}")
+        return stats
+
+    def run_preprocess(self, resolutions=RESOLUTIONS):
+        preprocessor = LetterboxPreprocessor()
+        out = np.empty((1, 3, 640, 640), dtype=np.float32)
+        out_uint8 = np.empty((1, 640, 640, 3), dtype=np.uint8)  # prepare_model.py ile hazırlanmış model
+
+        def allocating(frame):
+            letterboxed, _ = letterbox(frame)
+            img = np.transpose(letterboxed.astype(np.float32) / 255.0, (2, 0, 1))
+            np.copyto(out, np.expand_dims(img, axis=0))
+
+        for w, h in resolutions:
+            frame = make_synthetic_frame(w, h)
+            res = f"{w}x{h}"
+            self.add(f"letterbox[{res}]", lambda: letterbox(frame), resolution=res)
+            self.add(f"preprocess_letterbox[{res}]", lambda: allocating(frame), resolution=res)
+            self.add(f"preprocess_fused[{res}]", lambda: preprocessor(frame, out), resolution=res)
+            self.add(f"preprocess_uint8[{res}]", lambda: preprocessor(frame, out_uint8), resolution=res)
+
+    def run_post_process(self, densities=DENSITIES, conf=0.25, iou=0.45):
+        # 1280x720 -> 640x640 letterbox parametreleri
+        params = {'scale': 0.5, 'pad_left': 0, 'pad_top': 140, 'original_w': 1280, 'original_h': 720}
+
+        for n in densities:
+            output = make_synthetic_output(n)
+            detector = Detector(None, conf=conf, iou=iou, backend=SyntheticBackend(output))
+            detector.letterbox_params = params
+            boxes, scores, _ = decode_yolov8(output, params, conf=conf, topk=None)
+
+            self.add(f"post_process_legacy_loop[{n}]", lambda: legacy_post_process(output, params, conf), density=n)
+            self.add(f"decode_yolov8[{n}]", lambda: decode_yolov8(output, params, conf=conf), density=n)
+            self.add(f"post_process_yolov8[{n}]", lambda: detector.post_process_yolov8(output, 720, 1280), density=n)
+            detector.cleanup()
+
+    def run_nms(self, densities=NMS_DENSITIES, conf=0.25, iou=0.45):
+        """Eski greedy NMS ile NMS motorunun yolları (aynı aday kutular üzerinde)"""
+        params = {'scale': 0.5, 'pad_left': 0, 'pad_top': 140, 'original_w': 1280, 'original_h': 720}
+        engines = [(method, NMS(iou, max_det=None, method=method)) for method in ("auto", "matrix", "bucketed", "soft")]
+
+        for n in densities:
+            boxes, scores, class_ids = decode_yolov8(make_synthetic_output(n), params, conf=conf, topk=None)
+            boxes = boxes.astype(np.float32)
+            count = int(len(boxes))
+            repeats = max(5, self.repeats // 5) if count > 1000 else None
+
+            self.add(f"nms_greedy[{n}]", lambda: greedy_nms(boxes, scores, iou), repeats, density=n, boxes=count)
+            for method, engine in engines:
+                if method in ("matrix", "soft") and count > 1000:
+                    continue  # O(N²) bellek / süre
+                self.add(f"nms_{method}[{n}]", lambda: engine(boxes, scores, class_ids), repeats,
+                         density=n, boxes=count)
+
+    def run_visualizer(self, counts=(0, 10, 100), resolution=(1280, 720)):
+        w, h = resolution
+        frame = make_synthetic_frame(w, h)
+        visualizer = Visualizer(["sugar_beet"])
+        metrics = {"fps": 30.0, "img_acq": 1.0, "inf": 20.0, "latency": 25.0}
+        rng = np.random.RandomState(0)
+
+        for n in counts:
+            x1 = rng.randint(0, w - 60, n)
+            y1 = rng.randint(30, h - 60, n)
+            results = Detections(np.stack([x1, y1, x1 + 50, y1 + 50], axis=1), np.full(n, 0.8))
+            self.add(f"visualizer_draw[{n}]", lambda: visualizer.draw(frame, results, metrics), detections=n)
+
+        # Kopyasız / ölçekli çizim (track ID'li etiketler)
+        n = max(counts)
+        x1 = rng.randint(0, w - 60, n)
+        y1 = rng.randint(30, h - 60, n)
+        results = Detections(np.stack([x1, y1, x1 + 50, y1 + 50], axis=1), rng.uniform(0.3, 1.0, n))
+        results = results.with_track_ids(np.arange(n))
+        for mode, scale in ((RENDER_COPY, 1.0), (RENDER_INPLACE, 1.0), (RENDER_BUFFER, 1.0), (RENDER_BUFFER, 0.5)):
+            visualizer = Visualizer(["sugar_beet"], mode=mode, scale=scale)
+            target = frame.copy()
+            self.add(f"visualizer_{mode}[x{scale}]", lambda: visualizer.draw(target, results, metrics),
+                     detections=n, mode=mode, scale=scale)
+
+    def run_metrics(self):
+        metrics = Metrics()
+        stages = ("capture", "preprocess", "infer", "postprocess", "draw", "display", "latency")
+
+        def step():
+            for stage in stages:
+                metrics.add_time(stage, 1.0)
+            metrics.compute()
+
+        self.add("metrics_add_compute", step)
+
+    def run_end_to_end(self, detector, resolution=(1280, 720), label="synthetic"):
+        """Detector.infer: preprocess + backend + post-process"""
+        w, h = resolution
+        frame = make_synthetic_frame(w, h)
+        self.add(f"detector_infer[{label},{w}x{h}]", lambda: detector.infer(frame), backend=label)
+
+    def run_all(self, model_path=None, backend="onnxruntime"):
+        if self.verbose:
+            print(f"  {'vaka':<42} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+
+        self.run_preprocess()
+        self.run_post_process()
+        self.run_nms()
+        self.run_visualizer()
+        self.run_metrics()
+
+        detector = Detector(None, backend=SyntheticBackend(make_synthetic_output(100)))
+        self.run_end_to_end(detector)
+        detector.cleanup()
+
+        if model_path:
+            detector = Detector(model_path, backend=backend)
+            self.run_end_to_end(detector, label=backend)
+            detector.cleanup()
+
+        return self.results
+
+
+def environment_info():
+    """Sonuçları karşılaştırılabilir kılmak için ortam bilgisi"""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).decode().strip()
+    except Exception:
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__
+    }
+
+
+def compare(current, baseline, threshold=10.0, stat="p50"):
+    """
+    İki sonuç dosyasını karşılaştır
+
+    Args:
+        current, baseline: {"results": {...}} sözlükleri
+        threshold: Regresyon sayılacak yüzde artış
+        stat: Karşılaştırılan istatistik
+
+    Returns:
+        regressions: Eşik üstü yavaşlayan vaka adları
+    """
+    regressions = []
+    print(f"\n📊 Karşılaştırma ({stat}, baz: {baseline.get('env', {}).get('commit')})")
+    print(f"  {'vaka':<42} {'baz':>9} {'şimdi':>9} {'fark':>8}")
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        change = (stats[stat] - base[stat]) / base[stat] * 100 if base[stat] > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            flag = " ⚠️"
+            regressions.append(name)
+        print(f"  {name:<42} {base[stat]:>9.3f} {stats[stat]:>9.3f} {change:>+7.1f}%{flag}")
+    return regressions
+
+
+def _arg(name, default=None, cast=str):
+    """--name DEĞER biçimindeki komut satırı argümanını oku"""
+    if name not in sys.argv:
+        return default
+    try:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    except (IndexError, ValueError):
+        print(f"❌ Geçersiz {name} değeri!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # Kullanım:
+    #   python benchmark.py [--repeats N] [--warmup N] [--output sonuc.json]
+    #                       [--compare baz.json] [--threshold 10]
+    #                       [--model model2.onnx --backend onnxruntime]
+    repeats = _arg("--repeats", 50, int)
+    warmup = _arg("--warmup", 5, int)
+    output_path = _arg("--output")
+    baseline_path = _arg("--compare")
+    threshold = _arg("--threshold", 10.0, float)
+    model_path = _arg("--model")
+    backend = _arg("--backend", "onnxruntime")
+
+    print("🏁 Pancar tespit pipeline benchmark'ı")
+    suite = BenchmarkSuite(repeats=repeats, warmup=warmup)
+    report = {"env": environment_info(), "config": {"repeats": repeats, "warmup": warmup},
+              "results": suite.run_all(model_path, backend)}
+
+    if output_path:
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Sonuçlar kaydedildi: {output_path}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} vakada %{threshold:.0f} üzeri yavaşlama")
+            sys.exit(1)
+        print("✅ Regresyon yok")
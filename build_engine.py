@@ -1,12 +1,32 @@
 import tensorrt as trt
 import os
+import sys
 
 # 🔸 Sadece WARNING seviyesindeki TensorRT loglarını göster
 TRT_LOGGER = trt.Logger(trt.Logger.WARNING)
 
-def build_engine(onnx_file_path, engine_file_path):
+def build_engine(onnx_file_path, engine_file_path, min_batch=1, opt_batch=1, max_batch=1,
+                 precision="fp16", workspace_mb=1024, timing_cache_path=None, calibrator=None):
+    """
+    ONNX modelinden TensorRT engine oluştur
+
+    Args:
+        onnx_file_path: Kaynak ONNX modeli
+        engine_file_path: Yazılacak engine dosyası
+        min_batch, opt_batch, max_batch: Optimization profile batch aralığı
+            (batch > 1 için ONNX modeli dinamik batch ekseniyle export edilmiş olmalı)
+        precision: "fp16" (destekleniyorsa), "fp32" veya "int8"
+        workspace_mb: Builder workspace limiti (MB)
+        timing_cache_path: Builder timing cache dosyası - varsa yüklenir, build
+            sonrası güncellenir (yeniden build'ler çok daha hızlı)
+        calibrator: INT8 için kalibratör (calibration.EntropyCalibrator)
+    """
     print("🔧 TensorRT ENGINE BUILDER (Jetson Nano uyumlu)")
 
+    if not (1 <= min_batch <= opt_batch <= max_batch):
+        print(f"❌ Geçersiz batch aralığı: min={min_batch}, opt={opt_batch}, max={max_batch}")
+        return False
+
     builder = trt.Builder(TRT_LOGGER)
     network_flags = 1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH)
     network = builder.create_network(network_flags)
@@ -38,7 +58,7 @@ def build_engine(onnx_file_path, engine_file_path):
 
     # Builder Config
     config = builder.create_builder_config()
-    workspace_bytes = 1 << 30  # 1GB
+    workspace_bytes = int(workspace_mb) << 20
 
     # ✅ TensorRT sürümüne göre doğru fonksiyonu kullan
     if hasattr(config, "set_memory_pool_limit"):
@@ -48,20 +68,74 @@ def build_engine(onnx_file_path, engine_file_path):
         config.max_workspace_size = workspace_bytes
         print("✅ Workspace ayarlandı (max_workspace_size, TRT < 8.5)")
 
+    # INT8 precision (kalibrasyonlu); desteklenmeyen katmanlar FP16'ya düşer
+    if precision == "int8":
+        if calibrator is None:
+            print("❌ INT8 için kalibratör gerekli!")
+            return False
+        if not builder.platform_has_fast_int8:
+            print("⚠️  INT8 desteklenmiyor, FP16 kullanılacak")
+            precision = "fp16"
+        else:
+            config.set_flag(trt.BuilderFlag.INT8)
+            config.int8_calibrator = calibrator
+            print(f"✅ INT8 precision etkinleştirildi (kalibrasyon batch={calibrator.get_batch_size()})")
+
     # FP16 precision kontrolü
-    if builder.platform_has_fast_fp16:
+    if precision == "fp32":
+        print("✅ FP32 precision")
+    elif builder.platform_has_fast_fp16:
         config.set_flag(trt.BuilderFlag.FP16)
         print("✅ FP16 precision etkinleştirildi")
     else:
         print("⚠️  FP16 desteklenmiyor, FP32 kullanılacak")
 
-    # Optimization Profile (sabit 640x640)
+    # Timing cache (TRT ≥ 8.0): önceki build'lerin kernel ölçümlerini tekrar kullan
+    timing_cache = None
+    if timing_cache_path and hasattr(config, "create_timing_cache"):
+        cache_data = b""
+        if os.path.exists(timing_cache_path):
+            with open(timing_cache_path, "rb") as f:
+                cache_data = f.read()
+        timing_cache = config.create_timing_cache(cache_data)
+        config.set_timing_cache(timing_cache, ignore_mismatch=False)
+        print(f"✅ Timing cache: {timing_cache_path} ({len(cache_data) // 1024} KB)")
+
+    # Optimization Profile (modelin giriş boyutu, batch aralığı)
     profile = builder.create_optimization_profile()
-    input_name = network.get_input(0).name
-    fixed_shape = (1, 3, 640, 640)
-    profile.set_shape(input_name, fixed_shape, fixed_shape, fixed_shape)
+    input_tensor = network.get_input(0)
+    input_name = input_tensor.name
+
+    if input_tensor.shape[0] != -1 and max_batch > 1:
+        print(f"❌ ONNX modeli sabit batch={input_tensor.shape[0]} ile export edilmiş, dinamik batch gerekli (export dynamic=True)")
+        return False
+
+    # (3, 640, 640) float32 veya prepare_model.py ile hazırlanmışsa (640, 640, 3) uint8
+    frame_shape = tuple(input_tensor.shape[1:])
+    uint8_input = input_tensor.dtype == getattr(trt, "uint8", None)  # TRT 8.5+
+    if uint8_input:
+        print("✅ uint8 NHWC input (normalizasyon modelde)")
+
+    min_shape = (min_batch,) + frame_shape
+    opt_shape = (opt_batch,) + frame_shape
+    max_shape = (max_batch,) + frame_shape
+    profile.set_shape(input_name, min_shape, opt_shape, max_shape)
     config.add_optimization_profile(profile)
-    print(f"✅ Optimization profile eklendi: {fixed_shape}")
+    print(f"✅ Optimization profile eklendi: min={min_shape}, opt={opt_shape}, max={max_shape}")
+
+    # Kalibrasyon kalibratörün batch boyutuyla sabit şekilde çalışır
+    if precision == "int8" and hasattr(config, "set_calibration_profile"):
+        calib_batch = calibrator.get_batch_size()
+        if input_tensor.shape[0] != -1 and calib_batch != input_tensor.shape[0]:
+            print(f"❌ Sabit batch={input_tensor.shape[0]} modelde kalibrasyon batch'i {calib_batch} olamaz")
+            return False
+        calib_shape = (calib_batch,) + frame_shape
+        calibrator.uint8_input = uint8_input
+        if calibrator.dataset is not None:
+            calibrator.dataset.set_shape(frame_shape[:2] if uint8_input else frame_shape[1:])
+        calib_profile = builder.create_optimization_profile()
+        calib_profile.set_shape(input_name, calib_shape, calib_shape, calib_shape)
+        config.set_calibration_profile(calib_profile)
 
     print("🔨 TensorRT engine oluşturuluyor... (Jetson Nano'da birkaç dakika sürebilir)")
     serialized_engine = builder.build_serialized_network(network, config)
@@ -70,6 +144,10 @@ def build_engine(onnx_file_path, engine_file_path):
         print("❌ Engine oluşturulamadı!")
         return False
 
+    if timing_cache is not None:
+        with open(timing_cache_path, "wb") as f:
+            f.write(memoryview(config.get_timing_cache().serialize()))
+
     with open(engine_file_path, "wb") as f:
         f.write(serialized_engine)
 
@@ -108,17 +186,68 @@ def build_engine(onnx_file_path, engine_file_path):
     return True
 
 
+def _parse_int_arg(name, default):
+    """--name N biçimindeki komut satırı argümanını oku"""
+    if name not in sys.argv:
+        return default
+    try:
+        return int(sys.argv[sys.argv.index(name) + 1])
+    except (IndexError, ValueError):
+        print(f"❌ Geçersiz {name} değeri!")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    onnx_path = "model2.onnx"
-    engine_path = "model2.engine"
+    onnx_path = sys.argv[sys.argv.index("--onnx") + 1] if "--onnx" in sys.argv else "model2.onnx"
+    engine_path = sys.argv[sys.argv.index("--engine") + 1] if "--engine" in sys.argv else "model2.engine"
+
+    # Model:         python build_engine.py --onnx model2_u8.onnx --engine model2_u8.engine
+    # Batch profili: python build_engine.py --min-batch 1 --opt-batch 4 --max-batch 8
+    # Önbellek:      python build_engine.py --cache [--fp32]  (engines/ altında, sadece gerekirse build)
+    # INT8:          python build_engine.py --int8 --calib-dir kalibrasyon/ [--calib-batch 8] [--calib-images 500]
+    max_batch = _parse_int_arg("--max-batch", 1)
+    opt_batch = _parse_int_arg("--opt-batch", max_batch)
+    min_batch = _parse_int_arg("--min-batch", 1)
+    workspace_mb = _parse_int_arg("--workspace-mb", 1024)
+    precision = "fp32" if "--fp32" in sys.argv else "fp16"
+    calibration = {}
+    if "--int8" in sys.argv:
+        precision = "int8"
+        calib_dir = sys.argv[sys.argv.index("--calib-dir") + 1] if "--calib-dir" in sys.argv else None
+        calibration = {
+            "calibration_dir": calib_dir,
+            "calibration_batch": _parse_int_arg("--calib-batch", 8 if max_batch >= 8 else 1),
+            "calibration_images": _parse_int_arg("--calib-images", 500)
+        }
 
     if not os.path.exists(onnx_path):
         print(f"❌ ONNX dosyası bulunamadı: {onnx_path}")
+    elif "--cache" in sys.argv:
+        from engine_cache import EngineCache
+        try:
+            path = EngineCache().get_or_build(
+                onnx_path, min_batch=min_batch, opt_batch=opt_batch, max_batch=max_batch,
+                precision=precision, workspace_mb=workspace_mb, **calibration
+            )
+            print(f"🎉 Engine hazır: {path}")
+        except RuntimeError as e:
+            print(f"💥 {e}")
     else:
         size_mb = os.path.getsize(onnx_path) / (1024 * 1024)
         print(f"📁 ONNX dosyası bulundu ({size_mb:.2f} MB)")
 
-        if build_engine(onnx_path, engine_path):
+        calibrator = None
+        if precision == "int8":
+            from calibration import make_calibrator
+            calibrator = make_calibrator(
+                calibration["calibration_dir"],
+                cache_file=os.path.join("calibration", os.path.splitext(os.path.basename(onnx_path))[0] + ".cache"),
+                batch_size=calibration["calibration_batch"],
+                max_images=calibration["calibration_images"]
+            )
+
+        if build_engine(onnx_path, engine_path, min_batch, opt_batch, max_batch, precision, workspace_mb,
+                        calibrator=calibrator):
             print("🎉 Model dönüşümü başarılı!")
         else:
             print("💥 Model dönüşümü başarısız!")
@@ -0,0 +1,270 @@
+import os
+import json
+import hashlib
+import numpy as np
+import cv2
+from preprocess import LetterboxPreprocessor
+from sources import IMAGE_EXTENSIONS
+
+try:
+    import tensorrt as trt
+except ImportError:
+    trt = None
+
+try:
+    import pycuda.driver as cuda
+except ImportError:
+    cuda = None
+
+# TensorRT yoksa da kalibratör mantığı (batch akışı, cache dosyası) kullanılabilir
+_CalibratorBase = trt.IInt8EntropyCalibrator2 if trt is not None else object
+
+
+def list_images(directory, extensions=IMAGE_EXTENSIONS, max_images=None):
+    """Klasördeki görüntüler (dosya adına göre sıralı, max_images'e eşit aralıkla seyreltilmiş)"""
+    files = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(tuple(extensions))
+    )
+    if max_images is not None and len(files) > max_images:
+        # Ardışık saha frame'leri birbirine çok benzer: tüm kayda yayılarak seç
+        index = np.linspace(0, len(files) - 1, max_images).round().astype(int)
+        files = [files[i] for i in index]
+    return files
+
+
+def _source_signature(files, shape):
+    """Dosya listesi + boyut/mtime + hedef boyut özeti (önbellek geçerliliği için)"""
+    digest = hashlib.sha256(json.dumps(list(shape)).encode("utf-8"))
+    for path in files:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CalibrationDataset:
+    def __init__(self, image_dir, cache_path="calibration/calib_tensors.npy", shape=(640, 640),
+                 max_images=None, verbose=False):
+        """
+        Memory-mapped, önceden preprocess edilmiş kalibrasyon seti
+
+        Görüntüler tek tek okunur ve inference ile aynı letterbox + normalize
+        dönüşümünden (Detector.preprocess_letterbox ile bit-bit aynı) geçirilerek
+        doğrudan disk üzerindeki (N, 3, H, W) float32 .npy dosyasına yazılır.
+        Binlerce frame RAM'e sığmak zorunda değildir; batch'ler okunurken de
+        sadece ilgili dilim belleğe gelir. Kaynak klasör değişmediyse önbellek
+        tekrar kullanılır.
+
+        Args:
+            image_dir: Kalibrasyon görüntüleri klasörü
+            cache_path: .npy tensör önbelleği (yanında .json meta dosyası)
+            shape: Model giriş boyutu (yükseklik, genişlik)
+            max_images: En fazla kaç görüntü kullanılacak
+        """
+        self.image_dir = image_dir
+        self.cache_path = cache_path
+        self.meta_path = os.path.splitext(cache_path)[0] + ".json"
+        self.shape = tuple(shape)
+        self.verbose = verbose
+
+        self.files = list_images(image_dir, max_images=max_images)
+        if not self.files:
+            raise RuntimeError(f"❌ Kalibrasyon klasöründe görüntü yok: {image_dir}")
+
+        self.signature = _source_signature(self.files, self.shape)
+        self.tensors = None
+        self.skipped = 0
+
+    def set_shape(self, shape):
+        """Model giriş boyutunu değiştir (320/416 modeller); önbellek imzası yenilenir"""
+        shape = tuple(shape)
+        if shape != self.shape:
+            self.shape = shape
+            self.signature = _source_signature(self.files, self.shape)
+            self.tensors = None
+
+    def _read_meta(self):
+        if not (os.path.exists(self.cache_path) and os.path.exists(self.meta_path)):
+            return None
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("signature") == self.signature else None
+
+    def is_cached(self):
+        return self._read_meta() is not None
+
+    def build(self, force=False):
+        """
+        Önbelleği oluştur (veya geçerliyse aç)
+
+        Returns:
+            self
+        """
+        meta = None if force else self._read_meta()
+        if meta is not None:
+            self.tensors = np.load(self.cache_path, mmap_mode="r")[:meta["count"]]
+            print(f"✅ Kalibrasyon önbelleği kullanılıyor: {self.cache_path} ({len(self.tensors)} görüntü)")
+            return self
+
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        h, w = self.shape
+        size_gb = len(self.files) * 3 * h * w * 4 / 1e9
+        print(f"🔧 Kalibrasyon önbelleği oluşturuluyor: {len(self.files)} görüntü (~{size_gb:.1f} GB disk)")
+
+        preprocessor = LetterboxPreprocessor(new_shape=self.shape)
+        tmp_path = self.cache_path + ".tmp.npy"
+        tensors = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32,
+                                            shape=(len(self.files), 3, h, w))
+        count = 0
+        for path in self.files:
+            frame = cv2.imread(path)
+            if frame is None:
+                self.skipped += 1
+                continue
+            # Letterbox + normalize doğrudan memmap dilimine (ara kopya yok)
+            preprocessor(frame, tensors[count])
+            count += 1
+            if self.verbose and count % 100 == 0:
+                print(f"  {count}/{len(self.files)}")
+
+        tensors.flush()
+        del tensors
+
+        if count == 0:
+            os.remove(tmp_path)
+            raise RuntimeError(f"❌ Hiçbir kalibrasyon görüntüsü okunamadı: {self.image_dir}")
+
+        os.replace(tmp_path, self.cache_path)
+        with open(self.meta_path, "w") as f:
+            json.dump({"signature": self.signature, "count": count, "shape": list(self.shape),
+                       "image_dir": os.path.abspath(self.image_dir), "skipped": self.skipped}, f, indent=2)
+
+        # Okunamayan görüntüler sondaki dilimi boş bırakır; sadece dolu kısım kullanılır
+        self.tensors = np.load(self.cache_path, mmap_mode="r")[:count]
+        print(f"✅ Kalibrasyon önbelleği hazır: {count} görüntü ({self.skipped} okunamadı)")
+        return self
+
+    def __len__(self):
+        if self.tensors is None:
+            self.build()
+        return len(self.tensors)
+
+    def batches(self, batch_size):
+        """
+        Tam batch'ler (contiguous kopya, sadece o dilim belleğe okunur)
+
+        Son eksik batch atlanır - kalibratör sabit batch boyutu bekler.
+        """
+        if self.tensors is None:
+            self.build()
+        for start in range(0, len(self.tensors) - batch_size + 1, batch_size):
+            yield np.ascontiguousarray(self.tensors[start:start + batch_size])
+
+
+class EntropyCalibrator(_CalibratorBase):
+    def __init__(self, dataset, batch_size=8, cache_file="calibration/calib.cache"):
+        """
+        TensorRT INT8 entropy kalibratörü
+
+        Batch'ler CalibrationDataset'ten sırayla okunup cihaza kopyalanır.
+        Kalibrasyon tablosu cache_file'a yazılır; dosya varsa TensorRT
+        kalibrasyonu hiç çalıştırmadan onu kullanır.
+
+        Args:
+            dataset: CalibrationDataset (build edilmemişse ilk batch'te edilir;
+                     None: sadece mevcut kalibrasyon tablosu kullanılır)
+            batch_size: Kalibrasyon batch boyutu
+            cache_file: Kalibrasyon tablosu dosyası
+        """
+        if trt is not None:
+            _CalibratorBase.__init__(self)
+
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.cache_file = cache_file
+        self.uint8_input = False  # build_engine: model uint8 NHWC input alıyorsa
+        self.batches_served = 0
+        self._batches = None
+        self._current = None  # GPU'suz modda host buffer'ı canlı tut
+        self.device_input = None
+
+    def get_batch_size(self):
+        return self.batch_size
+
+    def get_batch(self, names):
+        """
+        Returns:
+            [cihaz pointer'ı] veya veri bittiyse None
+        """
+        if self.dataset is None:
+            return None
+        if self._batches is None:
+            self._batches = self.dataset.batches(self.batch_size)
+
+        batch = next(self._batches, None)
+        if batch is None:
+            return None
+
+        if self.uint8_input:
+            # Önbellek k/255 değerleri tutar: *255 kayıpsız geri döner
+            batch = np.ascontiguousarray(
+                np.rint(batch * np.float32(255.0)).astype(np.uint8).transpose(0, 2, 3, 1)
+            )
+
+        self.batches_served += 1
+        if self.batches_served % 10 == 0:
+            print(f"  🔬 Kalibrasyon batch {self.batches_served}")
+
+        if cuda is None:
+            # GPU yok (test): host pointer'ı döndür
+            self._current = batch
+            return [int(batch.ctypes.data)]
+
+        if self.device_input is None:
+            import pycuda.autoinit  # CUDA context
+            self.device_input = cuda.mem_alloc(batch.nbytes)
+        cuda.memcpy_htod(self.device_input, batch)
+        return [int(self.device_input)]
+
+    def read_calibration_cache(self):
+        if self.cache_file and os.path.exists(self.cache_file):
+            print(f"✅ Kalibrasyon tablosu kullanılıyor: {self.cache_file}")
+            with open(self.cache_file, "rb") as f:
+                return f.read()
+        return None
+
+    def write_calibration_cache(self, cache):
+        cache_dir = os.path.dirname(self.cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with open(self.cache_file, "wb") as f:
+            f.write(bytes(cache))
+        print(f"💾 Kalibrasyon tablosu kaydedildi: {self.cache_file}")
+
+
+def make_calibrator(image_dir=None, cache_file="calibration/calib.cache", batch_size=8, max_images=500,
+                    tensor_cache="calibration/calib_tensors.npy"):
+    """
+    Klasör ve/veya mevcut kalibrasyon tablosundan kalibratör oluştur
+
+    Tablo varsa klasör gerekmez (veri hiç okunmaz); yoksa image_dir zorunludur.
+    """
+    if image_dir is None:
+        if not os.path.exists(cache_file):
+            raise RuntimeError(f"❌ INT8 için kalibrasyon klasörü veya tablosu gerekli: {cache_file}")
+        return EntropyCalibrator(None, batch_size, cache_file)
+
+    dataset = CalibrationDataset(image_dir, tensor_cache, max_images=max_images)
+    # Tablo yoksa kalibrasyon çalışacak: tek tam batch bile yoksa TensorRT anlaşılmaz hata verir
+    if not os.path.exists(cache_file) and len(dataset) < batch_size:
+        raise RuntimeError(
+            f"❌ Kalibrasyon için yetersiz görüntü: {len(dataset)} okunabilir görüntü, "
+            f"batch boyutu {batch_size} ({image_dir})"
+        )
+    return EntropyCalibrator(dataset, batch_size, cache_file)
@@ -1,8 +1,14 @@
 import cv2
 import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from sources import FrameSource, CapturedFrame
 
-class Camera:
-    def __init__(self, cam_id=0, preferred_width=None, preferred_height=None, verbose=False):
+class Camera(FrameSource):
+    def __init__(self, cam_id=0, preferred_width=None, preferred_height=None, verbose=False,
+                 threaded=False, buffer_size=4):
         """
         USB/Webcam sınıfı - Otomatik boyut algılama
         
@@ -11,7 +17,10 @@ class Camera:
             preferred_width: Tercih edilen genişlik (None ise kameranın varsayılanı)
             preferred_height: Tercih edilen yükseklik (None ise kameranın varsayılanı)
             verbose: Detaylı log göster
+            threaded: Arka planda yakalama thread'i + ring buffer kullan
+            buffer_size: Ring buffer kapasitesi (frame)
         """
+        self._init_capture_state(threaded, buffer_size)
         self.logger = logging.getLogger("Camera")
         self.logger.setLevel(logging.DEBUG if verbose else logging.INFO)
         
@@ -59,18 +68,170 @@ class Camera:
             self.width = actual_w
             self.height = actual_h
             self.logger.info(f"✅ Güncellendi: {self.width}x{self.height}")
+        
+        if self.threaded:
+            self.start_capture_thread()
+
+    def _init_capture_state(self, threaded, buffer_size):
+        """Yakalama thread'i, ring buffer ve sayaçları hazırla"""
+        self.threaded = threaded
+        self._ring = deque(maxlen=max(1, buffer_size))
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        
+        self._next_frame_id = 0
+        self._last_delivered_id = -1
+        
+        # Sayaçlar
+        self.captured_frames = 0   # Kameradan okunan toplam frame
+        self.dropped_frames = 0    # Tüketiciye hiç verilmeden atlanan frame
+        self.overruns = 0          # Ring buffer doluyken üzerine yazılan frame
+        self.read_errors = 0       # Başarısız cap.read() çağrıları
+
+    def start_capture_thread(self):
+        """Arka plan yakalama thread'ini başlat"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self.threaded = True
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name=f"{self.logger.name}-grabber", daemon=True)
+        self._thread.start()
+        self.logger.info(f"🧵 Yakalama thread'i başlatıldı (buffer: {self._ring.maxlen} frame)")
+
+    def stop_capture_thread(self):
+        """Yakalama thread'ini durdur"""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    @contextmanager
+    def _paused_capture(self):
+        """cap.set() çağrıları sırasında yakalama thread'ini durdur, sonra eski frame'leri at"""
+        was_running = self._thread is not None
+        if was_running:
+            self.stop_capture_thread()
+        try:
+            yield
+        finally:
+            if was_running:
+                with self._cond:
+                    self._ring.clear()
+                self.start_capture_thread()
+
+    def _capture_loop(self):
+        """Grabber: kameradan sürekli oku, ring buffer'a yaz"""
+        while self._running:
+            ret, frame = self.cap.read()
+            timestamp = time.monotonic()
+            
+            if not ret or frame is None:
+                self.read_errors += 1
+                time.sleep(0.005)
+                continue
+            
+            with self._cond:
+                # Buffer doluysa en eski (okunmamış) frame düşer
+                if len(self._ring) == self._ring.maxlen:
+                    self.overruns += 1
+                    self.dropped_frames += 1
+                
+                self._ring.append(CapturedFrame(self._next_frame_id, timestamp, frame))
+                self._next_frame_id += 1
+                self.captured_frames += 1
+                self._cond.notify_all()
+
+    def _wait_for_frame(self, timeout):
+        """Ring buffer'a frame gelene kadar bekle (Condition kilidi tutulurken çağrılır)"""
+        if not self._cond.wait_for(lambda: self._ring or not self._running, timeout=timeout):
+            raise RuntimeError("❌ Kameradan frame zaman aşımı!")
+        if not self._ring:
+            raise RuntimeError("❌ Yakalama thread'i durdu!")
 
-    def get_frame(self):
+    def read_latest(self, timeout=1.0):
         """
-        Kameradan frame oku
+        En güncel frame'i al, bekleyen eski frame'leri at
         
+        Args:
+            timeout: Yeni frame için maksimum bekleme (saniye)
+            
         Returns:
-            frame: BGR formatında görüntü (H, W, 3)
+            CapturedFrame(frame_id, timestamp, frame)
         """
+        if not self.threaded:
+            return self._read_sync()
+        
+        with self._cond:
+            self._wait_for_frame(timeout)
+            packet = self._ring[-1]
+            self.dropped_frames += len(self._ring) - 1
+            self._ring.clear()
+            self._last_delivered_id = packet.frame_id
+        return packet
+
+    def read_next(self, timeout=1.0):
+        """
+        Sıradaki frame'i al (hiçbir frame atlanmaz, buffer taşmadığı sürece)
+        
+        Returns:
+            CapturedFrame(frame_id, timestamp, frame)
+        """
+        if not self.threaded:
+            return self._read_sync()
+        
+        with self._cond:
+            self._wait_for_frame(timeout)
+            packet = self._ring.popleft()
+            self._last_delivered_id = packet.frame_id
+        return packet
+
+    def _read_sync(self):
+        """Senkron okuma - thread'siz modda da meta veri üret"""
         ret, frame = self.cap.read()
+        timestamp = time.monotonic()
         if not ret or frame is None:
+            self.read_errors += 1
             raise RuntimeError("❌ Boş kare okundu!")
-        return frame
+        
+        packet = CapturedFrame(self._next_frame_id, timestamp, frame)
+        self._next_frame_id += 1
+        self.captured_frames += 1
+        self._last_delivered_id = packet.frame_id
+        return packet
+
+    def get_frame(self, latest=True):
+        """
+        Kameradan frame oku
+        
+        Args:
+            latest: Thread modunda en güncel frame'i al (False: sıradaki frame)
+        
+        Returns:
+            frame: BGR formatında görüntü (H, W, 3)
+        """
+        packet = self.read_latest() if latest else self.read_next()
+        return packet.frame
+
+    def get_capture_stats(self):
+        """
+        Yakalama sayaçları
+        
+        Returns:
+            dict: captured, dropped, overruns, read_errors, buffered, last_frame_id
+        """
+        with self._cond:
+            return {
+                "captured": self.captured_frames,
+                "dropped": self.dropped_frames,
+                "overruns": self.overruns,
+                "read_errors": self.read_errors,
+                "buffered": len(self._ring),
+                "last_frame_id": self._last_delivered_id
+            }
 
     def get_resolution(self):
         """
@@ -92,12 +253,13 @@ class Camera:
         Returns:
             success: Başarılı olup olmadığı
         """
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-        
-        # Gerçek değerleri oku
-        new_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        new_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        with self._paused_capture():
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            
+            # Gerçek değerleri oku
+            new_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            new_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         
         if new_width == width and new_height == height:
             self.width = new_width
@@ -134,22 +296,23 @@ class Camera:
         
         self.logger.info("🔍 Desteklenen çözünürlükler test ediliyor...")
         
-        for w, h in common_resolutions:
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
-            
-            actual_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        with self._paused_capture():
+            for w, h in common_resolutions:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+                
+                actual_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                actual_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                
+                if actual_w == w and actual_h == h:
+                    supported.append((w, h))
+                    self.logger.debug(f"  ✅ {w}x{h}")
+                else:
+                    self.logger.debug(f"  ❌ {w}x{h} → {actual_w}x{actual_h}")
             
-            if actual_w == w and actual_h == h:
-                supported.append((w, h))
-                self.logger.debug(f"  ✅ {w}x{h}")
-            else:
-                self.logger.debug(f"  ❌ {w}x{h} → {actual_w}x{actual_h}")
-        
-        # Orijinal çözünürlüğe geri dön
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, original_w)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, original_h)
+            # Orijinal çözünürlüğe geri dön
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, original_w)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, original_h)
         self.width = original_w
         self.height = original_h
         
@@ -158,7 +321,10 @@ class Camera:
 
     def release(self):
         """Kamerayı kapat"""
-        if self.cap.isOpened():
+        if getattr(self, "_thread", None) is not None:
+            self.stop_capture_thread()
+        
+        if getattr(self, "cap", None) is not None and self.cap.isOpened():
             self.cap.release()
             self.logger.info("📷 Kamera kapatıldı")
 
@@ -172,7 +338,8 @@ class CSICamera(Camera):
     """
     Jetson Nano CSI kamera için GStreamer pipeline
     """
-    def __init__(self, sensor_id=0, width=1280, height=720, fps=30, flip_method=0, verbose=False):
+    def __init__(self, sensor_id=0, width=1280, height=720, fps=30, flip_method=0, verbose=False,
+                 threaded=False, buffer_size=4):
         """
         CSI Kamera (Jetson Nano)
         
@@ -182,7 +349,10 @@ class CSICamera(Camera):
             height: Yükseklik
             fps: Frame per second
             flip_method: Görüntü döndürme (0-6 arası)
+            threaded: Arka planda yakalama thread'i + ring buffer kullan
+            buffer_size: Ring buffer kapasitesi (frame)
         """
+        self._init_capture_state(threaded, buffer_size)
         self.logger = logging.getLogger("CSICamera")
         self.logger.setLevel(logging.DEBUG if verbose else logging.INFO)
         
@@ -222,4 +392,7 @@ class CSICamera(Camera):
         self.logger.info(f"  Çözünürlük: {self.width}x{self.height}")
         self.logger.info(f"  FPS: {self.fps}")
         self.logger.info(f"  Flip Method: {flip_method}")
-        self.logger.info("=" * 50)
\ No newline at end of file
+        self.logger.info("=" * 50)
+        
+        if self.threaded:
+            self.start_capture_thread()
\ No newline at end of file
@@ -0,0 +1,162 @@
+import time
+import numpy as np
+from metrics import RollingWindow
+
+AMBIGUOUS = "ambiguous"
+COUNT_JUMP = "count_jump"
+REFRESH = "refresh"
+
+
+class EscalationPolicy:
+    def __init__(self, band=(0.15, 0.40), min_ambiguous=1, count_jump=3, count_jump_ratio=0.5,
+                 refresh_every=None):
+        """
+        Hızlı modelin sonucu ne zaman ağır modele devredilir?
+
+        - Belirsizlik: skoru band aralığında (eşiğin çevresi) en az
+          min_ambiguous tespit var
+        - Sayı sıçraması: hızlı modelin kabul ettiği tespit sayısı önceki
+          frame'e göre max(count_jump, count_jump_ratio * önceki) kadar değişti
+        - Yenileme: refresh_every frame'de bir (None: kapalı) ağır model
+          zorunlu çalışır (hızlı modelin kaçırdıklarını denetlemek için)
+
+        Args:
+            band: (alt, üst) belirsiz skor aralığı - hızlı model alt sınırla çalıştırılmalı
+            min_ambiguous: Devretmek için gereken belirsiz tespit sayısı
+            count_jump: Devretmek için mutlak tespit sayısı değişimi
+            count_jump_ratio: Devretmek için önceki sayıya göre oransal değişim
+            refresh_every: Zorunlu ağır model aralığı (frame)
+        """
+        self.band = band
+        self.min_ambiguous = min_ambiguous
+        self.count_jump = count_jump
+        self.count_jump_ratio = count_jump_ratio
+        self.refresh_every = refresh_every
+
+    def decide(self, detections, accepted_count, previous_count, frames_since_heavy):
+        """
+        Returns:
+            Devretme nedeni (AMBIGUOUS, COUNT_JUMP, REFRESH) veya None
+        """
+        low, high = self.band
+        scores = detections.scores
+        ambiguous = int(np.count_nonzero((scores >= low) & (scores < high)))
+        if ambiguous >= self.min_ambiguous:
+            return AMBIGUOUS
+
+        if previous_count is not None:
+            jump = abs(accepted_count - previous_count)
+            if jump >= max(self.count_jump, self.count_jump_ratio * previous_count):
+                return COUNT_JUMP
+
+        if self.refresh_every is not None and frames_since_heavy >= self.refresh_every:
+            return REFRESH
+        return None
+
+
+class CascadeDetector:
+    def __init__(self, fast, heavy, policy=None, accept_conf=0.27, window=100, verbose=False):
+        """
+        Kademeli tespit: her frame'de küçük/hızlı model, sadece belirsiz
+        frame'lerde büyük/ağır model
+
+        Hızlı model düşük eşikle (policy.band[0]) çalıştırılır ki eşiğe yakın
+        tespitler görülebilsin. Devretme olmazsa hızlı modelin accept_conf
+        üzerindeki tespitleri kullanılır, olursa ağır modelin sonucu.
+        Detector ile aynı infer()/stage_times arayüzünü sunar.
+
+        Args:
+            fast: Hızlı Detector (ör. model1, conf=policy.band[0])
+            heavy: Ağır Detector (ör. model2)
+            policy: EscalationPolicy (None: varsayılan)
+            accept_conf: Hızlı model sonuçlarının kabul eşiği
+            window: Süre ortalamaları için pencere (frame)
+        """
+        self.fast = fast
+        self.heavy = heavy
+        self.policy = policy or EscalationPolicy()
+        self.accept_conf = accept_conf
+        self.verbose = verbose
+
+        if fast.conf > self.policy.band[0]:
+            print(f"⚠️  Hızlı model eşiği ({fast.conf}) belirsizlik bandının altını ({self.policy.band[0]}) "
+                  f"göremez - {self.policy.band[0]} yapılıyor")
+            fast.conf = self.policy.band[0]
+
+        self.frame_count = 0
+        self.escalations = 0
+        self.reasons = {AMBIGUOUS: 0, COUNT_JUMP: 0, REFRESH: 0}
+        self.last_escalated = False
+        self.last_reason = None
+        self.stage_times = {}
+        self.fast_times = RollingWindow(window)
+        self.heavy_times = RollingWindow(window)
+        self.fast_total_ms = 0.0
+        self.heavy_total_ms = 0.0
+        self._previous_count = None
+        self._frames_since_heavy = 0
+
+    def infer(self, frame):
+        """
+        Returns:
+            Detections
+        """
+        self.frame_count += 1
+        self._frames_since_heavy += 1
+
+        start = time.perf_counter()
+        candidates = self.fast.infer(frame)
+        fast_ms = (time.perf_counter() - start) * 1000
+        self.fast_times.add(fast_ms)
+        self.fast_total_ms += fast_ms
+        stage_times = {"infer_fast": fast_ms}
+        for stage, ms in self.fast.stage_times.items():
+            stage_times[stage] = ms
+
+        accepted = candidates.filter(candidates.scores >= self.accept_conf)
+        reason = self.policy.decide(candidates, len(accepted), self._previous_count, self._frames_since_heavy)
+
+        self.last_escalated = reason is not None
+        self.last_reason = reason
+        if reason is None:
+            results = accepted
+        else:
+            start = time.perf_counter()
+            results = self.heavy.infer(frame)
+            heavy_ms = (time.perf_counter() - start) * 1000
+            self.heavy_times.add(heavy_ms)
+            self.heavy_total_ms += heavy_ms
+            stage_times["infer_heavy"] = heavy_ms
+            for stage, ms in self.heavy.stage_times.items():
+                stage_times[stage] = stage_times.get(stage, 0.0) + ms
+
+            self.escalations += 1
+            self.reasons[reason] += 1
+            self._frames_since_heavy = 0
+            if self.verbose:
+                print(f"🔺 Frame {self.frame_count}: ağır model ({reason}, {len(candidates)} aday)")
+
+        self.stage_times = stage_times
+        # Ağır modelin sayısıyla değil hızlı modelinkiyle kıyasla (modeller arası fark sıçrama sayılmasın)
+        self._previous_count = len(accepted)
+        return results
+
+    @property
+    def escalation_rate(self):
+        return self.escalations / self.frame_count if self.frame_count else 0.0
+
+    def get_stats(self):
+        frames = max(self.frame_count, 1)
+        return {
+            "frames": self.frame_count,
+            "escalations": self.escalations,
+            "escalation_rate": round(self.escalation_rate, 3),
+            "reasons": dict(self.reasons),
+            "fast_ms": round(self.fast_times.mean(), 2),
+            "heavy_ms": round(self.heavy_times.mean(), 2),
+            "ms_per_frame": round((self.fast_total_ms + self.heavy_total_ms) / frames, 2)
+        }
+
+    def cleanup(self):
+        self.fast.cleanup()
+        self.heavy.cleanup()
@@ -0,0 +1,307 @@
+import os
+import sys
+import glob
+import json
+import time
+import numpy as np
+from detections import Detections
+
+MAGIC = b"BEETLOG1"
+HEADER_SIZE = 256   # Sabit başlık: MAGIC + JSON (dtype, oluşturma zamanı) + boşluk
+SEGMENT_PATTERN = "detections_*.bin"
+
+# Tespit başına sabit boyutlu kayıt (42 bayt, hizalamasız)
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),      # Unix zamanı (s)
+    ("frame_id", "<i8"),       # Kaynak frame numarası (çalıştırma başına)
+    ("box", "<i4", (4,)),      # x1, y1, x2, y2 (orijinal frame pikseli)
+    ("score", "<f4"),
+    ("class_id", "<i2"),
+    ("track_id", "<i4"),       # -1: takip yok
+])
+
+
+def _write_header(f, created):
+    meta = json.dumps({"dtype": RECORD_DTYPE.descr, "created": created}).encode("ascii")
+    header = MAGIC + meta
+    if len(header) > HEADER_SIZE:
+        raise ValueError("❌ Log başlığı sığmıyor")
+    f.write(header.ljust(HEADER_SIZE, b" "))
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError(f"❌ Geçersiz log segmenti: {path}")
+    meta = json.loads(header[len(MAGIC):].decode("ascii").rstrip())
+    dtype = np.dtype([tuple(field) if len(field) == 2 else (field[0], field[1], tuple(field[2]))
+                      for field in meta["dtype"]])
+    if dtype != RECORD_DTYPE:
+        raise ValueError(f"❌ Desteklenmeyen kayıt formatı: {path}")
+    return meta
+
+
+class DetectionLogWriter:
+    def __init__(self, directory="detections", batch_size=4096, flush_interval=2.0,
+                 segment_records=1000000, clock=time.time, verbose=False):
+        """
+        Ekleme-only ikili tespit logu
+
+        Tespitler sabit boyutlu kayıtlar (RECORD_DTYPE) olarak önceden ayrılmış
+        bir batch buffer'ında toplanır, batch dolunca veya flush_interval
+        geçince tek write() ile segment dosyasının sonuna eklenir. Segment
+        segment_records kayda ulaşınca yenisi açılır (1M kayıt ~42 MB).
+        Her çalıştırma yeni segmentle başlar. frame_id veya zaman geri giderse
+        (döngülü kaynak, saat düzeltmesi) da yeni segment açılır: okuyucunun
+        searchsorted sorguları için her iki alan segment içinde artan kalır.
+
+        Args:
+            directory: Segment klasörü
+            batch_size: Tek yazımda en fazla kayıt
+            flush_interval: En fazla kaç saniyede bir diske yazılır
+            segment_records: Segment başına kayıt (rotasyon)
+            clock: Kayıt zamanı (Unix saniye)
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.segment_records = segment_records
+        self.clock = clock
+        self.verbose = verbose
+
+        self.records = 0          # Toplam yazılan kayıt
+        self.segments = 0
+        self.flushes = 0
+        self._batch = np.empty(batch_size, dtype=RECORD_DTYPE)
+        self._count = 0           # Batch'teki kayıt
+        self._file = None
+        self._segment_count = 0   # Açık segmentteki kayıt
+        self._last_flush = clock()
+        self._last_key = None     # Son kaydın (frame_id, timestamp) değeri
+
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, detections, frame_id, timestamp=None):
+        """
+        Bir frame'in tespitlerini ekle (boş frame kayıt üretmez)
+
+        Args:
+            detections: Detections (veya eski liste-sözlük formatı)
+            frame_id: Kaynak frame numarası
+            timestamp: Unix zamanı (None: şimdi)
+        """
+        detections = Detections.from_dicts(detections)
+        now = self.clock() if timestamp is None else timestamp
+        n = len(detections)
+        if n and self._last_key is not None and (frame_id < self._last_key[0] or now < self._last_key[1]):
+            # Segment içi sıralama bozulmasın: bekleyenleri yaz, yeni segmente geç
+            self.flush()
+            self._rotate()
+        if n:
+            self._last_key = (frame_id, now)
+        start = 0
+        while start < n:
+            # Batch dolarsa parça parça yaz (tek frame batch'ten büyük olabilir)
+            take = min(n - start, len(self._batch) - self._count)
+            rows = self._batch[self._count:self._count + take]
+            rows["timestamp"] = now
+            rows["frame_id"] = frame_id
+            rows["box"] = detections.boxes[start:start + take]
+            rows["score"] = detections.scores[start:start + take]
+            rows["class_id"] = detections.class_ids[start:start + take]
+            rows["track_id"] = -1 if detections.track_ids is None else detections.track_ids[start:start + take]
+            self._count += take
+            start += take
+            if self._count == len(self._batch):
+                self.flush()
+
+        if self._count and self.clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Batch'i segmentin sonuna yaz (gerekirse segmenti döndür)"""
+        self._last_flush = self.clock()
+        written = 0
+        while written < self._count:
+            if self._file is None or self._segment_count >= self.segment_records:
+                self._rotate()
+            take = min(self._count - written, self.segment_records - self._segment_count)
+            self._file.write(self._batch[written:written + take].tobytes())
+            self._segment_count += take
+            written += take
+        if self._file is not None:
+            self._file.flush()
+        self.records += self._count
+        self.flushes += 1 if self._count else 0
+        self._count = 0
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        self.segments += 1
+        name = f"detections_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{self.segments:04d}.bin"
+        path = os.path.join(self.directory, name)
+        self._file = open(path, "wb")
+        _write_header(self._file, self.clock())
+        self._segment_count = 0
+        if self.verbose:
+            print(f"🗂️  Tespit logu segmenti: {path}")
+
+    def get_stats(self):
+        return {
+            "records": self.records + self._count,
+            "segments": self.segments,
+            "flushes": self.flushes,
+            "pending": self._count
+        }
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class DetectionLog:
+    def __init__(self, directory="detections"):
+        """
+        Tespit logu okuyucu - segmentler memory-map edilir, metin ayrıştırılmaz
+
+        Kayıtlar segment içinde zamana (ve frame_id'ye) göre sıralı olduğundan
+        aralık sorguları searchsorted ile sadece ilgili sayfaları okur.
+        Yarım yazılmış son kayıt (çökme) yok sayılır.
+        """
+        self.directory = directory
+        self.segments = []   # [(yol, memmap), ...] oluşturma sırasına göre
+        for path in sorted(glob.glob(os.path.join(directory, SEGMENT_PATTERN))):
+            _read_header(path)
+            count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+            if count <= 0:
+                continue
+            records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+            self.segments.append((path, records))
+
+    def __len__(self):
+        return sum(len(records) for _, records in self.segments)
+
+    def _slices(self, field, first, last):
+        """first <= field < last olan kayıt dilimleri (kopyasız memmap görünümleri)"""
+        for _, records in self.segments:
+            column = records[field]
+            if (last is not None and column[0] >= last) or (first is not None and column[-1] < first):
+                continue
+            lo = 0 if first is None else int(np.searchsorted(column, first, side="left"))
+            hi = len(records) if last is None else int(np.searchsorted(column, last, side="left"))
+            if hi > lo:
+                yield records[lo:hi]
+
+    def query(self, start=None, end=None):
+        """
+        Zaman aralığındaki kayıtlar (start <= timestamp < end, Unix saniye)
+
+        Returns:
+            RECORD_DTYPE yapılı dizi (kopya)
+        """
+        return self._collect(self._slices("timestamp", start, end))
+
+    def frames(self, first=None, last=None):
+        """
+        Frame aralığındaki kayıtlar (first <= frame_id <= last)
+
+        frame_id her çalıştırmada baştan başlar; birden fazla çalıştırmanın
+        eşleşen kayıtları birlikte döner (timestamp ile ayrılabilir).
+        """
+        return self._collect(self._slices("frame_id", first, None if last is None else last + 1))
+
+    @staticmethod
+    def _collect(slices):
+        slices = list(slices)
+        if not slices:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(slices)
+
+    def count(self, start=None, end=None, by=None):
+        """
+        Zaman aralığındaki tespit sayısı
+
+        Args:
+            by: None (toplam), "class_id" veya "track_id" ({değer: sayı})
+        """
+        if by is None:
+            return sum(len(records) for records in self._slices("timestamp", start, end))
+        counts = {}
+        for records in self._slices("timestamp", start, end):
+            values, n = np.unique(records[by], return_counts=True)
+            for value, c in zip(values.tolist(), n.tolist()):
+                counts[value] = counts.get(value, 0) + c
+        return counts
+
+    def unique_tracks(self, start=None, end=None):
+        """Aralıktaki benzersiz track sayısı (takipsiz kayıtlar hariç)"""
+        tracks = [np.unique(records["track_id"]) for records in self._slices("timestamp", start, end)]
+        if not tracks:
+            return 0
+        tracks = np.unique(np.concatenate(tracks))
+        return int(np.count_nonzero(tracks >= 0))
+
+    def histogram(self, interval=60.0, start=None, end=None):
+        """
+        Zaman aralıklarına göre tespit sayısı
+
+        Returns:
+            starts: Aralık başlangıçları (Unix saniye)
+            counts: Aralık başına tespit sayısı
+        """
+        if start is None or end is None:
+            span = self.time_range()
+            if span is None:
+                return np.empty(0), np.empty(0, dtype=np.int64)
+            start = span[0] if start is None else start
+            end = np.nextafter(span[1], np.inf) if end is None else end
+        bins = max(1, int(np.ceil((end - start) / interval)))
+        counts = np.zeros(bins, dtype=np.int64)
+        for records in self._slices("timestamp", start, end):
+            index = ((records["timestamp"] - start) // interval).astype(np.int64)
+            counts += np.bincount(index, minlength=bins)[:bins]
+        return start + np.arange(bins) * interval, counts
+
+    def time_range(self):
+        """(ilk, son) kayıt zamanı veya None"""
+        if not self.segments:
+            return None
+        return (float(min(records["timestamp"][0] for _, records in self.segments)),
+                float(max(records["timestamp"][-1] for _, records in self.segments)))
+
+    @staticmethod
+    def to_detections(records):
+        """Kayıtları Detections'a çevir (ör. bir frame'i yeniden çizmek için)"""
+        track_ids = records["track_id"]
+        return Detections(
+            records["box"], records["score"], records["class_id"],
+            track_ids if len(track_ids) and (track_ids >= 0).all() else None
+        )
+
+
+if __name__ == "__main__":
+    # Kullanım: python detection_log.py [detections] [--interval 60]
+    args = sys.argv[1:]
+    interval = 60.0
+    if "--interval" in args:
+        idx = args.index("--interval")
+        interval = float(args[idx + 1])
+        del args[idx:idx + 2]
+    directory = args[0] if args else "detections"
+
+    log = DetectionLog(directory)
+    span = log.time_range()
+    if span is None:
+        print(f"❌ Kayıt bulunamadı: {directory}")
+        sys.exit(1)
+
+    print(f"🗂️  {len(log.segments)} segment, {len(log)} tespit")
+    print(f"  Zaman: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(span[0]))} - "
+          f"{time.strftime('%H:%M:%S', time.localtime(span[1]))}")
+    print(f"  Benzersiz track: {log.unique_tracks()}")
+    starts, counts = log.histogram(interval)
+    for t, c in zip(starts.tolist(), counts.tolist()):
+        print(f"  {time.strftime('%H:%M:%S', time.localtime(t))}  {c:>8}")
@@ -0,0 +1,137 @@
+import numpy as np
+
+
+class Detections:
+    """
+    Sütunsal tespit sonuçları - post-process, NMS, çizim ve dışa aktarma boyunca
+    tek format
+
+    Tespit başına Python nesnesi yerine bitişik diziler tutulur:
+        boxes: (N, 4) int32 [x1, y1, x2, y2]
+        scores: (N,) float32
+        class_ids: (N,) int32
+        track_ids: (N,) int32 veya None (tracker atamadıysa)
+
+    Eski {"box", "score", "class_id"} sözlük formatı to_dicts() ile (veya
+    üzerinde dönerek) alınabilir.
+    """
+    __slots__ = ("boxes", "scores", "class_ids", "track_ids")
+
+    def __init__(self, boxes=None, scores=None, class_ids=None, track_ids=None):
+        if boxes is None:
+            boxes = np.empty((0, 4), dtype=np.int32)
+        self.boxes = np.ascontiguousarray(boxes, dtype=np.int32).reshape(-1, 4)
+        n = len(self.boxes)
+
+        if scores is None:
+            scores = np.ones(n, dtype=np.float32)
+        if class_ids is None:
+            class_ids = np.zeros(n, dtype=np.int32)
+        self.scores = np.ascontiguousarray(scores, dtype=np.float32).reshape(-1)
+        self.class_ids = np.ascontiguousarray(class_ids, dtype=np.int32).reshape(-1)
+        self.track_ids = None if track_ids is None else np.ascontiguousarray(track_ids, dtype=np.int32).reshape(-1)
+
+        if len(self.scores) != n or len(self.class_ids) != n or (self.track_ids is not None and len(self.track_ids) != n):
+            raise ValueError(f"❌ Tespit dizilerinin uzunlukları uyuşmuyor: {n} kutu")
+
+    @classmethod
+    def empty(cls):
+        return cls()
+
+    @classmethod
+    def from_dicts(cls, results):
+        """Eski liste-sözlük formatından oluştur"""
+        if isinstance(results, cls):
+            return results
+        if not results:
+            return cls()
+        track_ids = None
+        if all("track_id" in r for r in results):
+            track_ids = [r["track_id"] for r in results]
+        return cls(
+            [r["box"] for r in results],
+            [r["score"] for r in results],
+            [r.get("class_id", 0) for r in results],
+            track_ids
+        )
+
+    @classmethod
+    def concatenate(cls, items):
+        """Birden fazla Detections'ı birleştir (track_ids hepsinde varsa korunur)"""
+        items = [d for d in items if len(d)]
+        if not items:
+            return cls()
+        if len(items) == 1:
+            return items[0]
+
+        track_ids = None
+        if all(d.track_ids is not None for d in items):
+            track_ids = np.concatenate([d.track_ids for d in items])
+        return cls(
+            np.concatenate([d.boxes for d in items]),
+            np.concatenate([d.scores for d in items]),
+            np.concatenate([d.class_ids for d in items]),
+            track_ids
+        )
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __bool__(self):
+        return len(self.boxes) > 0
+
+    def __getitem__(self, index):
+        """
+        Dilimleme, boolean maske veya indeks dizisi -> Detections
+        Tek tamsayı indeks -> eski formatta sözlük
+        """
+        if isinstance(index, (int, np.integer)):
+            return self._dict_at(int(index))
+        return Detections(
+            self.boxes[index],
+            self.scores[index],
+            self.class_ids[index],
+            None if self.track_ids is None else self.track_ids[index]
+        )
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    def __repr__(self):
+        tracked = ", tracked" if self.track_ids is not None else ""
+        return f"Detections(n={len(self)}{tracked})"
+
+    def filter(self, mask):
+        """Boolean maskeye göre alt küme"""
+        return self[np.asarray(mask, dtype=bool)]
+
+    def with_track_ids(self, track_ids):
+        """Aynı tespitler + track ID'leri (diziler kopyalanmaz)"""
+        return Detections(self.boxes, self.scores, self.class_ids, track_ids)
+
+    def areas(self):
+        return (self.boxes[:, 2] - self.boxes[:, 0]) * (self.boxes[:, 3] - self.boxes[:, 1])
+
+    def centers(self):
+        """(N, 2) float32 kutu merkezleri"""
+        return ((self.boxes[:, :2] + self.boxes[:, 2:]) / 2).astype(np.float32)
+
+    def to_dicts(self):
+        """Eski {"box", "score", "class_id"[, "track_id"]} listesi"""
+        rows = zip(self.boxes.tolist(), self.scores.tolist(), self.class_ids.tolist())
+        if self.track_ids is None:
+            return [{"box": box, "score": score, "class_id": class_id} for box, score, class_id in rows]
+        return [
+            {"box": box, "score": score, "class_id": class_id, "track_id": track_id}
+            for (box, score, class_id), track_id in zip(rows, self.track_ids.tolist())
+        ]
+
+    def _dict_at(self, i):
+        result = {
+            "box": self.boxes[i].tolist(),
+            "score": float(self.scores[i]),
+            "class_id": int(self.class_ids[i])
+        }
+        if self.track_ids is not None:
+            result["track_id"] = int(self.track_ids[i])
+        return result
@@ -1,159 +1,327 @@
-import tensorrt as trt
+import time
 import numpy as np
-import cv2
-import pycuda.driver as cuda
-import pycuda.autoinit
+from backends import create_backend, InferenceBackend
+from preprocess import letterbox, LetterboxPreprocessor
+from postprocess import decode_yolov8
+from detections import Detections
+from nms import NMS
+
+
+class InferenceHandle:
+    """
+    Detector.submit() ile başlatılmış bir inference
+
+    Sonuç Detector.result(handle) ile alınır; slot tekrar kullanılmadan önce
+    detector sonucu kendisi toplayıp handle'da saklar (kaybolmaz).
+    """
+    __slots__ = ("slot", "params", "frame_id", "submitted", "preprocess_ms", "results")
+
+    def __init__(self, slot, params, frame_id=None, submitted=0.0, preprocess_ms=0.0, results=None):
+        self.slot = slot
+        self.params = params
+        self.frame_id = frame_id
+        self.submitted = submitted          # perf_counter zamanı
+        self.preprocess_ms = preprocess_ms
+        self.results = results
+
+    @property
+    def done(self):
+        """Sonuç toplandı mı (result() beklemeden döner)"""
+        return self.results is not None
+
 
 class Detector:
-    def __init__(self, engine_path, conf=0.25, iou=0.45, verbose=False):
+    def __init__(self, model_path, conf=0.25, iou=0.45, verbose=False,
+                 max_det=300, min_box_size=10, topk=1000, fused_preprocess=True,
+                 backend="tensorrt", backend_options=None, max_batch=1,
+                 nms_method="auto", class_aware=True, num_slots=2):
+        """
+        Args:
+            model_path: .engine (TensorRT) veya .onnx (CPU backend'leri) dosyası
+            backend: "tensorrt", "onnxruntime", "opencv", "auto" veya hazır bir
+                     InferenceBackend örneği (model_path yok sayılır)
+            backend_options: Backend'e özel ek parametreler (dict)
+            max_batch: infer_batch() için tek execution'daki maksimum frame sayısı
+            nms_method: "auto", "matrix", "bucketed", "greedy" veya "soft"
+            class_aware: Farklı sınıfların kutuları birbirini bastırmaz
+            num_slots: submit()/result() için buffer seti sayısı (TensorRT'de
+                       slot başına CUDA stream, CPU'da worker thread)
+        """
         self.conf = conf
         self.iou = iou
-        self.engine = None
-        self.context = None
+        self.max_det = max_det            # NMS sonrası maksimum tespit
+        self.min_box_size = min_box_size  # Orijinal görüntüde min kutu boyutu (px)
+        self.topk = topk                  # NMS öncesi aday sınırı
+        self.backend = None
         self._cleaned_up = False
         self.verbose = verbose
         
-        self.gpu_buffers = []
-        self.host_buffers = []
-        self.bindings = []
-        self.stream = None
         self.letterbox_params = None
         
+        # NMS motoru (max_det'e ulaşınca erken durur)
+        self.nms = NMS(iou_threshold=iou, max_det=max_det, class_aware=class_aware, method=nms_method)
+        
+        # Fused preprocessing: canvas + geometri önbelleği (boyut backend'den)
+        self.fused_preprocess = fused_preprocess
+        self.preprocessor = None
+        self.input_size = None
+        
         # İstatistikler
         self.frame_count = 0
         self.detection_count = 0
+        self.stage_times = {}  # Son infer()/infer_batch() çağrısının aşama süreleri (ms)
+        self.batch_times = []  # Son infer_batch() çağrısında frame başına süreler (ms)
+        
+        # Asenkron inference: slot başına bekleyen handle
+        self._pending = []
+        self._next_slot = 0
         
         if self.verbose:
-            print("🔧 TensorRT modeli yükleniyor...")
+            print(f"🔧 Model yükleniyor ({backend})...")
         
         try:
-            runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
-            with open(engine_path, "rb") as f:
-                self.engine = runtime.deserialize_cuda_engine(f.read())
+            if isinstance(backend, InferenceBackend):
+                self.backend = backend
+            else:
+                self.backend = create_backend(
+                    backend, model_path, verbose=verbose, max_batch=max_batch, num_slots=num_slots,
+                    **(backend_options or {})
+                )
+            self._pending = [None] * self.backend.num_slots
             
-            self.context = self.engine.create_execution_context()
-            self._allocate_gpu_memory_modern()
+            # Giriş boyutu ve sınıf sayısı modelden (320/416/640 modeller)
+            self.input_size = self.backend.input_size
+            self.preprocessor = LetterboxPreprocessor(new_shape=self.input_size)
             
             if self.verbose:
-                print("✅ Model başarıyla yüklendi")
+                print(f"✅ Model başarıyla yüklendi (backend: {self.backend.name})")
+                print(f"📐 Model: {self.describe()}")
             
         except Exception as e:
             print(f"❌ Model yüklenirken hata: {e}")
             self.cleanup()
             raise
 
-    def _allocate_gpu_memory_modern(self):
-        """Modern TensorRT API için memory allocation"""
-        try:
-            self.stream = cuda.Stream()
-            
-            # INPUT için (1, 3, 640, 640)
-            input_shape = (1, 3, 640, 640)
-            input_size = int(np.prod(input_shape) * np.dtype(np.float32).itemsize)
-            input_gpu = cuda.mem_alloc(input_size)
-            input_host = cuda.pagelocked_empty(input_shape, dtype=np.float32)
-            
-            # DEĞİŞİKLİK: OUTPUT için - (1, 5, 8400) formatına göre
-            output_shape = (1, 5, 8400)  # Modelin gerçek output formatı
-            output_size = int(np.prod(output_shape) * np.dtype(np.float32).itemsize)
-            output_gpu = cuda.mem_alloc(output_size)
-            output_host = cuda.pagelocked_empty(output_shape, dtype=np.float32)
-            
-            self.bindings = [int(input_gpu), int(output_gpu)]
-            self.host_buffers = [input_host, output_host]
-            self.gpu_buffers = [input_gpu, output_gpu]
-            
-            # MODERN TENSORRT: Tensor address'leri set et
-            if hasattr(self.context, 'set_tensor_address'):
-                self.context.set_tensor_address("images", self.bindings[0])
-                self.context.set_tensor_address("output0", self.bindings[1])
-                if self.verbose:
-                    print("✅ Modern TensorRT - Tensor address'ler set edildi")
-            
-            if self.verbose:
-                print(f"✅ Input shape: {input_shape}")
-                print(f"✅ Output shape: {output_shape}")  # (1, 5, 8400)
-            
-        except Exception as e:
-            print(f"❌ GPU memory allocation failed: {e}")
-            raise
-
     def infer(self, frame):
         """Ana inference fonksiyonu - TEMİZ ÇIKTI"""
         if frame is None or frame.size == 0:
-            return []
+            return Detections.empty()
             
         self.frame_count += 1
         h, w = frame.shape[:2]
         
         try:
             # Preprocess
-            img, letterbox_params = self.preprocess_letterbox(frame)
+            start = time.perf_counter()
+            if self.fused_preprocess:
+                img, letterbox_params = self.preprocess_fused(frame)
+            else:
+                img, letterbox_params = self.preprocess_letterbox(frame)
             self.letterbox_params = letterbox_params
+            self.stage_times["preprocess"] = (time.perf_counter() - start) * 1000
             
             # Sadece verbose mode'da göster
             if self.verbose and self.frame_count % 30 == 0:
-                print(f"📐 Frame {self.frame_count}: {w}x{h} -> 640x640")
+                print(f"📐 Frame {self.frame_count}: {w}x{h} -> {self.input_size[1]}x{self.input_size[0]}")
             
-            # GPU inference
-            results = self.infer_gpu_optimized(img, h, w)
-            
-            # Sonuçları göster (her zaman)
-            if results:
-                self.detection_count += len(results)
-                if self.frame_count % 10 == 0:
-                    print(f"🌱 Frame {self.frame_count}: {len(results)} pancar - Toplam: {self.detection_count}")
-            elif self.frame_count % 50 == 0:
-                print(f"🔍 Frame {self.frame_count}: Tespit yok")
+            # Backend inference
+            results = self.infer_backend(img, h, w)
+            self.record_results(results)
                 
             return results
             
         except Exception as e:
             if self.verbose:
                 print(f"❌ Inference error: {e}")
-            return []
+            return Detections.empty()
 
-    def letterbox(self, img, new_shape=(640, 640), color=(114, 114, 114)):
-        """Letterbox preprocessing"""
-        h, w = img.shape[:2]
-        target_h, target_w = new_shape
-        
-        scale = min(target_w / w, target_h / h)
-        new_w = int(w * scale)
-        new_h = int(h * scale)
+    def record_results(self, results):
+        """İstatistikleri güncelle ve sonuçları göster (her zaman)"""
+        if results:
+            self.detection_count += len(results)
+            if self.frame_count % 10 == 0:
+                print(f"🌱 Frame {self.frame_count}: {len(results)} pancar - Toplam: {self.detection_count}")
+        elif self.frame_count % 50 == 0:
+            print(f"🔍 Frame {self.frame_count}: Tespit yok")
+
+    def execute(self, img):
+        """
+        Sadece backend inference - pipeline'ın inference aşaması için
         
-        resized = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        Args:
+            img: Preprocess edilmiş input, ör. (1, 3, 640, 640) float32
+                 veya (1, 640, 640, 3) uint8 (backend.uint8_input)
+            
+        Returns:
+            output: Ham model çıktısının kopyası (backend buffer'ı bir sonraki
+                    çağrıda üzerine yazıldığı için)
+        """
+        input_buffer = self.backend.get_input_buffer()
+        np.copyto(input_buffer[:1], img)
+        return self.backend.infer().copy()
+
+    def submit(self, frame, frame_id=None):
+        """
+        Asenkron inference başlat - beklemeden döner
+
+        Frame sıradaki slot'un input buffer'ına preprocess edilir ve backend'e
+        verilir. Önceki frame GPU'da (veya CPU worker'ında) çalışırken bir
+        sonraki frame'in preprocess'i ve yüklemesi yapılabilir. Slot'ta
+        toplanmamış bir sonuç varsa önce o toplanır. Bekleyen handle varken
+        infer()/infer_batch() çağrılmamalıdır (slot 0 buffer'ı ortaktır).
+
+        Args:
+            frame: BGR frame
+            frame_id: Çağıranın frame numarası (handle'da saklanır)
+
+        Returns:
+            InferenceHandle: Detector.result(handle) ile sonucu al
+        """
+        if frame is None or frame.size == 0:
+            return InferenceHandle(None, None, frame_id, results=Detections.empty())
+
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % len(self._pending)
+        if self._pending[slot] is not None:
+            self.result(self._pending[slot])
+
+        start = time.perf_counter()
+        try:
+            params = self.preprocessor(frame, self.backend.get_input_buffer(slot)[0])
+            preprocess_ms = (time.perf_counter() - start) * 1000
+            self.backend.submit(1, slot)
+        except Exception as e:
+            print(f"❌ {self.backend.name} submit error: {e}")
+            return InferenceHandle(None, None, frame_id, results=Detections.empty())
+
+        handle = InferenceHandle(slot, params, frame_id, time.perf_counter(), preprocess_ms)
+        self._pending[slot] = handle
+        return handle
+
+    def result(self, handle):
+        """
+        submit() edilmiş inference'ın sonucunu bekle ve post-process et
+
+        stage_times: preprocess, infer (submit'ten çıktı hazır olana kadar),
+        wait (bu çağrıda bloklanan süre), postprocess (ms)
+
+        Returns:
+            Detections
+        """
+        if handle.results is not None:
+            return handle.results
+
+        start = time.perf_counter()
+        try:
+            output = self.backend.wait(handle.slot)
+        except Exception as e:
+            print(f"❌ {self.backend.name} inference error: {e}")
+            output = None
+        ready = time.perf_counter()
+        self._pending[handle.slot] = None
+
+        self.frame_count += 1
+        if output is None:
+            handle.results = Detections.empty()
+        else:
+            params = handle.params
+            handle.results = self.post_process_yolov8(
+                output[:1], params['original_h'], params['original_w'], params
+            )
+        self.stage_times = {
+            "preprocess": handle.preprocess_ms,
+            "infer": (ready - handle.submitted) * 1000,
+            "wait": (ready - start) * 1000,
+            "postprocess": (time.perf_counter() - ready) * 1000
+        }
+        self.record_results(handle.results)
+        return handle.results
+
+    def infer_batch(self, frames):
+        """
+        Çoklu frame inference - N frame tek execution'da
+
+        Frame'ler backend input buffer'ına art arda letterbox edilir, tek seferde
+        çalıştırılır ve çıktılar her frame'in kendi letterbox parametreleriyle
+        ayrı ayrı post-process edilir. max_batch'ten fazla frame parçalara bölünür.
+
+        Args:
+            frames: BGR frame listesi (farklı çözünürlükler olabilir)
+
+        Returns:
+            results: Her frame için Detections (frames ile aynı sırada)
+            
+        Süreler: stage_times toplamları, batch_times frame başına
+        preprocess/infer (paylaşılan)/postprocess (ms) içerir.
+        """
+        results = [Detections.empty() for _ in frames]
+        valid = [i for i, frame in enumerate(frames) if frame is not None and frame.size > 0]
+        max_batch = self.backend.max_batch
         
-        pad_w = (target_w - new_w) // 2
-        pad_h = (target_h - new_h) // 2
+        # Frame başına süreler (inference süresi parçadaki frame'lere bölünür)
+        self.batch_times = [{} for _ in frames]
+        self.stage_times = {"preprocess": 0.0, "infer": 0.0, "postprocess": 0.0}
         
-        top = pad_h
-        bottom = pad_h
-        left = pad_w
-        right = pad_w
+        for start in range(0, len(valid), max_batch):
+            chunk = valid[start:start + max_batch]
+            
+            try:
+                # Preprocess - her frame kendi buffer dilimine
+                input_buffer = self.backend.get_input_buffer()
+                params_list = []
+                for slot, i in enumerate(chunk):
+                    t0 = time.perf_counter()
+                    params_list.append(self.preprocessor(frames[i], input_buffer[slot]))
+                    self.batch_times[i]["preprocess"] = (time.perf_counter() - t0) * 1000
+                
+                # Tek execution
+                t0 = time.perf_counter()
+                outputs = self.backend.infer(len(chunk))
+                infer_ms = (time.perf_counter() - t0) * 1000
+                self.stage_times["infer"] += infer_ms
+                
+                # Çıktıları frame'lere ayır
+                for slot, i in enumerate(chunk):
+                    params = params_list[slot]
+                    t0 = time.perf_counter()
+                    results[i] = self.post_process_yolov8(
+                        outputs[slot:slot + 1], params['original_h'], params['original_w'], params
+                    )
+                    self.batch_times[i]["postprocess"] = (time.perf_counter() - t0) * 1000
+                    self.batch_times[i]["infer"] = infer_ms / len(chunk)
+                    
+            except Exception as e:
+                print(f"❌ {self.backend.name} batch inference error: {e}")
         
-        if (target_w - new_w) % 2 != 0:
-            right += 1
-        if (target_h - new_h) % 2 != 0:
-            bottom += 1
+        for times in self.batch_times:
+            self.stage_times["preprocess"] += times.get("preprocess", 0.0)
+            self.stage_times["postprocess"] += times.get("postprocess", 0.0)
         
-        letterboxed = cv2.copyMakeBorder(
-            resized, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color
-        )
+        self.frame_count += len(valid)
+        self.detection_count += sum(len(r) for r in results)
         
-        params = {
-            'scale': scale,
-            'pad_left': left,
-            'pad_top': top,
-            'original_w': w,
-            'original_h': h
-        }
+        if self.verbose:
+            print(f"📦 Batch: {len(valid)} frame, {sum(len(r) for r in results)} tespit")
         
-        return letterboxed, params
+        return results
+
+    def describe(self):
+        """
+        Model bilgisi: tensor adları, shape/dtype, giriş boyutu, anchor ve sınıf sayısı
+        """
+        return self.backend.describe()
+
+    def letterbox(self, img, new_shape=(640, 640), color=(114, 114, 114)):
+        """Letterbox preprocessing"""
+        return letterbox(img, new_shape=new_shape, color=color)
 
     def preprocess_letterbox(self, frame):
-        """Preprocessing"""
-        letterboxed, params = self.letterbox(frame, new_shape=(640, 640))
+        """Preprocessing (yeni dizi döndürür)"""
+        letterboxed, params = self.letterbox(frame, new_shape=self.input_size)
+        
+        # Normalizasyon modelde: uint8 canvas olduğu gibi (1, H, W, 3)
+        if self.backend.uint8_input:
+            return letterboxed[np.newaxis], params
         
         img = letterboxed.astype(np.float32) / 255.0
         img = np.transpose(img, (2, 0, 1))
@@ -161,24 +329,30 @@ class Detector:
         
         return img, params
 
-    def infer_gpu_optimized(self, img, orig_h, orig_w):
-        """GPU inference - SADECE HATA DURUMUNDA DEBUG"""
+    def preprocess_fused(self, frame):
+        """
+        Fused preprocessing - doğrudan backend input buffer'ına yazar
+        (TensorRT'de page-locked buffer)
+
+        Returns:
+            img: Backend input buffer'ı (kopya yok)
+            params: Önbellekli letterbox parametreleri
+        """
+        input_buffer = self.backend.get_input_buffer()
+        params = self.preprocessor(frame, input_buffer[0])
+        return input_buffer, params
+
+    def infer_backend(self, img, orig_h, orig_w):
+        """Backend inference - SADECE HATA DURUMUNDA DEBUG"""
         try:
-            # Input'u kopyala
-            np.copyto(self.host_buffers[0], img)
-            cuda.memcpy_htod_async(self.gpu_buffers[0], self.host_buffers[0], self.stream)
+            # Input'u kopyala (fused preprocessing'de zaten buffer'da)
+            input_buffer = self.backend.get_input_buffer()
+            if img is not input_buffer:
+                np.copyto(input_buffer[:1], img)
             
-            # Modern TensorRT için execute
-            if hasattr(self.context, 'execute_async_v3'):
-                self.context.execute_async_v3(self.stream.handle)
-            else:
-                self.context.execute_async_v2(bindings=self.bindings, stream_handle=self.stream.handle)
-            
-            # Output'u al
-            cuda.memcpy_dtoh_async(self.host_buffers[1], self.gpu_buffers[1], self.stream)
-            self.stream.synchronize()
-            
-            output_data = self.host_buffers[1]
+            start = time.perf_counter()
+            output_data = self.backend.infer()
+            self.stage_times["infer"] = (time.perf_counter() - start) * 1000
             
             # SADECE VERBOSE MODE'DA VEYA İLK FRAME'DE GÖSTER
             if self.verbose and self.frame_count == 1:
@@ -186,140 +360,72 @@ class Detector:
                 non_zero = np.count_nonzero(output_data)
                 print(f"🔍 Sıfır olmayan eleman: {non_zero}/{output_data.size}")
             
-            return self.post_process_yolov8(output_data, orig_h, orig_w)
+            start = time.perf_counter()
+            results = self.post_process_yolov8(output_data, orig_h, orig_w)
+            self.stage_times["postprocess"] = (time.perf_counter() - start) * 1000
+            return results
             
         except Exception as e:
-            print(f"❌ GPU inference error: {e}")
-            return []
+            print(f"❌ {self.backend.name} inference error: {e}")
+            return Detections.empty()
 
-    def post_process_yolov8(self, output, orig_h, orig_w):
+    def post_process_yolov8(self, output, orig_h, orig_w, letterbox_params=None):
         """
-        DEĞİŞİKLİK: (1, 5, 8400) formatı için post-processing
-        Format: (1, 5, 8400) where 5 = [x_center, y_center, width, height, confidence]
+        (1, 4 + nc, anchors) formatı için vektörel post-processing
+        Format: ör. (1, 5, 8400) where 5 = [x_center, y_center, width, height, confidence];
+        anchor ve sınıf sayısı modelden gelir (320 girişte 2100 anchor)
+
+        Decode, letterbox dönüşümü, clamp, min-boyut filtresi ve top-k tek bir
+        NumPy yolunda yapılır; sonuçlar doğrudan dizi olarak NMS'e verilir.
+        letterbox_params verilmezse son infer() çağrısının parametreleri kullanılır.
+
+        Returns:
+            Detections: Skora göre azalan sırada tespitler
         """
         try:
-            # DEĞİŞİKLİK: Output shape: (1, 5, 8400)
-            # Transpose yaparak (8400, 5) formatına getir
-            predictions = output[0].transpose(1, 0)  # Shape: (8400, 5)
-            
-            # Confidence filtering
-            mask = predictions[:, 4] >= self.conf
-            valid_predictions = predictions[mask]
-            
+            if letterbox_params is None:
+                letterbox_params = self.letterbox_params
+            if letterbox_params is None:
+                return Detections.empty()
+
+            boxes, scores, class_ids = decode_yolov8(
+                output,
+                letterbox_params,
+                conf=self.conf,
+                min_box_size=self.min_box_size,
+                topk=self.topk
+            )
+
             # SADECE VERBOSE MODE'DA GÖSTER
             if self.verbose and self.frame_count <= 3:
-                print(f"🔍 Frame {self.frame_count}: {len(valid_predictions)}/{len(predictions)} prediction")
-            
-            if len(valid_predictions) == 0:
-                # SADECE İLK FRAME'LERDE DEBUG GÖSTER
-                if self.verbose and self.frame_count <= 5:
-                    print("🔍 İlk frame'lerde tespit yok, model kontrol ediliyor...")
-                    # İlk 5 prediction'ı göster (sıfır olsa bile)
-                    for i, pred in enumerate(predictions[:5]):
-                        print(f"  Prediction {i}: {pred}")
-                return []
-            
-            if self.letterbox_params is None:
-                return []
-            
-            scale = self.letterbox_params['scale']
-            pad_left = self.letterbox_params['pad_left']
-            pad_top = self.letterbox_params['pad_top']
-            
-            results = []
-            
-            for i, pred in enumerate(valid_predictions):
-                # DEĞİŞİKLİK: Format: [x_center, y_center, width, height, confidence]
-                x_center, y_center, width, height, confidence = pred
-                
-                # DEĞİŞİKLİK: Center formatından corner formatına çevir
-                x1 = x_center - width / 2
-                y1 = y_center - height / 2
-                x2 = x_center + width / 2
-                y2 = y_center + height / 2
-                
-                # SADECE VERBOSE MODE'DA VE İLK DETECTION'LARI GÖSTER
-                if self.verbose and self.frame_count <= 3 and i < 2:
-                    print(f"🔍 Frame {self.frame_count} detection {i}: center=({x_center:.1f},{y_center:.1f}), size=({width:.1f},{height:.1f}), conf={confidence:.3f}")
-                
-                # Letterbox koordinat dönüşümü
-                x1_unpadded = (x1 - pad_left)
-                y1_unpadded = (y1 - pad_top)
-                x2_unpadded = (x2 - pad_left)
-                y2_unpadded = (y2 - pad_top)
-                
-                # Orijinal boyuta çevir
-                x1_orig = int(x1_unpadded / scale)
-                y1_orig = int(y1_unpadded / scale)
-                x2_orig = int(x2_unpadded / scale)
-                y2_orig = int(y2_unpadded / scale)
-                
-                # Boundary check
-                x1_orig = max(0, min(x1_orig, orig_w - 1))
-                y1_orig = max(0, min(y1_orig, orig_h - 1))
-                x2_orig = max(0, min(x2_orig, orig_w - 1))
-                y2_orig = max(0, min(y2_orig, orig_h - 1))
-                
-                bbox_width = x2_orig - x1_orig
-                bbox_height = y2_orig - y1_orig
-                
-                if bbox_width >= 10 and bbox_height >= 10 and x1_orig < x2_orig and y1_orig < y2_orig:
-                    results.append({
-                        "box": [x1_orig, y1_orig, x2_orig, y2_orig],
-                        "score": float(confidence),
-                        "class_id": 0  # Tek sınıf için
-                    })
-            
-            # NMS
-            if len(results) > 1 and self.iou > 0:
-                results = self._apply_nms(results)
-            
-            return results
-            
+                print(f"🔍 Frame {self.frame_count}: {len(boxes)}/{output.shape[-1]} prediction")
+
+            if len(boxes) == 0:
+                return Detections.empty()
+
+            # NMS (Soft-NMS'te skorlar güncellenir)
+            if len(boxes) > 1 and self.iou > 0:
+                keep, scores = self._apply_nms(boxes, scores, class_ids)
+            else:
+                keep = np.argsort(-scores, kind="stable")[:self.max_det]
+                scores = scores[keep]
+
+            return Detections(boxes[keep], scores, class_ids[keep])
+
         except Exception as e:
             if self.verbose:
                 print(f"❌ Post-processing error: {e}")
-            return []
+            return Detections.empty()
 
-    def _apply_nms(self, detections):
-        """Non-Maximum Suppression"""
-        if len(detections) <= 1:
-            return detections
-            
+    def _apply_nms(self, boxes, scores, class_ids=None):
+        """Non-Maximum Suppression - tutulan indeksleri ve skorlarını döndürür"""
         try:
-            boxes = np.array([d["box"] for d in detections])
-            scores = np.array([d["score"] for d in detections])
-            
-            x1 = boxes[:, 0]
-            y1 = boxes[:, 1]
-            x2 = boxes[:, 2]
-            y2 = boxes[:, 3]
-            
-            areas = (x2 - x1 + 1) * (y2 - y1 + 1)
-            order = scores.argsort()[::-1]
-            
-            keep = []
-            while order.size > 0:
-                i = order[0]
-                keep.append(i)
-                
-                xx1 = np.maximum(x1[i], x1[order[1:]])
-                yy1 = np.maximum(y1[i], y1[order[1:]])
-                xx2 = np.minimum(x2[i], x2[order[1:]])
-                yy2 = np.minimum(y2[i], y2[order[1:]])
-                
-                w = np.maximum(0.0, xx2 - xx1 + 1)
-                h = np.maximum(0.0, yy2 - yy1 + 1)
-                inter = w * h
-                ovr = inter / (areas[i] + areas[order[1:]] - inter)
-                
-                inds = np.where(ovr <= self.iou)[0]
-                order = order[inds + 1]
-            
-            return [detections[i] for i in keep]
-            
+            return self.nms(boxes, scores, class_ids)
         except Exception as e:
-            return detections
+            if self.verbose:
+                print(f"❌ NMS error: {e}")
+            keep = np.arange(min(len(boxes), self.max_det))
+            return keep, scores[keep]
 
     def cleanup(self):
         """Cleanup"""
@@ -332,45 +438,9 @@ class Detector:
         self._cleaned_up = True
         
         try:
-            # Stream sync
-            if self.stream:
-                try:
-                    self.stream.synchronize()
-                except:
-                    pass
-            
-            # GPU memory
-            for gpu_buffer in self.gpu_buffers:
-                if gpu_buffer:
-                    try:
-                        gpu_buffer.free()
-                    except:
-                        pass
-            
-            self.gpu_buffers.clear()
-            self.host_buffers.clear()
-            self.bindings.clear()
-            
-            # Context ve engine
-            if self.context:
-                try:
-                    del self.context
-                    self.context = None
-                except:
-                    pass
-            
-            if self.engine:
-                try:
-                    del self.engine
-                    self.engine = None
-                except:
-                    pass
-            
-            if self.stream:
-                try:
-                    self.stream = None
-                except:
-                    pass
+            if self.backend is not None:
+                self.backend.cleanup()
+                self.backend = None
                 
         except Exception as e:
             if self.verbose:
@@ -0,0 +1,266 @@
+import os
+import json
+import time
+import hashlib
+import platform
+
+MANIFEST_NAME = "manifest.json"
+
+# Engine'i etkileyen build ayarları (fingerprint'e hep aynı anahtarlarla girer;
+# INT8 için calibration_dir / calibration_batch / calibration_images de eklenir)
+DEFAULT_SETTINGS = {
+    "precision": "fp16",
+    "workspace_mb": 1024,
+    "min_batch": 1,
+    "opt_batch": 1,
+    "max_batch": 1
+}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Dosya içeriğinin SHA-256 özeti (parça parça okunur)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _device_model():
+    """Jetson modeli (varsa) - engine'ler GPU mimarisine özeldir"""
+    try:
+        with open("/proc/device-tree/model") as f:
+            return f.read().strip("\x00\n ")
+    except OSError:
+        return None
+
+
+def toolchain_info():
+    """
+    Engine uyumluluğunu belirleyen çalışma ortamı bilgisi
+
+    TensorRT engine'leri sürüm ve cihaza özeldir; bunlardan biri değişince
+    önbellekteki engine kullanılamaz.
+    """
+    try:
+        import tensorrt as trt
+        trt_version = trt.__version__
+    except ImportError:
+        trt_version = None
+
+    return {
+        "tensorrt": trt_version,
+        "device": _device_model(),
+        "machine": platform.machine()
+    }
+
+
+def normalize_settings(settings):
+    """Varsayılanlarla tamamlanmış build ayarları"""
+    merged = dict(DEFAULT_SETTINGS)
+    merged.update({k: v for k, v in settings.items() if v is not None})
+    if "opt_batch" not in settings or settings.get("opt_batch") is None:
+        merged["opt_batch"] = merged["max_batch"]
+    return merged
+
+
+def fingerprint(onnx_sha256, settings, toolchain):
+    """ONNX içeriği + build ayarları + toolchain -> önbellek anahtarı"""
+    payload = json.dumps(
+        {"onnx": onnx_sha256, "settings": settings, "toolchain": toolchain},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _default_builder(onnx_path, engine_path, timing_cache_path=None, **settings):
+    # tensorrt sadece gerçekten build gerektiğinde yüklenir
+    from build_engine import build_engine
+
+    calibrator = None
+    calibration = {k: settings.pop(k) for k in list(settings) if k.startswith("calibration_")}
+    if settings.get("precision") == "int8":
+        from calibration import make_calibrator
+        # Kalibrasyon tablosu modele özel: engine ile aynı anahtarla saklanır
+        engine_name = os.path.basename(engine_path).split(".engine")[0]
+        calibrator = make_calibrator(
+            calibration.get("calibration_dir"),
+            cache_file=os.path.join(os.path.dirname(engine_path), f"calib-{engine_name}.cache"),
+            batch_size=calibration.get("calibration_batch", 8),
+            max_images=calibration.get("calibration_images", 500)
+        )
+    return build_engine(onnx_path, engine_path, timing_cache_path=timing_cache_path, calibrator=calibrator, **settings)
+
+
+class EngineCache:
+    def __init__(self, cache_dir="engines", builder=None, toolchain=None, verbose=False):
+        """
+        Fingerprint'li TensorRT engine önbelleği
+
+        Her engine, ONNX içeriği + build ayarları + toolchain (TensorRT sürümü,
+        cihaz) özetiyle anahtarlanır ve manifest.json'da kaydedilir. Eşleşen
+        engine anında kullanılır, herhangi biri değişirse yeniden build edilir.
+        Builder zamanlama önbelleği (timing cache) toolchain başına saklanır.
+
+        Args:
+            cache_dir: Engine ve manifest dizini
+            builder: (onnx_path, engine_path, timing_cache_path=..., **settings) -> bool
+                     (None: build_engine.build_engine; testte sahte builder verilebilir)
+            toolchain: Toolchain bilgisi (None: toolchain_info())
+        """
+        self.cache_dir = cache_dir
+        self.builder = builder or _default_builder
+        self.toolchain = toolchain if toolchain is not None else toolchain_info()
+        self.verbose = verbose
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {"engines": {}, "onnx_hashes": {}}
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Manifest okunamadı, sıfırlanıyor: {e}")
+            return {"engines": {}, "onnx_hashes": {}}
+        manifest.setdefault("engines", {})
+        manifest.setdefault("onnx_hashes", {})
+        return manifest
+
+    def _save_manifest(self):
+        # Yarım yazılmış manifest kalmasın: geçici dosya + atomik rename
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def onnx_sha256(self, onnx_path):
+        """
+        ONNX özeti - boyut ve mtime değişmediyse manifest'teki değer kullanılır
+        (Nano'da büyük modelleri her açılışta yeniden okumamak için)
+        """
+        stat = os.stat(onnx_path)
+        key = os.path.abspath(onnx_path)
+        cached = self.manifest["onnx_hashes"].get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime:
+            return cached["sha256"]
+
+        sha256 = file_sha256(onnx_path)
+        self.manifest["onnx_hashes"][key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+        self._save_manifest()
+        return sha256
+
+    def timing_cache_path(self):
+        """Toolchain'e özel builder timing cache dosyası"""
+        key = fingerprint(None, None, self.toolchain)[:12]
+        return os.path.join(self.cache_dir, f"timing-{key}.cache")
+
+    def key_for(self, onnx_path, **settings):
+        settings = normalize_settings(settings)
+        return fingerprint(self.onnx_sha256(onnx_path), settings, self.toolchain), settings
+
+    def lookup(self, onnx_path, **settings):
+        """
+        Returns:
+            Eşleşen engine yolu veya None
+        """
+        key, _ = self.key_for(onnx_path, **settings)
+        return self._valid_path(key)
+
+    def _valid_path(self, key):
+        entry = self.manifest["engines"].get(key)
+        if entry is None:
+            return None
+        path = os.path.join(self.cache_dir, entry["engine"])
+        if not os.path.exists(path) or os.path.getsize(path) != entry.get("size"):
+            if self.verbose:
+                print(f"⚠️  Önbellek kaydı bozuk, yeniden build edilecek: {entry['engine']}")
+            return None
+        return path
+
+    def get_or_build(self, onnx_path, **settings):
+        """
+        Eşleşen engine'i döndür, yoksa build edip önbelleğe ekle
+
+        Args:
+            onnx_path: Kaynak ONNX modeli
+            settings: precision, workspace_mb, min_batch, opt_batch, max_batch
+
+        Returns:
+            engine_path
+
+        Raises:
+            FileNotFoundError: ONNX yok
+            RuntimeError: Build başarısız
+        """
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(f"❌ ONNX dosyası bulunamadı: {onnx_path}")
+
+        key, settings = self.key_for(onnx_path, **settings)
+        path = self._valid_path(key)
+        if path is not None:
+            self.hits += 1
+            self.manifest["engines"][key]["last_used"] = time.time()
+            self._save_manifest()
+            print(f"✅ Engine önbellekte bulundu: {path}")
+            return path
+
+        self.misses += 1
+        name = f"{os.path.splitext(os.path.basename(onnx_path))[0]}-{key[:12]}.engine"
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = path + ".tmp"
+        print(f"🔨 Engine önbellekte yok, build ediliyor: {name}")
+
+        start = time.time()
+        ok = self.builder(onnx_path, tmp_path, timing_cache_path=self.timing_cache_path(), **settings)
+        if not ok or not os.path.exists(tmp_path):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise RuntimeError(f"❌ Engine build başarısız: {onnx_path}")
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        self.manifest["engines"][key] = {
+            "engine": name,
+            "onnx": os.path.abspath(onnx_path),
+            "onnx_sha256": self.onnx_sha256(onnx_path),
+            "settings": settings,
+            "toolchain": self.toolchain,
+            "size": os.path.getsize(path),
+            "build_seconds": round(now - start, 2),
+            "created": now,
+            "last_used": now
+        }
+        self._save_manifest()
+        print(f"✅ Engine önbelleğe eklendi ({now - start:.1f} s): {path}")
+        return path
+
+    def entries(self):
+        return dict(self.manifest["engines"])
+
+    def prune(self, keep=3):
+        """
+        En son kullanılan keep engine dışındakileri sil
+
+        Returns:
+            Silinen engine sayısı
+        """
+        ordered = sorted(self.manifest["engines"].items(), key=lambda item: item[1].get("last_used", 0), reverse=True)
+        removed = 0
+        for key, entry in ordered[keep:]:
+            path = os.path.join(self.cache_dir, entry["engine"])
+            if os.path.exists(path):
+                os.remove(path)
+            del self.manifest["engines"][key]
+            removed += 1
+        if removed:
+            self._save_manifest()
+        return removed
@@ -0,0 +1,127 @@
+import time
+from metrics import RollingWindow
+
+
+class ModelGovernor:
+    def __init__(self, variants, target_ms=66.0, window=30, upgrade_ratio=0.7, min_dwell=60,
+                 retry_after=900, warmup_frames=2, clock=time.perf_counter, verbose=False):
+        """
+        Gecikme hedefli (latency SLO) model seçici
+
+        Aynı anda yüklü model varyantları (ör. 640 / 416 / 320 girişli) arasında
+        çalışma anında geçiş yapar: aktif modelin kayan penceredeki p95 inference
+        süresi hedefi aşarsa daha hızlı modele iner, hedefin belirgin altında
+        kalırsa daha doğru modeli tekrar dener. Titreşimi önlemek için:
+        - iniş ve çıkış eşikleri farklıdır (target_ms / target_ms * upgrade_ratio),
+        - her geçişten sonra en az min_dwell frame beklenir,
+        - hedefi aştığı ölçülen model retry_after frame geçmeden tekrar denenmez.
+
+        Detector ile aynı infer()/stage_times arayüzünü sunar (TrackedDetector
+        ile kullanılabilir).
+
+        Args:
+            variants: [(ad, detector), ...] en doğrudan (yavaş) en hızlıya sıralı
+            target_ms: p95 inference süresi hedefi (ms)
+            window: p95 için kayan pencere (frame)
+            upgrade_ratio: p95 < target_ms * upgrade_ratio ise daha doğru modele çık
+            min_dwell: Geçişten sonra karar vermeden önce en az kaç frame
+            retry_after: Hedefi aşmış modeli tekrar denemek için beklenecek frame
+            warmup_frames: Geçişten sonra pencereye alınmayan ilk frame sayısı
+        """
+        if not variants:
+            raise ValueError("❌ En az bir model varyantı gerekli")
+
+        self.names = [name for name, _ in variants]
+        self.detectors = [detector for _, detector in variants]
+        self.target_ms = target_ms
+        self.window = window
+        self.upgrade_ratio = upgrade_ratio
+        self.min_dwell = max(min_dwell, window)
+        self.retry_after = retry_after
+        self.warmup_frames = warmup_frames
+        self.clock = clock
+        self.verbose = verbose
+
+        self.active = 0
+        self.frame_count = 0
+        self.switches = 0
+        self.stage_times = {}
+        self.frames = [0] * len(variants)          # Varyant başına işlenen frame
+        self.measured = [None] * len(variants)     # Varyant başına (son p95, ölçüldüğü frame)
+        self._latencies = RollingWindow(window)
+        self._frames_on_active = 0
+
+    @property
+    def detector(self):
+        """Aktif model"""
+        return self.detectors[self.active]
+
+    @property
+    def active_name(self):
+        return self.names[self.active]
+
+    def infer(self, frame):
+        """
+        Aktif modelle inference, ardından gecikme politikasını değerlendir
+
+        Returns:
+            Detections
+        """
+        detector = self.detectors[self.active]
+        start = self.clock()
+        results = detector.infer(frame)
+        elapsed_ms = (self.clock() - start) * 1000
+
+        self.stage_times = dict(detector.stage_times)
+        self.frame_count += 1
+        self.frames[self.active] += 1
+        self._frames_on_active += 1
+        if self._frames_on_active > self.warmup_frames:
+            self._latencies.add(elapsed_ms)
+        self._evaluate()
+        return results
+
+    def p95(self):
+        """Aktif modelin penceredeki p95 süresi (pencere dolmadıysa None)"""
+        if self._latencies.count < self.window:
+            return None
+        percentiles, _ = self._latencies.percentiles((95,))
+        return percentiles["p95"]
+
+    def _evaluate(self):
+        if self._frames_on_active < self.min_dwell:
+            return
+        p95 = self.p95()
+        if p95 is None:
+            return
+        self.measured[self.active] = (p95, self.frame_count)
+
+        if p95 > self.target_ms and self.active < len(self.detectors) - 1:
+            self._switch(self.active + 1, p95)
+        elif p95 < self.target_ms * self.upgrade_ratio and self.active > 0:
+            # Daha doğru model hedefi aştığı için bırakıldıysa bir süre tekrar deneme
+            previous = self.measured[self.active - 1]
+            if previous is None or previous[0] <= self.target_ms or \
+                    self.frame_count - previous[1] >= self.retry_after:
+                self._switch(self.active - 1, p95)
+
+    def _switch(self, index, p95):
+        direction = "⬇️" if index > self.active else "⬆️"
+        print(f"{direction}  Model: {self.names[self.active]} -> {self.names[index]} "
+              f"(p95 {p95:.1f} ms, hedef {self.target_ms:.1f} ms)")
+        self.active = index
+        self.switches += 1
+        self._latencies = RollingWindow(self.window)
+        self._frames_on_active = 0
+
+    def get_stats(self):
+        return {
+            "active": self.active_name,
+            "switches": self.switches,
+            "frames": dict(zip(self.names, self.frames)),
+            "p95": {name: round(m[0], 2) for name, m in zip(self.names, self.measured) if m is not None}
+        }
+
+    def cleanup(self):
+        for detector in self.detectors:
+            detector.cleanup()
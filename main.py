@@ -1,49 +1,297 @@
 import cv2
+import os
 import time
+import numpy as np
 from detector import Detector
-from camera import Camera
+from camera import Camera, CSICamera
+from sources import VideoFileSource, ImageFolderSource, SyntheticSource, EndOfStream
 from metrics import Metrics
-from visualizer import Visualizer
+from visualizer import Visualizer, RENDER_COPY, RENDER_INPLACE, RENDER_BUFFER
+from backends import resolve_backend_name
+from pipeline import Pipeline, BufferPool, FramePacket, release_buffer, DROP_OLDEST
+from tracker import Tracker, TrackedDetector
+from motion import MotionGate
+from tiling import TiledDetector
+from engine_cache import EngineCache
+from governor import ModelGovernor
+from cascade import CascadeDetector, EscalationPolicy
+from preview import PreviewServer
+from recorder import Recorder
+from detection_log import DetectionLogWriter
+from multicam import CameraFeed, BatchScheduler, make_mosaic
 
 ENGINE_MODEL_PATH = "model2.engine"
+ONNX_MODEL_PATH = "model2.onnx"
+USE_ENGINE_CACHE = True   # ONNX varsa engine'i fingerprint'li önbellekten al (gerekirse build et)
+ENGINE_CACHE_DIR = "engines"
+ENGINE_PRECISION = "fp16"  # fp16 | fp32 | int8 (int8: CALIBRATION_DIR veya mevcut kalibrasyon tablosu gerekli)
+CALIBRATION_DIR = None     # INT8 kalibrasyon görüntüleri (saha frame'leri)
+# Gecikme hedefli model seçimi: [(ad, engine, onnx), ...] en doğrudan en hızlıya. Örnek:
+# [("640", "model2.engine", "model2.onnx"), ("416", "model2_416.engine", "model2_416.onnx"),
+#  ("320", "model2_320.engine", "model2_320.onnx")]
+MODEL_VARIANTS = []
+LATENCY_TARGET_MS = 66.0   # MODEL_VARIANTS ile: p95 inference süresi hedefi (ms)
+# Kademeli tespit: hızlı model her frame'de, ana model sadece belirsiz frame'lerde
+CASCADE = False
+CASCADE_FAST_MODEL = ("model1.engine", "model1.onnx")
+CASCADE_FAST_CONF = 0.27         # Hızlı modelin kabul eşiği
+CASCADE_BAND = (0.15, 0.40)      # Bu aralıkta skor varsa ana modele devret
+CASCADE_COUNT_JUMP = 3           # Tespit sayısı bu kadar değişirse ana modele devret
+CASCADE_REFRESH_EVERY = 30       # En fazla kaç frame ana model çalışmadan geçebilir (None: sınırsız)
+BACKEND = "tensorrt"  # tensorrt | onnxruntime | opencv | auto
 CONF_THRESHOLD = 0.5 #model1:0.27 model2:0.52
 NMS_THRESHOLD = 0.30
 CLASS_NAMES = ["sugar_beet"]
+THREADED_CAPTURE = True  # Arka planda yakalama - her zaman en güncel frame
+CAPTURE_BUFFER_SIZE = 4
+PIPELINE_QUEUE_SIZE = 2         # Aşamalar arası kuyruk kapasitesi
+PIPELINE_POLICY = DROP_OLDEST   # BLOCK: her frame işlenir, DROP_OLDEST: en güncel frame öncelikli
+ASYNC_INFERENCE = False  # Frame N çalışırken N-1'i çiz/göster (tek thread, bir frame gecikme)
+INFERENCE_SLOTS = 2      # Asenkron inference buffer seti / CUDA stream sayısı
+TRACKING = False       # Kalıcı pancar ID'leri ve benzersiz sayım (--track)
+DETECT_EVERY = 1       # Tam inference kaç frame'de bir (aradaki frame'lerde tracker ilerletir)
+DETECT_FPS = None      # Hedef inference hızı (verilirse DETECT_EVERY yerine)
+MOTION_GATE = False            # Sahne değişmediyse inference atla (araç dururken; yavaş ilerlemede de atlar)
+MOTION_METHOD = "diff"         # diff | dhash
+MOTION_CHANGE_RATIO = 0.01     # diff: değişen piksel oranı eşiği
+MOTION_REFRESH_INTERVAL = 30   # En fazla kaç frame üst üste atlanabilir
+TILED = False          # Yüksek çözünürlükte örtüşen 640x640 tile'larla inference
+TILE_SIZE = 640
+TILE_OVERLAP = 0.2
+MAX_TILES = 6          # Tek batch'te çalışması için engine max_batch >= MAX_TILES olmalı
+RENDER_MODE = RENDER_INPLACE  # copy | inplace | buffer - inplace: frame kopyalanmadan üzerine çizilir
+DISPLAY_SCALE = 1.0    # Çizim/gösterim ölçeği (ör. 0.5: 1080p kamera 960x540 gösterilir)
+DISPLAY_FPS = None     # Gösterim hızı sınırı (None: her frame) - inference hızından bağımsız
+WINDOW_NAME = "Pancar Algılama (TensorRT)"
+HEADLESS = False       # Ekransız: pencere yerine yerel MJPEG/HTTP önizleme sunucusu
+PREVIEW_HOST = "127.0.0.1"   # Sadece yerel; saha ağından izlemek için "0.0.0.0" (--preview-host, kimlik doğrulama yok)
+PREVIEW_PORT = 8080
+PREVIEW_QUALITY = 70   # JPEG kalitesi
+PREVIEW_FPS = 10.0     # En fazla kodlama hızı (izleyici yoksa hiç kodlanmaz)
+PREVIEW_WORKERS = 2    # JPEG kodlama thread sayısı
+RECORDING = False           # Son RECORD_PRE_SECONDS saniye bellekte, olayda ('r' / eşik) diske klip
+RECORD_CONTINUOUS = False   # Tüm örnekleri RECORD_SEGMENT_SECONDS'lık dosyalara kaydet
+RECORD_DIR = "recordings"
+RECORD_FPS = 10.0           # Kayıt / örnekleme hızı
+RECORD_SCALE = 0.5          # Kayıt ölçeği (ring buffer belleği: ~1.5 MB/frame 1080p'de 0.5 ile)
+RECORD_PRE_SECONDS = 5.0
+RECORD_POST_SECONDS = 5.0
+RECORD_SEGMENT_SECONDS = 60.0
+RECORD_MIN_COUNT = None     # Tespit sayısı bu değere ulaşınca olay klibi (None: kapalı)
+RECORD_COUNT_JUMP = None    # Tespit sayısı bir örnekte bu kadar değişince olay klibi (None: kapalı)
+RECORD_QUEUE_SIZE = 64      # Yazıcı kuyruğu - doluysa (SD kart yavaş) frame beklemeden atılır
+DETECTION_LOG = False            # Tespitleri ikili, ekleme-only loga yaz (detection_log.py ile sorgula)
+DETECTION_LOG_DIR = "detections"
+DETECTION_LOG_SEGMENT = 1000000  # Segment başına kayıt (~42 MB)
+MULTICAM_DEADLINE_MS = 150.0     # Çoklu kamera: bundan eski frame işlenmeden atılır
+MULTICAM_GATHER_MS = 5.0         # Çoklu kamera: batch'i doldurmak için en fazla bekleme
 
 class LiveDetectionApp:
-    def __init__(self, camera_id=0, verbose=False):
+    def __init__(self, camera_id=0, verbose=False, backend=BACKEND, pipelined=False, source=None,
+                 tracking=TRACKING, detect_every=DETECT_EVERY, detect_fps=DETECT_FPS,
+                 motion_gate=MOTION_GATE, tiled=TILED, async_inference=ASYNC_INFERENCE,
+                 model_variants=MODEL_VARIANTS, latency_target_ms=LATENCY_TARGET_MS, cascade=CASCADE,
+                 display_scale=DISPLAY_SCALE, display_fps=DISPLAY_FPS, headless=HEADLESS,
+                 preview_port=PREVIEW_PORT, preview_host=PREVIEW_HOST, recording=RECORDING, record_continuous=RECORD_CONTINUOUS,
+                 detection_log=DETECTION_LOG, sources=None):
         """
         Canlı tespit uygulaması
         
         Args:
             camera_id: USB kamera ID (0, 1, 2...)
+            source: Hazır FrameSource (video, klasör, sentetik...); None ise USB kamera açılır
             verbose: Detaylı log
+            backend: Inference backend (tensorrt, onnxruntime, opencv, auto)
+            pipelined: Aşamaları ayrı thread'lerde çalıştır (pipeline modu)
+            tracking: Tespitleri takip et (kalıcı ID, benzersiz sayım)
+            detect_every, detect_fps: Takip modunda inference sıklığı
+            motion_gate: Değişmeyen sahnelerde inference'ı atla
+            tiled: Frame'i örtüşen tile'lara bölerek batch halinde çalıştır
+            async_inference: submit/result ile inference'ı yakalama ve çizimle örtüştür
+            model_variants: [(ad, engine, onnx), ...] - gecikme hedefine göre model değiştir
+            latency_target_ms: Model varyantları için p95 inference hedefi
+            cascade: Hızlı model (CASCADE_FAST_MODEL) her frame'de, ana model belirsiz frame'lerde
+            display_scale: Çizim/gösterim ölçeği
+            display_fps: Gösterim hızı sınırı (None: her frame)
+            headless: Pencere açma, çizimleri MJPEG/HTTP önizleme sunucusundan yayınla
+            preview_port: Önizleme sunucusu portu
+            preview_host: Önizleme sunucusunun dinleyeceği adres
+            recording: Olay öncesi ring buffer ve olay klipleri (elle 'r' veya tespit eşiği)
+            record_continuous: Sürekli segment kaydı
+            detection_log: Tespitleri DETECTION_LOG_DIR altına ikili loga yaz
+            sources: Çoklu kamera için FrameSource listesi - tek detector'ı batch halinde paylaşır
         """
         self.detector = None
-        self.camera = None
+        self.governor = None
+        self.cascade = None
+        self.tiled = None
+        self.tracked = None
+        self.motion_gate = None
+        self.preview = None
+        self.recorder = None
+        self.detection_log = None
+        self.scheduler = None
+        self.sources = sources or []
+        self.camera = source  # Kamera veya herhangi bir FrameSource
         self._cleaned_up = False
         self.verbose = verbose
         self.camera_id = camera_id
+        self.pipelined = pipelined
+        self.async_inference = async_inference
+        self.display_scale = display_scale
+        self.display_fps = display_fps
+        self.headless = headless
+        self.preview_port = preview_port
+        self.preview_host = preview_host
+        self.recording = recording or record_continuous
+        self.record_continuous = record_continuous
+        self.log_detections = detection_log
+        self.screenshot_count = 0
+        self._snapshot_visualizer = None
         
         print("PANCAR TESPİT SİSTEMİ")
         
-        # Model yükle
-        print("\n📦 TensorRT modeli yükleniyor...")
+        # Çoklu kamera: tek engine tüm kameraları sıralı-batch modunda işler
+        if self.sources:
+            # Hareket kapısı da kapalı: kameralar batch'te birlikte çalışır, tek kameranın atlanması kazanç getirmez
+            if pipelined or async_inference or tiled or cascade or len(model_variants) > 1:
+                print("⚠️  Çoklu kamerada pipeline, asenkron, döşemeli, kademeli mod ve model varyantları kullanılmaz")
+            if detect_every != 1 or detect_fps:
+                print("⚠️  Çoklu kamerada her frame'de inference çalışır (--detect-every/--detect-fps yok sayıldı)")
+            if self.recording or detection_log:
+                print("⚠️  Çoklu kamerada kayıt ve tespit logu kullanılmaz")
+            self.pipelined = pipelined = False
+            self.async_inference = async_inference = False
+            self.recording = self.record_continuous = False
+            self.log_detections = False
+            tiled = cascade = motion_gate = False
+            model_variants = model_variants[:1]
+        max_batch = len(self.sources) if self.sources else (MAX_TILES if tiled else 1)
+        
+        # Model yükle (varyantlar sadece sıralı modda, tile'sız kullanılır)
+        if model_variants and (pipelined or async_inference or tiled):
+            print("⚠️  Model varyantları sadece sıralı modda kullanılır, ilk varyant yüklenecek")
+            model_variants = model_variants[:1]
+        if cascade and (pipelined or async_inference or tiled):
+            print("⚠️  Kademeli tespit sadece sıralı modda kullanılır, kapatıldı")
+            cascade = False
+        if cascade and model_variants:
+            print("⚠️  Kademeli tespitte model varyantları kullanılmaz, ilk varyant ana model")
+            model_variants = model_variants[:1]
+        variants = model_variants or [("model", ENGINE_MODEL_PATH, ONNX_MODEL_PATH)]
+        backend = resolve_backend_name(backend, variants[0][1])
         try:
-            self.detector = Detector(
-                ENGINE_MODEL_PATH, 
-                conf=CONF_THRESHOLD, 
-                iou=NMS_THRESHOLD, 
-                verbose=verbose
-            )
-            print("✅ Model başarıyla yüklendi")
+            detectors = []
+            for name, engine_path, onnx_path in variants:
+                model_path = self._resolve_model_path(backend, engine_path, onnx_path, max_batch)
+                print(f"\n📦 Model yükleniyor ({backend}: {model_path})...")
+
+                detector = Detector(
+                    model_path, 
+                    conf=CONF_THRESHOLD, 
+                    iou=NMS_THRESHOLD, 
+                    verbose=verbose,
+                    backend=backend,
+                    max_batch=max_batch,
+                    num_slots=INFERENCE_SLOTS if async_inference else 1
+                )
+                detectors.append((name, detector))
+                input_h, input_w = detector.input_size
+                print(f"✅ Model başarıyla yüklendi ({input_w}x{input_h}, {detector.backend.num_classes} sınıf)")
+            
+            self.detector = detectors[0][1]
+            if len(detectors) > 1:
+                self.governor = ModelGovernor(detectors, target_ms=latency_target_ms, verbose=verbose)
+                print(f"🎚️  Model seçici: {', '.join(self.governor.names)} (p95 hedefi {latency_target_ms} ms)")
+            
+            if cascade:
+                engine_path, onnx_path = CASCADE_FAST_MODEL
+                model_path = self._resolve_model_path(backend, engine_path, onnx_path, 1)
+                print(f"\n📦 Hızlı model yükleniyor ({backend}: {model_path})...")
+                # Hızlı model bandın altından itibaren tespit döndürür ki belirsizler görülebilsin
+                fast = Detector(
+                    model_path,
+                    conf=CASCADE_BAND[0],
+                    iou=NMS_THRESHOLD,
+                    verbose=verbose,
+                    backend=backend
+                )
+                policy = EscalationPolicy(
+                    band=CASCADE_BAND, count_jump=CASCADE_COUNT_JUMP, refresh_every=CASCADE_REFRESH_EVERY
+                )
+                self.cascade = CascadeDetector(
+                    fast, self.detector, policy=policy, accept_conf=CASCADE_FAST_CONF, verbose=verbose
+                )
+                input_h, input_w = fast.input_size
+                print(f"🪜 Kademeli tespit: hızlı model {input_w}x{input_h}, belirsiz bant {CASCADE_BAND}")
+            
+            if tiled:
+                self.tiled = TiledDetector(
+                    self.detector, tile_size=TILE_SIZE, overlap=TILE_OVERLAP,
+                    max_tiles=MAX_TILES, verbose=verbose
+                )
+                print(f"🧩 Döşemeli inference: {TILE_SIZE}px, örtüşme {TILE_OVERLAP}, en fazla {MAX_TILES} tile")
+            
+            if self.sources:
+                # Her kameranın kendi tracker'ı (ID'ler ve benzersiz sayım kamera bazlı)
+                feeds = [
+                    CameraFeed(f"cam{i}", src, tracker=Tracker(verbose=verbose) if tracking else None, verbose=verbose)
+                    for i, src in enumerate(self.sources)
+                ]
+                self.scheduler = BatchScheduler(
+                    self.detector, feeds, deadline_ms=MULTICAM_DEADLINE_MS,
+                    gather_ms=MULTICAM_GATHER_MS, verbose=verbose
+                )
+                print(f"🎥 Çoklu kamera: {len(feeds)} kaynak, batch {self.scheduler.max_batch}, "
+                      f"deadline {MULTICAM_DEADLINE_MS} ms")
+            elif tracking:
+                self.tracked = TrackedDetector(
+                    self.tiled or self.cascade or self.governor or self.detector, Tracker(verbose=verbose),
+                    detect_every=detect_every, detect_fps=detect_fps
+                )
+                rate = f"{detect_fps} FPS" if detect_fps else f"her {max(1, detect_every)} frame"
+                print(f"🆔 Takip açık (inference: {rate})")
+            elif detect_every != 1 or detect_fps:
+                print("⚠️  --detect-every/--detect-fps sadece takip açıkken (--track) kullanılır")
+            
+            if motion_gate:
+                self.motion_gate = MotionGate(
+                    method=MOTION_METHOD,
+                    change_ratio=MOTION_CHANGE_RATIO,
+                    refresh_interval=MOTION_REFRESH_INTERVAL,
+                    verbose=verbose
+                )
             
         except Exception as e:
             print(f"❌ Model yüklenirken hata oluştu: {e}")
             raise
 
+    def _resolve_model_path(self, backend, engine_path, onnx_path, max_batch):
+        """Backend'e göre model dosyası (TensorRT'de ONNX varsa engine önbelleğinden)"""
+        if backend != "tensorrt":
+            return onnx_path
+        if not (USE_ENGINE_CACHE and os.path.exists(onnx_path)):
+            return engine_path
+        # ONNX / ayarlar / TensorRT sürümüyle eşleşen engine (yoksa build)
+        calibration = {"calibration_dir": CALIBRATION_DIR} if ENGINE_PRECISION == "int8" else {}
+        return EngineCache(ENGINE_CACHE_DIR, verbose=self.verbose).get_or_build(
+            onnx_path, max_batch=max_batch, precision=ENGINE_PRECISION, **calibration
+        )
+
     def initialize_camera(self):
         """Kamerayı başlat ve boyutları öğren"""
+        if self.sources:
+            for feed in self.scheduler.feeds:
+                src_width, src_height = feed.source.get_resolution()
+                print(f"✅ {feed.name} hazır: {type(feed.source).__name__} {src_width}x{src_height}")
+            return True
+        
+        if self.camera is not None:
+            # Dışarıdan verilen kaynak (video, klasör, sentetik)
+            src_width, src_height = self.camera.get_resolution()
+            print(f"\n✅ Kaynak hazır: {type(self.camera).__name__} {src_width}x{src_height}")
+            return True
+        
         print("\n📷 Kamera başlatılıyor...")
         
         try:
@@ -52,7 +300,9 @@ class LiveDetectionApp:
                 cam_id=self.camera_id,
                 preferred_width=None,  # Kameranın varsayılanı
                 preferred_height=None,
-                verbose=self.verbose
+                verbose=self.verbose,
+                threaded=THREADED_CAPTURE,
+                buffer_size=CAPTURE_BUFFER_SIZE
             )
             
             # Kamera çözünürlüğünü al
@@ -83,62 +333,71 @@ class LiveDetectionApp:
         if not self.initialize_camera():
             return
         
+        if self.headless:
+            try:
+                self.preview = PreviewServer(
+                    host=self.preview_host, port=self.preview_port, quality=PREVIEW_QUALITY,
+                    max_fps=PREVIEW_FPS, workers=PREVIEW_WORKERS, verbose=self.verbose
+                ).start()
+            except OSError as e:
+                print(f"❌ Önizleme sunucusu başlatılamadı (port {self.preview_port}): {e}")
+                self.cleanup()
+                return
+        
+        # Ekran görüntüleri ve klipler arka planda yazılır (döngü diski beklemez)
+        self.recorder = Recorder(
+            output_dir=RECORD_DIR, fps=RECORD_FPS, scale=RECORD_SCALE,
+            pre_seconds=RECORD_PRE_SECONDS if self.recording else 0, post_seconds=RECORD_POST_SECONDS,
+            min_count=RECORD_MIN_COUNT, count_jump=RECORD_COUNT_JUMP, continuous=self.record_continuous,
+            segment_seconds=RECORD_SEGMENT_SECONDS, queue_size=RECORD_QUEUE_SIZE, verbose=self.verbose
+        )
+        if self.recording:
+            print(f"🎥 Kayıt: {RECORD_DIR}/ ({RECORD_FPS} FPS, olay öncesi {RECORD_PRE_SECONDS} s"
+                  f"{', sürekli' if self.record_continuous else ''})")
+        
+        if self.log_detections:
+            self.detection_log = DetectionLogWriter(
+                DETECTION_LOG_DIR, segment_records=DETECTION_LOG_SEGMENT, verbose=self.verbose
+            )
+            print(f"🗂️  Tespit logu: {DETECTION_LOG_DIR}/")
+        
         metrics = Metrics()
-        visualizer = Visualizer(CLASS_NAMES)
+        # Çizim ayrı thread'de gösteriliyor/kodlanıyorsa tek paylaşılan buffer'ın üzerine yazılabilir:
+        # buffer sadece RENDER_BUFFER'da kullanılır (inplace ölçekte de yeni görüntü üretir)
+        shared = self.pipelined or self.headless
+        render_mode = RENDER_COPY if shared and RENDER_MODE == RENDER_BUFFER else RENDER_MODE
+        visualizer = Visualizer(CLASS_NAMES, mode=render_mode, scale=self.display_scale, max_fps=self.display_fps)
 
         print("\n" + "=" * 60)
         print("🎬 CANLI GÖRÜNTÜ BAŞLADI")
-        print("   Çıkmak için 'q' tuşuna basın")
-        print("   Ekran görüntüsü için 's' tuşuna basın")
+        if self.preview is not None:
+            print(f"   Önizleme: {self.preview.url}")
+            print(f"   Durdurmak için: curl -X POST '{self.preview.url}control?cmd=quit'")
+            print(f"   Ekran görüntüsü için: curl -X POST '{self.preview.url}control?cmd=screenshot'")
+            if self.recording:
+                print(f"   Olay kaydı için: curl -X POST '{self.preview.url}control?cmd=record'")
+        else:
+            print("   Çıkmak için 'q' tuşuna basın")
+            print("   Ekran görüntüsü için 's' tuşuna basın")
+            if self.recording:
+                print("   Olay kaydı için 'r' tuşuna basın")
         print("=" * 60 + "\n")
 
-        frame_count = 0
-        screenshot_count = 0
-
         try:
-            while True:
-                # Frame al
-                start_acq = time.time()
-                frame = self.camera.get_frame()
-                if frame is None:
-                    continue
-                end_acq = time.time()
-                metrics.add_acquisition_time((end_acq - start_acq) * 1000)
-
-                # Frame sayısı
-                frame_count += 1
-
-                # Inference
-                start_inf = time.time()
-                results = self.detector.infer(frame) 
-                end_inf = time.time()
-                metrics.add_inference_time((end_inf - start_inf) * 1000)
-
-                # Tespit bilgisini konsola yazdır
-                if results:
-                    if self.verbose or frame_count % 30 == 0:  # Her 30 frame'de bir veya verbose mode
-                        print(f"🌱 Frame {frame_count}: {len(results)} pancar tespit edildi")
-
-                # Görselleştirme
-                elapsed_times = metrics.compute()
-                annotated = visualizer.draw(frame, results, elapsed_times)
-                
-                if annotated is not None:
-                    cv2.imshow("Pancar Algılama (TensorRT)", annotated)
-
-                # Klavye kontrolleri
-                key = cv2.waitKey(1) & 0xFF
-                
-                if key == ord('q'):
-                    print("\n⏹️  Kullanıcı tarafından durduruldu")
-                    break
-                elif key == ord('s'):
-                    # Ekran görüntüsü kaydet
-                    screenshot_count += 1
-                    filename = f"screenshot_{screenshot_count:04d}.jpg"
-                    cv2.imwrite(filename, annotated)
-                    print(f"📸 Ekran görüntüsü kaydedildi: {filename}")
+            if self.scheduler is not None:
+                self._run_multicam(metrics, visualizer)
+            elif self.pipelined:
+                self._run_pipelined(metrics, visualizer)
+            elif self.async_inference and self.tiled is None:
+                self._run_async(metrics, visualizer)
+            else:
+                self._run_sequential(metrics, visualizer)
+            
+            print("\n" + metrics.format_summary())
                     
+        except EndOfStream:
+            print("\n⏹️  Kaynak sona erdi")
+            print("\n" + metrics.format_summary())
         except KeyboardInterrupt:
             print("\n⏹️  Keyboard interrupt (Ctrl+C)")
         except Exception as e:
@@ -148,6 +407,455 @@ class LiveDetectionApp:
         finally:
             self.cleanup()
 
+    def _run_sequential(self, metrics, visualizer):
+        """Tek thread: yakalama -> inference -> çizim -> gösterim sırayla"""
+        frame_count = 0
+        last_results = None
+
+        while True:
+            # Frame al
+            start_acq = time.perf_counter()
+            packet = self.camera.read_latest()
+            frame = packet.frame
+            if frame is None:
+                continue
+            end_acq = time.perf_counter()
+            metrics.add_acquisition_time((end_acq - start_acq) * 1000)
+
+            # Frame sayısı
+            frame_count += 1
+
+            # Sahne değişmediyse son sonuçları tekrar kullan
+            run_inference = True
+            if self.motion_gate is not None:
+                with metrics.timer("motion"):
+                    run_inference = self.motion_gate.check(frame)
+
+            # Inference (preprocess / infer / postprocess ayrı ölçülür)
+            if not run_inference:
+                results = last_results
+                metrics.count("inference_skipped")
+            else:
+                if self.tracked is not None:
+                    results = self.tracked.infer(frame, packet.frame_id)
+                    stage_times = self.tracked.stage_times
+                else:
+                    inference = self.tiled or self.cascade or self.governor or self.detector
+                    results = inference.infer(frame)
+                    stage_times = inference.stage_times
+                for stage, ms in stage_times.items():
+                    metrics.add_time(stage, ms)
+                last_results = results
+                if self.tracked is not None and not self.tracked.last_detected:
+                    metrics.count("inference_tracked")
+                else:
+                    metrics.count("inference_executed")
+                if self.detection_log is not None:
+                    self.detection_log.append(results, packet.frame_id)
+
+            # Tespit bilgisini konsola yazdır
+            if results:
+                if self.verbose or frame_count % 30 == 0:  # Her 30 frame'de bir veya verbose mode
+                    unique = f" (benzersiz: {self.tracked.unique_count})" if self.tracked is not None else ""
+                    print(f"🌱 Frame {frame_count}: {len(results)} pancar tespit edildi{unique}")
+
+            # Kayıt (örnekleme burada, disk yazımı arka planda)
+            if self.recording:
+                with metrics.timer("record"):
+                    self.recorder.add(frame, len(results) if results else 0)
+
+            # Görselleştirme (gösterim hızı sınırlıysa bazı frame'ler çizilmez)
+            elapsed_times = metrics.compute()
+            annotated = None
+            if self._display_wanted(visualizer):
+                with metrics.timer("draw"):
+                    annotated = visualizer.draw(frame, results, elapsed_times)
+                
+                with metrics.timer("display"):
+                    if annotated is not None:
+                        self._show(annotated)
+            metrics.add_latency((time.perf_counter() - start_acq) * 1000)
+
+            # Klavye kontrolleri (bu frame çizilmediyse ekran görüntüsü için şimdi çizilir)
+            def render():
+                if annotated is not None:
+                    return annotated
+                return self._render_snapshot(frame, results, elapsed_times)
+            if self._handle_key(self._poll_key(), visualizer.last, render):
+                break
+
+    def _run_async(self, metrics, visualizer):
+        """
+        Asenkron tek thread: frame N inference'tayken (GPU / CPU worker) frame
+        N-1'in sonucu toplanır, çizilir ve gösterilir, ardından frame N+1
+        yakalanır. Gösterim bir frame geride kalır, CPU ve GPU boş beklemez.
+        """
+        detector = self.detector
+        tracked = self.tracked
+        frame_count = 0
+        last_results = None
+        pending = None  # Sonucu henüz alınmamış frame
+
+        print(f"⚡ Asenkron inference: {detector.backend.num_slots} buffer seti")
+
+        while True:
+            # Frame al ve inference'ı başlat
+            start_acq = time.perf_counter()
+            packet = self.camera.read_latest()
+            if packet.frame is None:
+                continue
+            metrics.add_acquisition_time((time.perf_counter() - start_acq) * 1000)
+
+            run_inference = True
+            if self.motion_gate is not None:
+                with metrics.timer("motion"):
+                    run_inference = self.motion_gate.check(packet.frame)
+
+            handle = None
+            if run_inference and (tracked is None or tracked.should_detect()):
+                handle = detector.submit(packet.frame, packet.frame_id)
+
+            previous, pending = pending, (packet, start_acq, run_inference, handle)
+            if previous is None:
+                continue
+
+            # Bir önceki frame'in sonucu (bu arada yeni frame çalışıyor)
+            packet, start_acq, run_inference, handle = previous
+            frame = packet.frame
+            frame_count += 1
+
+            if not run_inference:
+                results = last_results
+                metrics.count("inference_skipped")
+            elif handle is None:
+                with metrics.timer("track"):
+                    results = tracked.tracker.predict(packet.frame_id)
+                metrics.count("inference_tracked")
+            else:
+                results = detector.result(handle)
+                for stage, ms in detector.stage_times.items():
+                    metrics.add_time(stage, ms)
+                if tracked is not None:
+                    with metrics.timer("track"):
+                        results = tracked.tracker.update(results, packet.frame_id)
+                metrics.count("inference_executed")
+            if run_inference and self.detection_log is not None:
+                self.detection_log.append(results, packet.frame_id)
+            last_results = results
+
+            if results and (self.verbose or frame_count % 30 == 0):
+                unique = f" (benzersiz: {self.tracked.unique_count})" if self.tracked is not None else ""
+                print(f"🌱 Frame {frame_count}: {len(results)} pancar tespit edildi{unique}")
+
+            # Kayıt (örnekleme burada, disk yazımı arka planda)
+            if self.recording:
+                with metrics.timer("record"):
+                    self.recorder.add(frame, len(results) if results else 0)
+
+            # Görselleştirme (gösterim hızı sınırlıysa bazı frame'ler çizilmez)
+            elapsed_times = metrics.compute()
+            annotated = None
+            if self._display_wanted(visualizer):
+                with metrics.timer("draw"):
+                    annotated = visualizer.draw(frame, results, elapsed_times)
+
+                with metrics.timer("display"):
+                    if annotated is not None:
+                        self._show(annotated)
+            metrics.add_latency((time.perf_counter() - start_acq) * 1000)
+
+            # Klavye kontrolleri (bu frame çizilmediyse ekran görüntüsü için şimdi çizilir)
+            def render():
+                if annotated is not None:
+                    return annotated
+                return self._render_snapshot(frame, results, elapsed_times)
+            if self._handle_key(self._poll_key(), visualizer.last, render):
+                break
+
+    def _run_pipelined(self, metrics, visualizer):
+        """
+        Çok aşamalı pipeline: yakalama, preprocess, inference, post-process ve
+        çizim ayrı thread'lerde; gösterim (imshow/waitKey) ana thread'de
+        """
+        detector = self.detector
+        tracked = self.tracked
+        tiled = self.tiled
+        motion_gate = self.motion_gate
+        camera = self.camera
+        last_results = [None]  # Postprocess aşamasında (FIFO) son sonuçlar
+        last_seq = [-1]        # last_results'ın geldiği frame
+        reference_seq = [-1]   # Hareket kapısının referans frame'i
+        
+        # Preprocess buffer havuzu: kuyruktaki + aşamalarda işlenen buffer'lar
+        backend = detector.backend
+        pool = BufferPool(lambda: np.empty((1,) + backend.input_shape[1:], dtype=backend.input_dtype),
+                          PIPELINE_QUEUE_SIZE + 3)
+
+        def capture():
+            packet = camera.read_latest()
+            return FramePacket(0, packet.frame_id, packet.timestamp, packet.frame)
+
+        def preprocess(packet):
+            # Sahne değişmediyse önceki sonuçlar kullanılır
+            if motion_gate is not None:
+                start = time.perf_counter()
+                packet.reused = not motion_gate.check(packet.frame)
+                packet.timings["motion"] = (time.perf_counter() - start) * 1000
+                if packet.reused:
+                    return packet
+                reference_seq[0] = packet.seq
+            
+            # Takip modunda inference atlanan frame'ler aşamalardan boş geçer
+            if tracked is not None and not tracked.should_detect():
+                return packet
+            if tiled is not None:
+                # Tile'lar inference aşamasında tek batch'te hazırlanır
+                h, w = packet.frame.shape[:2]
+                packet.params = {"tiles": tiled.tiles(w, h)}
+                return packet
+            buffer = pool.acquire()
+            packet.release = lambda: pool.release(buffer)
+            packet.params = detector.preprocessor(packet.frame, buffer)
+            packet.input = buffer
+            return packet
+
+        def infer(packet):
+            if tiled is not None and packet.params is not None:
+                packet.results = tiled.infer(packet.frame)
+                packet.timings["tile_max"] = tiled.stage_times["tile_max"]
+                return packet
+            if packet.input is None:
+                return packet
+            packet.output = detector.execute(packet.input)
+            release_buffer(packet)
+            packet.input = None
+            return packet
+
+        def postprocess(packet):
+            if packet.reused:
+                # Referans frame kuyrukta atıldıysa sonuçları hiç gelmedi: yenilemeyi zorla
+                if last_seq[0] < reference_seq[0]:
+                    motion_gate.reset()
+                packet.results = last_results[0]
+                metrics.count("inference_skipped")
+                return packet
+            
+            if packet.output is None and packet.results is None:
+                start = time.perf_counter()
+                packet.results = tracked.tracker.predict(packet.frame_id)
+                packet.timings["track"] = (time.perf_counter() - start) * 1000
+                metrics.count("inference_tracked")
+                if self.detection_log is not None:
+                    self.detection_log.append(packet.results, packet.frame_id)
+                return packet
+            metrics.count("inference_executed")
+            
+            if packet.results is None:
+                detector.frame_count += 1
+                params = packet.params
+                packet.results = detector.post_process_yolov8(
+                    packet.output, params['original_h'], params['original_w'], params
+                )
+                detector.record_results(packet.results)
+            if tracked is not None:
+                start = time.perf_counter()
+                packet.results = tracked.tracker.update(packet.results, packet.frame_id)
+                packet.timings["track"] = (time.perf_counter() - start) * 1000
+            if self.detection_log is not None:
+                self.detection_log.append(packet.results, packet.frame_id)
+            last_results[0] = packet.results
+            last_seq[0] = packet.seq
+            return packet
+
+        def draw(packet):
+            # Inference atlanan frame'lerin boş aşama süreleri ortalamaları bozmasın
+            if packet.params is None:
+                stages = ("capture", "motion", "track")
+            else:
+                stages = ("capture", "motion", "preprocess", "infer", "postprocess", "track", "tile_max")
+            for stage in stages:
+                if stage in packet.timings:
+                    metrics.add_time(stage, packet.timings[stage])
+            if self.recording:
+                self.recorder.add(packet.frame, len(packet.results) if packet.results else 0)
+            elapsed_times = metrics.compute()
+            if self._display_wanted(visualizer):
+                packet.annotated = visualizer.draw(packet.frame, packet.results, elapsed_times)
+            else:
+                packet.annotated = None
+            return packet
+
+        pipeline = Pipeline(
+            capture,
+            [("preprocess", preprocess), ("infer", infer), ("postprocess", postprocess), ("draw", draw)],
+            queue_size=PIPELINE_QUEUE_SIZE,
+            policy=PIPELINE_POLICY,
+            verbose=self.verbose
+        )
+        
+        print(f"🧵 Pipeline modu: kuyruk={PIPELINE_QUEUE_SIZE}, politika={PIPELINE_POLICY}")
+        pipeline.start()
+        last_packet = None
+        
+        try:
+            while True:
+                try:
+                    packet = pipeline.get(timeout=0.1)
+                except StopIteration:
+                    print("\n⏹️  Kaynak sona erdi")
+                    break
+                
+                if packet is not None:
+                    last_packet = packet
+                    annotated = packet.annotated
+                    if annotated is not None:
+                        metrics.add_time("draw", packet.timings["draw"])
+                        with metrics.timer("display"):
+                            self._show(annotated)
+                    # Uçtan uca: kamera yakalama zamanı (monotonic) -> gösterim
+                    metrics.add_latency((time.monotonic() - packet.timestamp) * 1000)
+                
+                # Klavye kontrolleri (son frame çizilmediyse ekran görüntüsü için şimdi çizilir)
+                def render():
+                    if last_packet is None:
+                        return None
+                    if last_packet.annotated is not None:
+                        return last_packet.annotated
+                    return self._render_snapshot(last_packet.frame, last_packet.results, metrics.summary())
+                if self._handle_key(self._poll_key(), visualizer.last, render):
+                    break
+        finally:
+            pipeline.stop()
+            if self.verbose:
+                print(f"📊 Pipeline: {pipeline.get_stats()}")
+
+    def _run_multicam(self, metrics, visualizer):
+        """
+        Çoklu kamera: her kaynağın kendi yakalama thread'i, tek paylaşılan detector
+
+        BatchScheduler hazır frame'leri tek infer_batch çağrısında toplar,
+        sonuçlar kameranın kendi tracker'ından geçer. Gösterim zamanı gelince
+        sadece yeni frame'i olan kameralar çizilir ve ızgara halinde gösterilir.
+        Global metriklerde FPS toplam (tüm kameralar), HUD'da kamera bazlı.
+        """
+        scheduler = self.scheduler.start()
+        feeds = scheduler.feeds
+        # İlk kamera ana visualizer'ı kullanır (gösterim hızı sınırı onda)
+        visualizers = [visualizer] + [
+            Visualizer(CLASS_NAMES, mode=visualizer.mode, scale=self.display_scale) for _ in feeds[1:]
+        ]
+        annotated = [None] * len(feeds)
+        drawn_ids = [None] * len(feeds)
+        mosaic = None
+
+        try:
+            while True:
+                with metrics.timer("batch_wait"):
+                    batch = scheduler.next_batch()
+
+                if batch:
+                    routed = scheduler.process(batch)
+                    for stage, ms in scheduler.stage_times.items():
+                        metrics.add_time(stage, ms)
+                    metrics.count("inference_executed", len(batch))
+                    for feed, _ in routed:
+                        metrics.add_latency(feed.latencies.last())
+                        metrics.compute()
+
+                    if self.verbose or scheduler.batches % 30 == 0:
+                        counts = ", ".join(f"{feed.name}: {len(results) if results else 0}" for feed, results in routed)
+                        print(f"🌱 Batch {scheduler.batches}: {counts}")
+
+                # Görselleştirme (sadece yeni frame'i olan kameralar yeniden çizilir)
+                if self._display_wanted(visualizer):
+                    with metrics.timer("draw"):
+                        for i, feed in enumerate(feeds):
+                            if feed.frame is not None and feed.frame_id != drawn_ids[i]:
+                                annotated[i] = visualizers[i].draw(feed.frame, feed.results, feed.hud_metrics())
+                                drawn_ids[i] = feed.frame_id
+                        mosaic = make_mosaic(annotated)
+
+                    with metrics.timer("display"):
+                        if mosaic is not None:
+                            self._show(mosaic)
+
+                # Klavye kontrolleri
+                if self._handle_key(self._poll_key(), mosaic, lambda: self._render_mosaic(feeds, annotated, drawn_ids)):
+                    break
+        finally:
+            scheduler.stop()
+
+    def _render_mosaic(self, feeds, annotated, drawn_ids):
+        """Ekran görüntüsü için güncel ızgara (çizilmemiş yeni frame'ler şimdi çizilir)"""
+        images = []
+        for i, feed in enumerate(feeds):
+            if feed.frame is not None and feed.frame_id == drawn_ids[i]:
+                images.append(annotated[i])
+            else:
+                images.append(self._render_snapshot(feed.frame, feed.results, feed.hud_metrics()))
+        return make_mosaic(images)
+
+    def _display_wanted(self, visualizer):
+        """Bu frame çizilmeli mi? (gösterim hızı sınırı; headless'ta izleyici yoksa hiç)"""
+        if self.preview is not None and not self.preview.wants_frame():
+            return False
+        return visualizer.due()
+
+    def _show(self, annotated):
+        """Pencerede göster veya (headless) önizleme sunucusuna yayınla"""
+        if self.preview is not None:
+            self.preview.publish(annotated)
+        else:
+            cv2.imshow(WINDOW_NAME, annotated)
+
+    def _poll_key(self):
+        """Klavye tuşu veya (headless) /control komutu"""
+        if self.preview is not None:
+            return self.preview.poll_key()
+        return cv2.waitKey(1) & 0xFF
+
+    def _render_snapshot(self, frame, results, metrics):
+        """Ekran görüntüsü için frame'i ayrı bir visualizer'la kopyasına çiz (gösterim çizimine dokunmaz)"""
+        if frame is None:
+            return None
+        if self._snapshot_visualizer is None:
+            self._snapshot_visualizer = Visualizer(CLASS_NAMES, mode=RENDER_COPY, scale=self.display_scale)
+        return self._snapshot_visualizer.draw(frame, results, metrics)
+
+    def _handle_key(self, key, annotated, render=None):
+        """
+        Klavye kontrolleri
+        
+        Args:
+            key: Tuş kodu (veya /control komutu)
+            annotated: Ekranda görünen son çizim
+            render: Güncel frame'in çizimini döndüren fonksiyon - headless'ta
+                    izleyici yokken çizim yapılmadığından ekran görüntüsü bununla alınır
+        
+        Returns:
+            True: Çıkış istendi
+        """
+        if key == ord('q'):
+            print("\n⏹️  Kullanıcı tarafından durduruldu")
+            return True
+        elif key == ord('s'):
+            # Headless'ta son çizim saatler önceki olabilir: her zaman güncel frame
+            if render is not None and (self.preview is not None or annotated is None):
+                annotated = render()
+            if annotated is None:
+                print("⚠️  Henüz frame yok, ekran görüntüsü alınamadı")
+                return False
+            # Ekran görüntüsü kaydet (arka planda - döngü disk yazımını beklemez)
+            self.screenshot_count += 1
+            filename = f"screenshot_{self.screenshot_count:04d}.jpg"
+            if self.recorder.snapshot(annotated, filename):
+                print(f"📸 Ekran görüntüsü kaydediliyor: {filename}")
+            else:
+                print("⚠️  Kayıt kuyruğu dolu, ekran görüntüsü atlandı")
+        elif key == ord('r') and self.recording:
+            print(f"🔴 Olay kaydı: {self.recorder.trigger()}")
+        return False
+
     def cleanup(self):
         """Güvenli cleanup"""
         if self._cleaned_up:
@@ -156,21 +864,64 @@ class LiveDetectionApp:
         print("\n🧹 Kaynaklar temizleniyor...")
         self._cleaned_up = True
         
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            stats = self.scheduler.get_stats()
+            print(f"  🎥 Çoklu kamera: {stats['batches']} batch, ortalama {stats['mean_batch']} frame "
+                  f"({stats['batch_sizes']})")
+            for name, camera_stats in stats["cameras"].items():
+                print(f"    {name}: {camera_stats}")
+        for source in self.sources:
+            try:
+                source.release()
+            except Exception as e:
+                print(f"  ⚠️  Kamera cleanup error: {e}")
+        
         try:
             if self.camera is not None:
+                stats = self.camera.get_capture_stats()
+                if stats:
+                    print(f"  📷 Yakalama: {stats}")
                 self.camera.release()
                 print("  ✅ Kamera temizlendi")
         except Exception as e:
             print(f"  ⚠️  Kamera cleanup error: {e}")
         
-        try:
-            cv2.destroyAllWindows()
-            print("  ✅ OpenCV temizlendi")
-        except Exception as e:
-            print(f"  ⚠️  OpenCV cleanup error: {e}")
+        if self.tracked is not None:
+            print(f"  🆔 Takip: {self.tracked.get_stats()}")
+        if self.motion_gate is not None:
+            print(f"  💤 Hareket kapısı: {self.motion_gate.get_stats()}")
+        if self.governor is not None:
+            print(f"  🎚️  Model seçici: {self.governor.get_stats()}")
+        if self.cascade is not None:
+            print(f"  🪜 Kademeli tespit: {self.cascade.get_stats()}")
+        
+        if self.detection_log is not None:
+            self.detection_log.close()
+            print(f"  🗂️  Tespit logu: {self.detection_log.get_stats()}")
+        if self.recorder is not None:
+            self.recorder.stop()
+            if self.recording or self.screenshot_count:
+                print(f"  🎥 Kayıt: {self.recorder.get_stats()}")
+        if self.preview is not None:
+            print(f"  🌐 Önizleme: {self.preview.get_stats()}")
+            self.preview.stop()
+            print("  ✅ Önizleme sunucusu durduruldu")
+        elif not self.headless:
+            try:
+                cv2.destroyAllWindows()
+                print("  ✅ OpenCV temizlendi")
+            except Exception as e:
+                print(f"  ⚠️  OpenCV cleanup error: {e}")
         
         try:
-            if self.detector is not None:
+            if self.cascade is not None:
+                self.cascade.cleanup()
+                print("  ✅ Kademeli modeller temizlendi")
+            elif self.governor is not None:
+                self.governor.cleanup()
+                print("  ✅ Model varyantları temizlendi")
+            elif self.detector is not None:
                 self.detector.cleanup()
                 print("  ✅ Detector temizlendi")
         except Exception as e:
@@ -192,12 +943,41 @@ Kullanım:
 Seçenekler:
   --verbose          Detaylı log göster
   --camera-id N      Kamera ID (varsayılan: 0)
+  --backend NAME     Inference backend: tensorrt, onnxruntime, opencv, auto
+                     (varsayılan: tensorrt)
+  --pipelined        Aşamaları paralel çalıştır (throughput en yavaş aşamaya yaklaşır)
+  --async            Inference'ı yakalama/çizimle örtüştür (tek thread, bir frame gecikme)
+  --video PATH       Kamera yerine video dosyası oynat (maksimum hız)
+  --realtime         Videoyu kaynak FPS'inde oynat (kamera gibi)
+  --images DIR       Kamera yerine görüntü klasörü kullan
+  --synthetic        Deterministik sentetik kaynak (kamera gerektirmez)
+  --track            Takibi aç (kalıcı pancar ID'leri, benzersiz sayım)
+  --detect-every N   Tam inference her N frame'de bir, arada tracker (varsayılan: 1)
+  --detect-fps F     Tam inference hedef hızı (--detect-every yerine)
+  --motion-gate      Sahne değişmediyse inference atla (araç dururken; yavaş ilerlemede eski kutular)
+  --tiled            Yüksek çözünürlükte örtüşen tile'larla inference (küçük pancarlar)
+  --latency-target MS  Model varyantları (MODEL_VARIANTS) için p95 inference hedefi
+  --cascade          Hızlı model her frame'de, ana model sadece belirsiz frame'lerde
+  --display-scale S  Çizim/gösterim ölçeği (ör. 0.5)
+  --display-fps F    Gösterim hızı sınırı (inference hızından bağımsız)
+  --headless         Pencere açma, http://<cihaz>:PORT/ üzerinden MJPEG önizleme
+  --port N           Önizleme sunucusu portu (varsayılan: 8080)
+  --preview-host H   Önizleme adresi (varsayılan: 127.0.0.1, ağdan izlemek için 0.0.0.0)
+  --record           Son birkaç saniyeyi bellekte tut, olayda ('r' / eşik) klip kaydet
+  --record-continuous  Sürekli segment kaydı (RECORD_DIR)
+  --log-detections   Tespitleri ikili loga yaz (python detection_log.py detections ile özetle)
+  --cameras LIST     Çoklu kamera, tek paylaşılan model (ör. 0,1 veya csi:0,csi:1)
   --help             Bu yardım mesajını göster
 
 Örnekler:
   python main.py                    # USB kamera (ID=0)
   python main.py --verbose          # Detaylı log
   python main.py --camera-id 1      # USB kamera (ID=1)
+  python main.py --backend onnxruntime  # GPU'suz (CPU) çalıştırma
+  python main.py --video tarla.mp4 --pipelined  # Kaydı tam hızda işle
+  python main.py --track --detect-every 3  # Inference maliyetinin ~1/3'ü
+  python main.py --headless --preview-host 0.0.0.0  # Ekransız saha ünitesi, ağdan tarayıcıyla izle
+  python main.py --cameras csi:0,csi:1,0  # Bom üzerindeki üç kamera, tek engine
 
 Klavye Kısayolları:
   q - Çıkış
@@ -210,6 +990,7 @@ if __name__ == "__main__":
     
     # Komut satırı argümanları
     verbose = "--verbose" in sys.argv
+    pipelined = "--pipelined" in sys.argv
     show_help = "--help" in sys.argv or "-h" in sys.argv
     
     # Kamera ID
@@ -222,15 +1003,103 @@ if __name__ == "__main__":
             print("❌ Geçersiz camera-id değeri!")
             sys.exit(1)
     
+    # Inference backend
+    backend = BACKEND
+    if "--backend" in sys.argv:
+        try:
+            idx = sys.argv.index("--backend")
+            backend = sys.argv[idx + 1]
+        except IndexError:
+            print("❌ Geçersiz backend değeri!")
+            sys.exit(1)
+    
     # Yardım göster
     if show_help:
         print_help()
         sys.exit(0)
     
+    # Frame kaynağı (varsayılan: USB kamera)
+    def _arg_value(name):
+        try:
+            return sys.argv[sys.argv.index(name) + 1]
+        except IndexError:
+            print(f"❌ {name} için değer eksik!")
+            sys.exit(1)
+    
+    source = None
+    if "--video" in sys.argv:
+        source = VideoFileSource(_arg_value("--video"), realtime="--realtime" in sys.argv, verbose=verbose)
+    elif "--images" in sys.argv:
+        source = ImageFolderSource(_arg_value("--images"), verbose=verbose)
+    elif "--synthetic" in sys.argv:
+        source = SyntheticSource(verbose=verbose)
+    
+    # Çoklu kamera: "0,1" USB, "csi:0" CSI (yakalama thread'i CameraFeed'de)
+    sources = []
+    if "--cameras" in sys.argv:
+        try:
+            for spec in _arg_value("--cameras").split(","):
+                spec = spec.strip()
+                if spec.startswith("csi:"):
+                    sources.append(CSICamera(sensor_id=int(spec[4:]), verbose=verbose))
+                else:
+                    sources.append(Camera(cam_id=int(spec), verbose=verbose))
+        except ValueError:
+            print("❌ Geçersiz --cameras değeri! (ör. 0,1 veya csi:0,csi:1)")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Kamera başlatılamadı: {e}")
+            for camera in sources:
+                camera.release()
+            sys.exit(1)
+    
+    # Takip / inference sıklığı
+    try:
+        detect_every = int(_arg_value("--detect-every")) if "--detect-every" in sys.argv else DETECT_EVERY
+        detect_fps = float(_arg_value("--detect-fps")) if "--detect-fps" in sys.argv else DETECT_FPS
+    except ValueError:
+        print("❌ Geçersiz inference sıklığı değeri!")
+        sys.exit(1)
+    
+    try:
+        latency_target = float(_arg_value("--latency-target")) if "--latency-target" in sys.argv else LATENCY_TARGET_MS
+    except ValueError:
+        print("❌ Geçersiz gecikme hedefi!")
+        sys.exit(1)
+    
+    try:
+        display_scale = float(_arg_value("--display-scale")) if "--display-scale" in sys.argv else DISPLAY_SCALE
+        display_fps = float(_arg_value("--display-fps")) if "--display-fps" in sys.argv else DISPLAY_FPS
+        preview_port = int(_arg_value("--port")) if "--port" in sys.argv else PREVIEW_PORT
+        preview_host = _arg_value("--preview-host") if "--preview-host" in sys.argv else PREVIEW_HOST
+    except ValueError:
+        print("❌ Geçersiz gösterim değeri!")
+        sys.exit(1)
+    
     # Uygulamayı başlat
     app = LiveDetectionApp(
         camera_id=camera_id,
-        verbose=verbose
+        verbose=verbose,
+        backend=backend,
+        pipelined=pipelined,
+        source=source,
+        tracking=TRACKING or "--track" in sys.argv,
+        detect_every=detect_every,
+        detect_fps=detect_fps,
+        motion_gate=MOTION_GATE or "--motion-gate" in sys.argv,
+        tiled=TILED or "--tiled" in sys.argv,
+        async_inference=ASYNC_INFERENCE or "--async" in sys.argv,
+        latency_target_ms=latency_target,
+        cascade=CASCADE or "--cascade" in sys.argv,
+        display_scale=display_scale,
+        display_fps=display_fps,
+        headless=HEADLESS or "--headless" in sys.argv,
+        preview_port=preview_port,
+        preview_host=preview_host,
+        recording=RECORDING or "--record" in sys.argv,
+        record_continuous=RECORD_CONTINUOUS or "--record-continuous" in sys.argv,
+        detection_log=DETECTION_LOG or "--log-detections" in sys.argv,
+        sources=sources
     )
     
     try:
@@ -1,34 +1,196 @@
 import time
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+STAGES = ("capture", "preprocess", "infer", "postprocess", "draw", "display", "latency")
+
+
+class RollingWindow:
+    def __init__(self, size=100):
+        """
+        Sabit boyutlu ring dizi + running sum: ekleme ve ortalama O(1)
+
+        Args:
+            size: Pencere boyutu (örnek sayısı)
+        """
+        self.values = np.zeros(size, dtype=np.float64)
+        self.size = size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        if self.count == self.size:
+            self.total -= self.values[self.index]
+        else:
+            self.count += 1
+        self.values[self.index] = value
+        self.total += value
+        self.index += 1
+
+        # Her turda toplamı yeniden hesapla (float birikim hatasını sıfırlar)
+        if self.index == self.size:
+            self.index = 0
+            self.total = float(self.values.sum())
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def last(self):
+        return float(self.values[self.index - 1]) if self.count else 0.0
+
+    def percentiles(self, qs=(50, 95, 99)):
+        """Pencere üzerindeki yüzdelikler + maksimum"""
+        if not self.count:
+            return {f"p{q}": 0.0 for q in qs}, 0.0
+        window = self.values[:self.count]
+        values = np.percentile(window, qs)
+        return {f"p{q}": float(v) for q, v in zip(qs, values)}, float(window.max())
+
 
 class Metrics:
-    def __init__(self):
-        self.start_time = time.time()
+    def __init__(self, window=100, percentile_every=10, clock=time.perf_counter):
+        """
+        Pencereli FPS ve aşama bazlı gecikme istatistikleri
+
+        Args:
+            window: Pencere boyutu (frame)
+            percentile_every: Yüzdeliklerin kaç frame'de bir yeniden hesaplanacağı
+            clock: Monotonik, yüksek çözünürlüklü saat
+        """
+        self.clock = clock
+        self.window = window
+        self.percentile_every = percentile_every
+        self.start_time = clock()
         self.frame_count = 0
-        self.image_acquisition_times = []
-        self.inference_times = []
+
+        self.stages = {name: RollingWindow(window) for name in STAGES}
+        self._frame_times = RollingWindow(window)
+        self._percentiles = {}
+        self.counters = {}  # Olay sayaçları (ör. çalışan/atlanan inference)
+        self._lock = threading.Lock()
+
+    def add_time(self, stage, t):
+        """
+        Aşama süresi ekle (ms)
+
+        Args:
+            stage: capture, preprocess, infer, postprocess, draw, display, latency
+                   (bilinmeyen adlar için yeni pencere açılır)
+        """
+        with self._lock:
+            window = self.stages.get(stage)
+            if window is None:
+                window = self.stages[stage] = RollingWindow(self.window)
+            window.add(t)
 
     def add_acquisition_time(self, t):
-        self.image_acquisition_times.append(t)
-        if len(self.image_acquisition_times) > 100:
-            self.image_acquisition_times.pop(0)
+        self.add_time("capture", t)
 
     def add_inference_time(self, t):
-        self.inference_times.append(t)
-        if len(self.inference_times) > 100:
-            self.inference_times.pop(0)
+        self.add_time("infer", t)
+
+    def add_latency(self, t):
+        """Uçtan uca frame gecikmesi (yakalama -> gösterim, ms)"""
+        self.add_time("latency", t)
+
+    def count(self, name, n=1):
+        """Olay sayacını artır (ör. "inference_executed", "inference_skipped")"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, stage):
+        """with metrics.timer("draw"): ... bloğunun süresini kaydet"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add_time(stage, (self.clock() - start) * 1000)
 
     def compute(self):
-        self.frame_count += 1
-        elapsed = time.time() - self.start_time
-        fps = self.frame_count / elapsed if elapsed > 0 else 0
+        """
+        Frame'i say ve özet istatistikleri döndür
+
+        Returns:
+            fps: Son pencere üzerindeki FPS
+            fps_total: start_time'dan beri ortalama FPS
+            img_acq, inf: Ortalama yakalama/inference süresi (ms)
+            latency: Ortalama uçtan uca gecikme (ölçülmediyse aşama ortalamaları toplamı)
+            stages: Her aşama için mean/p50/p95/p99/max (ms)
+            counters: Olay sayaçları
+        """
+        now = self.clock()
+        with self._lock:
+            self.frame_count += 1
+            self._frame_times.add(now)
+
+            if self.frame_count % self.percentile_every == 1 or self.percentile_every <= 1:
+                self._update_percentiles()
+
+            return self._snapshot(now)
 
-        avg_img_acq = sum(self.image_acquisition_times)/len(self.image_acquisition_times) if self.image_acquisition_times else 0
-        avg_inf = sum(self.inference_times)/len(self.inference_times) if self.inference_times else 0
-        latency = avg_img_acq + avg_inf
+    def _snapshot(self, now):
+        """Özet sözlüğü (kilit tutulurken çağrılır)"""
+        # Pencereli FPS: penceredeki ilk ve son frame arası süre
+        fps = 0.0
+        if self._frame_times.count > 1:
+            window = self._frame_times.values[:self._frame_times.count]
+            span = window.max() - window.min()
+            fps = float((self._frame_times.count - 1) / span) if span > 0 else 0.0
+
+        elapsed = now - self.start_time
+        fps_total = self.frame_count / elapsed if elapsed > 0 else 0
+
+        stages = {}
+        for name, window in self.stages.items():
+            if not window.count:
+                continue
+            stats = {"mean": window.mean()}
+            stats.update(self._percentiles.get(name, {}))
+            stages[name] = stats
+
+        latency_window = self.stages["latency"]
+        if latency_window.count:
+            latency = latency_window.mean()
+        else:
+            latency = sum(w.mean() for n, w in self.stages.items() if n not in ("latency", "display"))
 
         return {
             "fps": fps,
-            "img_acq": avg_img_acq,
-            "inf": avg_inf,
-            "latency": latency
+            "fps_total": fps_total,
+            "img_acq": self.stages["capture"].mean(),
+            "inf": self.stages["infer"].mean(),
+            "latency": latency,
+            "stages": stages,
+            "counters": dict(self.counters)
         }
+
+    def _update_percentiles(self):
+        """Yüzdelikleri yeniden hesapla (kilit tutulurken çağrılır)"""
+        for name, window in self.stages.items():
+            if window.count:
+                percentiles, maximum = window.percentiles()
+                percentiles["max"] = maximum
+                self._percentiles[name] = percentiles
+
+    def summary(self):
+        """Güncel yüzdeliklerle tam özet - frame saymaz (oturum sonu raporu için)"""
+        with self._lock:
+            self._update_percentiles()
+            return self._snapshot(self.clock())
+
+    def format_summary(self):
+        """Aşama istatistiklerini tablo olarak döndür"""
+        summary = self.summary()
+        lines = [f"📊 FPS (pencere): {summary['fps']:.2f}, FPS (toplam): {summary['fps_total']:.2f}"]
+        lines.append(f"  {'aşama':<12} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+        for name, stats in summary["stages"].items():
+            lines.append(
+                f"  {name:<12} {stats['mean']:>8.2f} {stats['p50']:>8.2f} {stats['p95']:>8.2f} "
+                f"{stats['p99']:>8.2f} {stats['max']:>8.2f}"
+            )
+        if summary["counters"]:
+            lines.append("  " + ", ".join(f"{name}: {value}" for name, value in summary["counters"].items()))
+        return "\n".join(lines)
@@ -0,0 +1,111 @@
+import threading
+import numpy as np
+import cv2
+
+DIFF = "diff"
+DHASH = "dhash"
+
+
+class MotionGate:
+    def __init__(self, method=DIFF, size=(80, 45), pixel_threshold=12, change_ratio=0.01,
+                 hash_threshold=4, refresh_interval=30, verbose=False):
+        """
+        Ucuz sahne değişikliği dedektörü - inference'ın önünde durur
+
+        Araç dönüşte/parsel başında dururken neredeyse aynı frame'ler için
+        inference çalıştırmamak amacıyla küçültülmüş gri görüntüler karşılaştırılır.
+        Karşılaştırma bir önceki frame ile değil son inference yapılan frame ile
+        yapılır; böylece yavaş kaymalar da birikip yakalanır.
+
+        Varsayılan eşikler yavaş ileri hareketi değişim saymaz: sentetik sahnede
+        1-4 px/frame kaymada frame'lerin %50-85'i atlanır ve o frame'lerde
+        birkaç frame önceki kutular kullanılır. Bu yüzden kapı
+        varsayılan olarak kapalıdır (sadece duran araç / parsel başı için).
+
+        Args:
+            method: "diff" (frame farkı) veya "dhash" (perceptual hash)
+            size: diff yönteminde küçültülmüş görüntü boyutu (w, h)
+            pixel_threshold: diff: piksel değişmiş sayılması için gri seviye farkı
+            change_ratio: diff: sahne değişmiş sayılması için değişen piksel oranı
+            hash_threshold: dhash: sahne değişmiş sayılması için farklı bit sayısı (/64)
+            refresh_interval: En fazla kaç frame üst üste atlanabilir (zorunlu yenileme)
+
+        check() ve reset() farklı thread'lerden çağrılabilir (pipeline modu).
+        """
+        if method not in (DIFF, DHASH):
+            raise ValueError(f"❌ Bilinmeyen hareket yöntemi: {method}")
+
+        self.method = method
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.change_ratio = change_ratio
+        self.hash_threshold = hash_threshold
+        self.refresh_interval = refresh_interval
+        self.verbose = verbose
+
+        self.reference = None
+        self.skipped_in_row = 0
+        self.executed = 0
+        self.skipped = 0
+        self.last_change = 0.0  # Son karşılaştırmanın değişim ölçüsü (oran veya bit)
+        self._lock = threading.Lock()
+
+    def signature(self, frame):
+        """Karşılaştırma için küçük imza (diff: gri görüntü, dhash: 64 bit)"""
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.method == DHASH:
+            small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+            return small[:, 1:] > small[:, :-1]
+        return cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+
+    def change(self, signature):
+        """Referansa göre değişim ölçüsü"""
+        if self.method == DHASH:
+            return int(np.count_nonzero(signature != self.reference))
+        diff = cv2.absdiff(signature, self.reference)
+        return float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+
+    def is_changed(self, change):
+        if self.method == DHASH:
+            return change > self.hash_threshold
+        return change > self.change_ratio
+
+    def check(self, frame):
+        """
+        Bu frame için inference çalışmalı mı?
+
+        Returns:
+            True: sahne değişti / ilk frame / zorunlu yenileme (referans güncellenir)
+            False: sahne aynı, son sonuçlar tekrar kullanılabilir
+        """
+        signature = self.signature(frame)
+
+        # reset() başka thread'den referansı karşılaştırma ortasında silmesin
+        with self._lock:
+            run = self.reference is None or self.skipped_in_row >= self.refresh_interval
+            if not run:
+                self.last_change = self.change(signature)
+                run = self.is_changed(self.last_change)
+
+            if run:
+                self.reference = signature
+                self.skipped_in_row = 0
+                self.executed += 1
+            else:
+                self.skipped_in_row += 1
+                self.skipped += 1
+        return run
+
+    def reset(self):
+        """Referansı unut - sonraki frame'de inference zorunlu"""
+        with self._lock:
+            self.reference = None
+            self.skipped_in_row = 0
+
+    def get_stats(self):
+        total = self.executed + self.skipped
+        return {
+            "executed": self.executed,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / total if total else 0.0
+        }
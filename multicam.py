@@ -0,0 +1,309 @@
+import math
+import threading
+import time
+import numpy as np
+import cv2
+from metrics import RollingWindow
+from sources import EndOfStream
+
+
+class CameraFeed:
+    def __init__(self, name, source, tracker=None, window=100, verbose=False):
+        """
+        Çoklu kamera modunda tek kaynak: yakalama thread'i + tek frame'lik posta kutusu
+
+        Yakalama thread'i kaynağın en güncel frame'ini posta kutusuna koyar;
+        zamanlayıcı almadan yeni frame gelirse eskisinin üzerine yazılır
+        (bekleyen frame her zaman en taze olandır). İşlenen son frame ve
+        sonuçları çizim için saklanır.
+
+        Args:
+            name: Kamera adı (log ve istatistikler)
+            source: FrameSource (Camera, CSICamera, video, sentetik...)
+            tracker: Bu kameraya ait Tracker (None: takip yok)
+        """
+        self.name = name
+        self.source = source
+        self.tracker = tracker
+        self.verbose = verbose
+
+        self.pending = None        # Zamanlayıcının alacağı CapturedFrame
+        self.frame = None          # Son işlenen frame
+        self.frame_id = None
+        self.results = None        # Son işlenen frame'in sonuçları
+        self.ended = False
+        self.served_at = None      # Son batch'e alınma zamanı (adillik)
+
+        self.captured = 0
+        self.processed = 0
+        self.overwritten = 0       # Zamanlayıcı almadan yenisi gelen frame
+        self.stale = 0             # Deadline geçtiği için işlenmeden atılan frame
+        self.late = 0              # Sonucu deadline'dan sonra çıkan frame
+        self.read_errors = 0
+        self.capture_times = RollingWindow(window)
+        self.infer_times = RollingWindow(window)
+        self.latencies = RollingWindow(window)
+        self._deliveries = RollingWindow(window)
+        self._cond = None
+        self._running = False
+        self._thread = None
+
+    def start(self, cond):
+        """Yakalama thread'ini başlat (cond: zamanlayıcının paylaşılan Condition'ı)"""
+        self._cond = cond
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name=f"feed-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        while self._running:
+            start = time.perf_counter()
+            try:
+                packet = self.source.read_latest(timeout=1.0)
+            except EndOfStream:
+                break
+            except RuntimeError as e:
+                # Kamera zaman aşımı: geçici olabilir, denemeye devam et
+                self.read_errors += 1
+                if self.verbose:
+                    print(f"⚠️  {self.name}: {e}")
+                continue
+            if packet is None or packet.frame is None:
+                continue
+            self.capture_times.add((time.perf_counter() - start) * 1000)
+
+            with self._cond:
+                self.captured += 1
+                if self.pending is not None:
+                    self.overwritten += 1
+                self.pending = packet
+                self._cond.notify_all()
+
+        with self._cond:
+            self.ended = True
+            self._cond.notify_all()
+
+    def deliver(self, packet, results, times, now, deadline_ms):
+        """İşlenen frame'in sonuçlarını kaydet (zamanlayıcı thread'inde)"""
+        if self.tracker is not None:
+            results = self.tracker.update(results, packet.frame_id)
+        self.frame = packet.frame
+        self.frame_id = packet.frame_id
+        self.results = results
+        self.processed += 1
+
+        latency_ms = (now - packet.timestamp) * 1000
+        self.latencies.add(latency_ms)
+        self.infer_times.add(sum(times.values()))
+        self._deliveries.add(now)
+        if latency_ms > deadline_ms:
+            self.late += 1
+        return results
+
+    def fps(self):
+        """Penceredeki işlenen frame hızı"""
+        count = self._deliveries.count
+        if count < 2:
+            return 0.0
+        window = self._deliveries.values[:count]
+        span = window.max() - window.min()
+        return float((count - 1) / span) if span > 0 else 0.0
+
+    def hud_metrics(self):
+        """Visualizer HUD'u için kamera bazlı metrikler (Metrics.compute() formatında)"""
+        percentiles, _ = self.latencies.percentiles((95,))
+        return {
+            "fps": self.fps(),
+            "img_acq": self.capture_times.mean(),
+            "inf": self.infer_times.mean(),
+            "latency": self.latencies.mean(),
+            "stages": {"latency": {"p95": percentiles["p95"]}}
+        }
+
+    def get_stats(self):
+        percentiles, _ = self.latencies.percentiles((50, 95))
+        stats = {
+            "captured": self.captured,
+            "processed": self.processed,
+            "overwritten": self.overwritten,
+            "stale": self.stale,
+            "late": self.late,
+            "read_errors": self.read_errors,
+            "fps": round(self.fps(), 2),
+            "infer_ms": round(self.infer_times.mean(), 2),
+            "latency_p50": round(percentiles["p50"], 2),
+            "latency_p95": round(percentiles["p95"], 2)
+        }
+        if self.tracker is not None:
+            stats["unique"] = self.tracker.unique_count
+        return stats
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+
+class BatchScheduler:
+    def __init__(self, detector, feeds, max_batch=None, deadline_ms=150.0, gather_ms=5.0,
+                 clock=time.monotonic, verbose=False):
+        """
+        Tek detector'ı paylaşan kameralar için batch zamanlayıcı
+
+        Hazır frame'i olan kameralar tek infer_batch çağrısında toplanır:
+        - Toplama: hazır kamera sayısı batch'i doldurmuyorsa en fazla gather_ms
+          (ve en eski frame'in deadline'ının yarısı) kadar diğerleri beklenir
+        - Deadline: yakalanalı deadline_ms'ten eski frame işlenmeden atılır
+          (stale); sonucu deadline'dan sonra çıkanlar "late" sayılır
+        - Adillik: kamera sayısı max_batch'ten fazlaysa en uzun süredir
+          batch'e alınmamış kameralar önce seçilir (round robin)
+
+        Sonuçlar her kameranın kendi tracker'ından geçirilip CameraFeed'e
+        yazılır. Frame zamanları CapturedFrame.timestamp (time.monotonic()).
+
+        Args:
+            detector: Paylaşılan Detector (backend max_batch >= kamera sayısı önerilir)
+            feeds: CameraFeed listesi
+            max_batch: Batch başına en fazla frame (None: backend.max_batch)
+            deadline_ms: Frame'in işlenmeye değer olduğu en büyük yaş
+            gather_ms: Batch'i doldurmak için en fazla bekleme
+        """
+        self.detector = detector
+        self.feeds = feeds
+        self.max_batch = max_batch or detector.backend.max_batch
+        self.deadline_ms = deadline_ms
+        self.gather_ms = gather_ms
+        self.clock = clock
+        self.verbose = verbose
+
+        self.batches = 0
+        self.batch_sizes = {}      # batch boyutu -> sayı
+        self.stage_times = {}
+        self._cond = threading.Condition()
+
+        if self.max_batch < len(feeds):
+            print(f"⚠️  Backend max_batch ({self.max_batch}) < kamera sayısı ({len(feeds)}): "
+                  f"kameralar sırayla batch'e alınacak")
+
+    def start(self):
+        for feed in self.feeds:
+            feed.start(self._cond)
+        return self
+
+    def next_batch(self, timeout=1.0):
+        """
+        İşlenecek (feed, CapturedFrame) çiftleri (hazır frame yoksa boş liste)
+
+        Raises:
+            EndOfStream: Tüm kaynaklar bitti
+        """
+        with self._cond:
+            self._cond.wait_for(self._any_ready_or_ended, timeout)
+            ready = [feed for feed in self.feeds if feed.pending is not None]
+            if not ready:
+                if all(feed.ended for feed in self.feeds):
+                    raise EndOfStream()
+                return []
+
+            # Batch'i doldurmak için kısa bekle (en eski frame'in deadline payı yettiği sürece)
+            alive = sum(1 for feed in self.feeds if not feed.ended or feed.pending is not None)
+            target = min(self.max_batch, alive)
+            if len(ready) < target and self.gather_ms > 0:
+                oldest = min(feed.pending.timestamp for feed in ready)
+                budget = min(self.gather_ms / 1000, oldest + self.deadline_ms / 2000 - self.clock())
+                if budget > 0:
+                    self._cond.wait_for(lambda: self._ready_count() >= target, budget)
+                ready = [feed for feed in self.feeds if feed.pending is not None]
+
+            now = self.clock()
+            candidates = []
+            for feed in ready:
+                if (now - feed.pending.timestamp) * 1000 > self.deadline_ms:
+                    feed.stale += 1
+                    feed.pending = None
+                else:
+                    candidates.append(feed)
+
+            # En uzun süredir servis edilmeyen önce, eşitlikte en eski frame
+            candidates.sort(key=lambda f: (f.served_at if f.served_at is not None else -math.inf,
+                                           f.pending.timestamp))
+            batch = []
+            for feed in candidates[:self.max_batch]:
+                batch.append((feed, feed.pending))
+                feed.pending = None
+                feed.served_at = now
+        return batch
+
+    def _any_ready_or_ended(self):
+        return any(feed.pending is not None for feed in self.feeds) or all(feed.ended for feed in self.feeds)
+
+    def _ready_count(self):
+        return sum(1 for feed in self.feeds if feed.pending is not None)
+
+    def process(self, batch):
+        """
+        Batch'i tek execution'da çalıştır ve sonuçları kameralara dağıt
+
+        Returns:
+            [(feed, results), ...]
+        """
+        frames = [packet.frame for _, packet in batch]
+        results = self.detector.infer_batch(frames)
+        self.stage_times = dict(self.detector.stage_times)
+
+        now = self.clock()
+        routed = []
+        for (feed, packet), detections, times in zip(batch, results, self.detector.batch_times):
+            routed.append((feed, feed.deliver(packet, detections, times, now, self.deadline_ms)))
+
+        self.batches += 1
+        self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+        if self.verbose:
+            names = ", ".join(feed.name for feed, _ in batch)
+            print(f"🧺 Batch {self.batches}: {names}")
+        return routed
+
+    def get_stats(self):
+        frames = sum(size * n for size, n in self.batch_sizes.items())
+        return {
+            "batches": self.batches,
+            "mean_batch": round(frames / self.batches, 2) if self.batches else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "cameras": {feed.name: feed.get_stats() for feed in self.feeds}
+        }
+
+    def stop(self):
+        for feed in self.feeds:
+            feed.stop()
+
+
+def make_mosaic(images, tile_size=None):
+    """
+    Görüntüleri ızgaraya yerleştir (tek pencere / tek MJPEG akışı için)
+
+    Args:
+        images: BGR görüntü listesi (None: boş kutu)
+        tile_size: (w, h) kutu boyutu (None: ilk görüntünün boyutu)
+
+    Returns:
+        Yeni ayrılmış mozaik görüntü
+    """
+    present = [image for image in images if image is not None]
+    if not present:
+        return None
+    if tile_size is None:
+        h, w = present[0].shape[:2]
+    else:
+        w, h = tile_size
+
+    cols = int(math.ceil(math.sqrt(len(images))))
+    rows = int(math.ceil(len(images) / cols))
+    mosaic = np.zeros((rows * h, cols * w, 3), dtype=np.uint8)
+    for i, image in enumerate(images):
+        if image is None:
+            continue
+        if image.shape[:2] != (h, w):
+            image = cv2.resize(image, (w, h), interpolation=cv2.INTER_AREA)
+        r, c = divmod(i, cols)
+        mosaic[r * h:(r + 1) * h, c * w:(c + 1) * w] = image
+    return mosaic
@@ -0,0 +1,354 @@
+import numpy as np
+
+# Bu kutu sayısına kadar tam IoU matrisi, üstünde grid (bucket) yolu kullanılır
+MATRIX_LIMIT = 500
+
+# Grid yolunun maliyet tahmini: bir aday çift ~4 greedy karşılaştırması, greedy'nin
+# tuttuğu kutu başına Python adımı ~2000 karşılaştırma kadar sürer (Jetson/x86 ölçümü)
+PAIR_COST = 4
+GREEDY_STEP_COST = 2000
+
+
+def _order(scores):
+    """Skora göre azalan sıra (klasik uygulamayla aynı eşitlik davranışı)"""
+    return scores.argsort()[::-1]
+
+
+def _areas(boxes):
+    return (boxes[:, 2] - boxes[:, 0] + 1) * (boxes[:, 3] - boxes[:, 1] + 1)
+
+
+def _class_offset(boxes, class_ids):
+    """
+    Sınıf bazlı NMS için kutuları sınıfa göre kaydır - farklı sınıflar asla
+    çakışmaz, böylece tek geçişte sınıf-duyarlı bastırma yapılır
+    """
+    offset = class_ids.astype(np.float32) * (float(boxes.max()) + 1.0)
+    return boxes + offset[:, None]
+
+
+def box_iou_matrix(a, b=None):
+    """
+    IoU matrisi (piksel +1 alan kuralıyla)
+
+    Args:
+        a: (N, 4), b: (M, 4) - b verilmezse a ile a
+
+    Returns:
+        iou: (N, M) float32
+    """
+    if b is None:
+        b = a
+    area_a = _areas(a)
+    area_b = _areas(b)
+
+    w = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]) + 1
+    h = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]) + 1
+    np.maximum(w, 0, out=w)
+    np.maximum(h, 0, out=h)
+    inter = w * h
+    return inter / (area_a[:, None] + area_b[None, :] - inter)
+
+
+def _suppression_matrix(boxes, iou_threshold):
+    """
+    IoU > eşik matrisi, bölme yapmadan: inter / (A + B - inter) > t
+    <=> inter > t / (1 + t) * (A + B). Ara diziler yerinde güncellenir.
+    """
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = _areas(boxes)
+
+    w = np.minimum(x2[:, None], x2)
+    w -= np.maximum(x1[:, None], x1)
+    w += 1
+    np.maximum(w, 0, out=w)
+    h = np.minimum(y2[:, None], y2)
+    h -= np.maximum(y1[:, None], y1)
+    h += 1
+    np.maximum(h, 0, out=h)
+    w *= h
+
+    rhs = np.add(areas[:, None], areas)
+    rhs *= np.float32(iou_threshold / (1.0 + iou_threshold))
+    return w > rhs
+
+
+def _pair_suppression(boxes, areas, src, dst, iou_threshold):
+    """Kutu çiftleri için IoU > eşik maskesi (bölmesiz)"""
+    w = np.minimum(boxes[src, 2], boxes[dst, 2]) - np.maximum(boxes[src, 0], boxes[dst, 0]) + 1
+    h = np.minimum(boxes[src, 3], boxes[dst, 3]) - np.maximum(boxes[src, 1], boxes[dst, 1]) + 1
+    inter = np.maximum(w, 0) * np.maximum(h, 0)
+    return inter > (areas[src] + areas[dst]) * np.float32(iou_threshold / (1.0 + iou_threshold))
+
+
+def greedy_nms(boxes, scores, iou_threshold, max_det=None):
+    """
+    Klasik greedy NMS - her adımda kalan tüm kutuları yeniden tarar (referans)
+
+    Returns:
+        keep: Tutulan indeksler (skora göre azalan)
+    """
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = _areas(boxes)
+    order = _order(scores)
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        if max_det is not None and len(keep) >= max_det:
+            break
+
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+
+        w = np.maximum(0.0, xx2 - xx1 + 1)
+        h = np.maximum(0.0, yy2 - yy1 + 1)
+        inter = w * h
+        ovr = inter / (areas[i] + areas[order[1:]] - inter)
+
+        inds = np.where(ovr <= iou_threshold)[0]
+        order = order[inds + 1]
+
+    return np.array(keep, dtype=np.intp)
+
+
+def matrix_nms(boxes, scores, iou_threshold, max_det=None):
+    """
+    Matris tabanlı NMS - tamamen vektörel, Python döngüsü kutu başına değil
+    iterasyon başına
+
+    Sıralı kutular için "i, j'yi bastırır" matrisi (sadece i < j) tek seferde
+    hesaplanır. keep_j = ~any(keep_i & S_ij) sabit nokta iterasyonu greedy
+    NMS ile aynı sonuca yakınsar (Cluster-NMS); genelde birkaç iterasyon yeter.
+    Küçük/orta N için en hızlı yol.
+    """
+    order = _order(scores)
+    suppress = np.triu(_suppression_matrix(boxes[order], iou_threshold), k=1)
+
+    keep = np.ones(len(order), dtype=bool)
+    for _ in range(len(order)):
+        new_keep = ~np.any(suppress[keep], axis=0)
+        if np.array_equal(new_keep, keep):
+            break
+        keep = new_keep
+
+    kept = order[keep]
+    return kept[:max_det] if max_det is not None else kept
+
+
+def bucketed_nms(boxes, scores, iou_threshold, max_det=None, chunk_size=512):
+    """
+    Grid (bucket) tabanlı NMS - büyük N için
+
+    Hücre boyutu en büyük kutu kenarı kadar seçilir; çakışan iki kutunun
+    merkezleri en fazla bir hücre uzakta olur. Aday çiftler sadece 3x3 komşu
+    hücrelerden, parça parça (bellek sınırlı) ve vektörel üretilir; eşiği geçen
+    çiftler seyrek bir komşuluk listesine (CSR) yazılır ve greedy seçim bu liste
+    üzerinde yapılır: O(N²) tarama yerine ~O(N·k). Kutular grid'e göre çok
+    büyükse greedy_nms'e düşer.
+    """
+    n = len(boxes)
+    order = _order(scores)
+    rank = np.empty(n, dtype=np.intp)
+    rank[order] = np.arange(n)
+    areas = _areas(boxes)
+
+    widths = boxes[:, 2] - boxes[:, 0] + 1
+    heights = boxes[:, 3] - boxes[:, 1] + 1
+    cell = float(max(widths.max(), heights.max(), 1.0))
+
+    cx = ((boxes[:, 0] + boxes[:, 2]) / 2 / cell).astype(np.int64)
+    cy = ((boxes[:, 1] + boxes[:, 3]) / 2 / cell).astype(np.int64)
+    cx -= cx.min()
+    cy -= cy.min()
+    grid_w = int(cx.max()) + 3
+    cell_ids = (cy + 1) * grid_w + (cx + 1)
+
+    by_cell = np.argsort(cell_ids, kind="stable")
+    sorted_cells = cell_ids[by_cell]
+
+    # Her kutu için 3x3 komşu hücrelerin sıralı dizideki aralıkları
+    neighbors = []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            target = cell_ids + (dy * grid_w + dx)
+            start = np.searchsorted(sorted_cells, target, side="left")
+            counts = np.searchsorted(sorted_cells, target, side="right") - start
+            neighbors.append((start, counts))
+
+    # Kutular grid'e göre çok büyükse (seyrek olmayan sahne) çift sayısı O(N²)'ye
+    # yaklaşır; bu durumda greedy tarama daha ucuz
+    pairs = sum(int(counts.sum()) for _, counts in neighbors) / 2
+    greedy_cost = n * n / 16 + n / 2 * GREEDY_STEP_COST
+    if pairs * PAIR_COST > greedy_cost:
+        return greedy_nms(boxes, scores, iou_threshold, max_det)
+
+    # Eşiği geçen (src bastırır dst) çiftleri parça parça topla (bellek sınırlı)
+    edge_src = []
+    edge_dst = []
+    for chunk_start in range(0, n, chunk_size):
+        chunk = slice(chunk_start, min(chunk_start + chunk_size, n))
+        chunk_ids = np.arange(chunk.start, chunk.stop)
+        for start, counts in neighbors:
+            start, counts = start[chunk], counts[chunk]
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            src = np.repeat(chunk_ids, counts)
+            base = np.repeat(start - (np.cumsum(counts) - counts), counts)
+            dst = by_cell[base + np.arange(total)]
+
+            mask = rank[src] < rank[dst]
+            src, dst = src[mask], dst[mask]
+            hit = _pair_suppression(boxes, areas, src, dst, iou_threshold)
+            edge_src.append(src[hit])
+            edge_dst.append(dst[hit])
+
+    src = np.concatenate(edge_src) if edge_src else np.empty(0, dtype=np.intp)
+    dst = np.concatenate(edge_dst) if edge_dst else np.empty(0, dtype=np.intp)
+
+    # CSR komşuluk: src -> bastırdığı kutular
+    by_src = np.argsort(src, kind="stable")
+    dst = dst[by_src]
+    indptr = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+    removed = np.zeros(n, dtype=bool)
+    keep = []
+    for i in order.tolist():
+        if removed[i]:
+            continue
+        keep.append(i)
+        if max_det is not None and len(keep) >= max_det:
+            break
+        removed[dst[indptr[i]:indptr[i + 1]]] = True
+
+    return np.array(keep, dtype=np.intp)
+
+
+def soft_nms(boxes, scores, iou_threshold, max_det=None, sigma=0.5, method="gaussian", score_threshold=0.001):
+    """
+    Soft-NMS - çakışan kutuları silmek yerine skorlarını düşürür
+    (sık ekilmiş sıralarda bitişik pancarları kaybetmemek için)
+
+    Args:
+        sigma: Gaussian azaltma parametresi
+        method: "gaussian" veya "linear"
+        score_threshold: Bu skorun altına düşen kutular atılır
+
+    Returns:
+        keep: Tutulan indeksler (güncel skora göre azalan)
+        new_scores: Tutulanların güncellenmiş skorları
+    """
+    scores = scores.astype(np.float32).copy()
+    areas = _areas(boxes)
+    remaining = np.arange(len(boxes))
+
+    keep = []
+    kept_scores = []
+    while remaining.size > 0:
+        best = remaining[np.argmax(scores[remaining])]
+        if scores[best] < score_threshold:
+            break
+        keep.append(best)
+        kept_scores.append(scores[best])
+        if max_det is not None and len(keep) >= max_det:
+            break
+
+        remaining = remaining[remaining != best]
+        if remaining.size == 0:
+            break
+
+        w = np.minimum(boxes[best, 2], boxes[remaining, 2]) - np.maximum(boxes[best, 0], boxes[remaining, 0]) + 1
+        h = np.minimum(boxes[best, 3], boxes[remaining, 3]) - np.maximum(boxes[best, 1], boxes[remaining, 1]) + 1
+        inter = np.maximum(w, 0) * np.maximum(h, 0)
+        ovr = inter / (areas[best] + areas[remaining] - inter)
+
+        if method == "linear":
+            decay = np.where(ovr > iou_threshold, 1.0 - ovr, 1.0)
+        else:
+            decay = np.exp(-(ovr * ovr) / sigma)
+        scores[remaining] *= decay.astype(np.float32)
+
+    return np.array(keep, dtype=np.intp), np.array(kept_scores, dtype=np.float32)
+
+
+class NMS:
+    def __init__(self, iou_threshold=0.45, max_det=300, topk=None, class_aware=True,
+                 method="auto", matrix_limit=MATRIX_LIMIT, soft_sigma=0.5, soft_method="gaussian",
+                 score_threshold=0.001):
+        """
+        Sütunsal diziler üzerinde çalışan NMS motoru
+
+        Args:
+            iou_threshold: IoU eşiği
+            max_det: Maksimum tutulacak kutu (erken durma)
+            topk: NMS öncesi en yüksek skorlu aday sınırı (None: sınırsız)
+            class_aware: Farklı sınıflar birbirini bastırmaz (çok sınıflı modeller)
+            method: "auto" (N'e göre matrix/bucketed), "matrix", "bucketed", "greedy" veya "soft"
+            matrix_limit: auto modda matrix yolunun kullanılacağı maksimum kutu sayısı
+            soft_sigma, soft_method, score_threshold: Soft-NMS parametreleri
+        """
+        if method not in ("auto", "matrix", "bucketed", "greedy", "soft"):
+            raise ValueError(f"❌ Bilinmeyen NMS yöntemi: {method}")
+
+        self.iou_threshold = iou_threshold
+        self.max_det = max_det
+        self.topk = topk
+        self.class_aware = class_aware
+        self.method = method
+        self.matrix_limit = matrix_limit
+        self.soft_sigma = soft_sigma
+        self.soft_method = soft_method
+        self.score_threshold = score_threshold
+
+    def select_method(self, n):
+        if self.method != "auto":
+            return self.method
+        return "matrix" if n <= self.matrix_limit else "bucketed"
+
+    def __call__(self, boxes, scores, class_ids=None):
+        """
+        Args:
+            boxes: (N, 4) [x1, y1, x2, y2]
+            scores: (N,)
+            class_ids: (N,) - class_aware için
+
+        Returns:
+            keep: Tutulan indeksler (skora göre azalan)
+            scores: Tutulanların skorları (Soft-NMS'te güncellenmiş)
+        """
+        n = len(boxes)
+        if n == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+        # Top-k: sadece en yüksek skorlu adaylarla çalış
+        candidates = None
+        if self.topk is not None and n > self.topk:
+            candidates = np.argpartition(scores, -self.topk)[-self.topk:]
+            boxes, scores = boxes[candidates], scores[candidates]
+            class_ids = class_ids[candidates] if class_ids is not None else None
+
+        boxes = boxes.astype(np.float32, copy=False)
+        if self.class_aware and class_ids is not None and len(boxes) > 1 and class_ids.min() != class_ids.max():
+            boxes = _class_offset(boxes, class_ids)
+
+        method = self.select_method(len(boxes))
+        if len(boxes) == 1:
+            keep = np.zeros(1, dtype=np.intp)
+            kept_scores = scores[keep]
+        elif method == "soft":
+            keep, kept_scores = soft_nms(boxes, scores, self.iou_threshold, self.max_det,
+                                         self.soft_sigma, self.soft_method, self.score_threshold)
+        else:
+            fn = {"matrix": matrix_nms, "bucketed": bucketed_nms, "greedy": greedy_nms}[method]
+            keep = fn(boxes, scores, self.iou_threshold, self.max_det)
+            kept_scores = scores[keep]
+
+        if candidates is not None:
+            keep = candidates[keep]
+        return keep, kept_scores
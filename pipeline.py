@@ -0,0 +1,251 @@
+import threading
+import time
+from collections import deque
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+
+_STOP = object()
+
+
+class FramePacket:
+    """Pipeline boyunca taşınan frame ve ara sonuçları"""
+    __slots__ = ("seq", "frame_id", "timestamp", "frame", "input", "params",
+                 "output", "results", "annotated", "timings", "release", "reused")
+
+    def __init__(self, seq, frame_id, timestamp, frame):
+        self.seq = seq                # Pipeline sıra numarası
+        self.frame_id = frame_id      # Kaynağın frame ID'si
+        self.timestamp = timestamp    # Yakalama zamanı (time.monotonic)
+        self.frame = frame
+        self.input = None             # Preprocess çıktısı
+        self.params = None            # Letterbox parametreleri
+        self.output = None            # Ham model çıktısı
+        self.results = None           # Tespitler
+        self.annotated = None         # Çizilmiş frame
+        self.timings = {}             # Aşama süreleri (ms)
+        self.release = None           # Havuz buffer'ını geri veren callback
+        self.reused = False           # Sahne değişmedi: önceki sonuçlar kullanılır
+
+
+class StageQueue:
+    def __init__(self, maxsize=2, policy=BLOCK, on_drop=None):
+        """
+        Aşamalar arası sınırlı kuyruk
+
+        Args:
+            maxsize: Kapasite
+            policy: "block" (üretici bekler) veya "drop_oldest" (en eski öğe atılır)
+            on_drop: Atılan öğe için çağrılacak fonksiyon
+        """
+        if policy not in (BLOCK, DROP_OLDEST):
+            raise ValueError(f"❌ Bilinmeyen backpressure politikası: {policy}")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.on_drop = on_drop
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        with self._cond:
+            if self.policy == BLOCK:
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._cond.wait(0.1)
+            elif len(self._items) >= self.maxsize:
+                dropped = self._items.popleft()
+                self.dropped += 1
+                if self.on_drop is not None and dropped is not _STOP:
+                    self.on_drop(dropped)
+
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def put_stop(self):
+        """Durdurma işaretini kapasiteye bakmadan ekle"""
+        with self._cond:
+            self._items.append(_STOP)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Returns:
+            item veya timeout'ta None
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout=timeout):
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        """Bekleyen üreticileri serbest bırak"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class PipelineStage(threading.Thread):
+    def __init__(self, name, fn, in_queue, out_queue, verbose=False):
+        """
+        Tek worker'lı pipeline aşaması - FIFO olduğu için frame sırası korunur
+
+        Args:
+            name: Aşama adı (süre anahtarı olarak da kullanılır)
+            fn: packet -> packet (None dönerse packet atılır)
+        """
+        super().__init__(name=f"stage-{name}", daemon=True)
+        self.stage_name = name
+        self.fn = fn
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.verbose = verbose
+        self.processed = 0
+        self.errors = 0
+
+    def run(self):
+        while True:
+            packet = self.in_queue.get()
+            if packet is _STOP:
+                self.out_queue.put_stop()
+                break
+
+            start = time.perf_counter()
+            try:
+                result = self.fn(packet)
+            except Exception as e:
+                self.errors += 1
+                if self.verbose:
+                    print(f"❌ {self.stage_name} aşamasında hata: {e}")
+                result = None
+            packet.timings[self.stage_name] = (time.perf_counter() - start) * 1000
+
+            if result is None:
+                release_buffer(packet)
+                continue
+
+            self.processed += 1
+            self.out_queue.put(result)
+
+
+class Pipeline:
+    def __init__(self, source, stages, queue_size=2, policy=BLOCK, verbose=False):
+        """
+        Çok aşamalı pipeline: her aşama kendi thread'inde, aralarında sınırlı kuyruklar
+
+        Frame N inference'tayken N+1 preprocess'te, N-1 çizimde olabilir; throughput
+        aşama sürelerinin toplamına değil en yavaş aşamaya yaklaşır.
+
+        Args:
+            source: () -> FramePacket veya None (frame yok), StopIteration ile biter
+            stages: [(ad, fn), ...] sırasıyla çalışacak aşamalar
+            queue_size: Aşamalar arası kuyruk kapasitesi
+            policy: "block" veya "drop_oldest"
+        """
+        self.source = source
+        self.verbose = verbose
+        self._running = False
+        self._seq = 0
+
+        self.queues = [StageQueue(queue_size, policy, on_drop=release_buffer) for _ in range(len(stages) + 1)]
+        self.stages = [
+            PipelineStage(name, fn, self.queues[i], self.queues[i + 1], verbose)
+            for i, (name, fn) in enumerate(stages)
+        ]
+        self.output = self.queues[-1]
+        self._source_thread = threading.Thread(target=self._source_loop, name="stage-source", daemon=True)
+
+    def start(self):
+        self._running = True
+        for stage in self.stages:
+            stage.start()
+        self._source_thread.start()
+
+    def _source_loop(self):
+        while self._running:
+            start = time.perf_counter()
+            try:
+                packet = self.source()
+            except StopIteration:
+                break
+            except Exception as e:
+                if self.verbose:
+                    print(f"❌ Kaynak hatası: {e}")
+                time.sleep(0.01)
+                continue
+
+            if packet is None:
+                continue
+
+            packet.seq = self._seq
+            self._seq += 1
+            packet.timings["capture"] = (time.perf_counter() - start) * 1000
+            self.queues[0].put(packet)
+
+        self.queues[0].put_stop()
+
+    def get(self, timeout=0.1):
+        """
+        Son aşamanın çıktısını al
+
+        Returns:
+            FramePacket, timeout'ta None; pipeline bittiyse StopIteration fırlatır
+        """
+        packet = self.output.get(timeout)
+        if packet is _STOP:
+            raise StopIteration
+        return packet
+
+    def stop(self):
+        """Kaynağı durdur, kuyrukları boşalt ve thread'leri bekle"""
+        self._running = False
+        for queue in self.queues:
+            queue.close()
+        self._source_thread.join(timeout=2.0)
+        for stage in self.stages:
+            stage.join(timeout=2.0)
+
+    def get_stats(self):
+        """Aşama başına işlenen/hata ve kuyruk başına atılan öğe sayıları"""
+        return {
+            "stages": {s.stage_name: {"processed": s.processed, "errors": s.errors} for s in self.stages},
+            "dropped": [q.dropped for q in self.queues],
+            "queued": [len(q) for q in self.queues]
+        }
+
+
+class BufferPool:
+    def __init__(self, factory, size):
+        """
+        Önceden ayrılmış buffer havuzu - pipeline'da frame başına ayırmayı önler
+
+        Args:
+            factory: () -> yeni buffer
+            size: Havuz boyutu (kuyruklardaki öğe sayısından büyük olmalı)
+        """
+        self._free = deque(factory() for _ in range(size))
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=1.0):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._free, timeout=timeout):
+                raise RuntimeError("❌ Buffer havuzu tükendi!")
+            return self._free.popleft()
+
+    def release(self, buffer):
+        with self._cond:
+            self._free.append(buffer)
+            self._cond.notify()
+
+
+def release_buffer(packet):
+    """Packet'in tuttuğu havuz buffer'ını geri ver"""
+    if packet.release is not None:
+        packet.release()
+        packet.release = None
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+def decode_yolov8(output, letterbox_params, conf=0.25, min_box_size=10, topk=1000):
+    """
+    YOLOv8 çıktısını tamamen vektörel olarak çöz
+
+    Format: (1, 4 + nc, N) -> [x_center, y_center, width, height, cls_0, ...]
+    Tek sınıflı modelde (1, 5, 8400). Python döngüsü yok; center->corner,
+    letterbox geri dönüşümü, clamp ve küçük kutu filtresi tüm dizi üzerinde yapılır.
+
+    Args:
+        output: Model çıktısı (1, 4 + nc, N) veya (4 + nc, N)
+        letterbox_params: letterbox() tarafından döndürülen parametreler
+        conf: Confidence eşiği
+        min_box_size: Orijinal görüntüde minimum kutu genişliği/yüksekliği (piksel)
+        topk: NMS öncesi tutulacak en yüksek skorlu aday sayısı (None: sınırsız)
+
+    Returns:
+        boxes: (K, 4) int32 [x1, y1, x2, y2] orijinal görüntü koordinatlarında
+        scores: (K,) float32
+        class_ids: (K,) int32
+    """
+    preds = output[0] if output.ndim == 3 else output
+    num_classes = preds.shape[0] - 4
+
+    # Skor ve sınıf - transpose yapmadan satır bazlı
+    if num_classes == 1:
+        scores = preds[4]
+        class_ids = None
+    else:
+        cls_scores = preds[4:]
+        class_ids = cls_scores.argmax(axis=0)
+        scores = cls_scores[class_ids, np.arange(preds.shape[1])]
+
+    # Confidence filtresi
+    idx = np.flatnonzero(scores >= conf)
+    if idx.size == 0:
+        return _empty()
+
+    # Top-k: sadece en yüksek skorlu adaylarla devam et
+    if topk is not None and idx.size > topk:
+        part = np.argpartition(scores[idx], -topk)[-topk:]
+        idx = idx[part]
+
+    cand_scores = scores[idx].astype(np.float32)
+    cand_classes = class_ids[idx].astype(np.int32) if class_ids is not None else np.zeros(idx.size, dtype=np.int32)
+
+    xc, yc, w, h = preds[0, idx], preds[1, idx], preds[2, idx], preds[3, idx]
+
+    scale = letterbox_params['scale']
+    pad_left = letterbox_params['pad_left']
+    pad_top = letterbox_params['pad_top']
+    orig_w = letterbox_params['original_w']
+    orig_h = letterbox_params['original_h']
+
+    # Center -> corner, letterbox padding'i kaldır, orijinal boyuta ölçekle
+    boxes = np.empty((idx.size, 4), dtype=np.float32)
+    boxes[:, 0] = xc - w / 2 - pad_left
+    boxes[:, 1] = yc - h / 2 - pad_top
+    boxes[:, 2] = xc + w / 2 - pad_left
+    boxes[:, 3] = yc + h / 2 - pad_top
+    boxes /= scale
+
+    # int() ile aynı davranış (sıfıra doğru kırp), sonra sınır kontrolü
+    boxes = boxes.astype(np.int32)
+    np.clip(boxes[:, 0::2], 0, orig_w - 1, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, orig_h - 1, out=boxes[:, 1::2])
+
+    bw = boxes[:, 2] - boxes[:, 0]
+    bh = boxes[:, 3] - boxes[:, 1]
+    keep = (bw >= min_box_size) & (bh >= min_box_size) & (bw > 0) & (bh > 0)
+
+    return boxes[keep], cand_scores[keep], cand_classes[keep]
+
+
+def _empty():
+    return (np.empty((0, 4), dtype=np.int32),
+            np.empty((0,), dtype=np.float32),
+            np.empty((0,), dtype=np.int32))
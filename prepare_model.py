@@ -0,0 +1,173 @@
+import os
+import sys
+import numpy as np
+import onnx
+from onnx import helper, numpy_helper, TensorProto
+
+UINT8_NHWC = "uint8_nhwc"
+
+
+def fold_preprocessing(model):
+    """
+    ONNX grafını uint8 NHWC input alacak şekilde yeniden yaz
+
+    Orijinal (N, 3, H, W) float32 input yerine (N, H, W, 3) uint8 input eklenir;
+    transpose, cast ve /255 işlemleri grafın başına node olarak konur. Transpose
+    cast'tan önce yapılır (GPU'da 4 kat az veri taşınır). Input adı değişmez,
+    bu yüzden backend'ler ve build_engine aynı "images" adını kullanır.
+
+    Args:
+        model: onnx.ModelProto (yerinde değiştirilir)
+
+    Returns:
+        model
+
+    Raises:
+        ValueError: Input float32 (N, 3, H, W) değil veya model zaten hazırlanmış
+    """
+    graph = model.graph
+    initializers = {init.name for init in graph.initializer}
+    inputs = [inp for inp in graph.input if inp.name not in initializers]
+    original = inputs[0]
+
+    tensor_type = original.type.tensor_type
+    if tensor_type.elem_type == TensorProto.UINT8:
+        raise ValueError(f"❌ Model zaten uint8 input alıyor: {original.name}")
+    if tensor_type.elem_type != TensorProto.FLOAT:
+        raise ValueError(f"❌ float32 input bekleniyordu: {original.name}")
+
+    dims = list(tensor_type.shape.dim)
+    if len(dims) != 4 or dims[1].dim_value != 3:
+        raise ValueError(f"❌ (N, 3, H, W) input bekleniyordu: {original.name}")
+
+    name = original.name
+    internal = f"{name}_nchw_float"
+
+    # Orijinal input'u kullanan node'lar artık normalize edilmiş iç tensörü okur
+    for node in graph.node:
+        for i, input_name in enumerate(node.input):
+            if input_name == name:
+                node.input[i] = internal
+
+    def dim_of(dim):
+        return dim.dim_param if dim.dim_param else dim.dim_value
+
+    new_input = helper.make_tensor_value_info(
+        name, TensorProto.UINT8, [dim_of(dims[0]), dim_of(dims[2]), dim_of(dims[3]), 3]
+    )
+    scale = numpy_helper.from_array(np.array(255.0, dtype=np.float32), name=f"{name}_scale")
+    preprocess_nodes = [
+        helper.make_node("Transpose", [name], [f"{name}_nchw"], perm=[0, 3, 1, 2], name=f"{name}_to_nchw"),
+        helper.make_node("Cast", [f"{name}_nchw"], [f"{name}_nchw_cast"], to=TensorProto.FLOAT, name=f"{name}_cast"),
+        helper.make_node("Div", [f"{name}_nchw_cast", scale.name], [internal], name=f"{name}_normalize"),
+    ]
+
+    new_graph = helper.make_graph(
+        preprocess_nodes + list(graph.node),
+        graph.name,
+        [new_input] + [inp for inp in graph.input if inp.name != name],
+        list(graph.output),
+        initializer=list(graph.initializer) + [scale],
+        value_info=list(graph.value_info)
+    )
+    graph.CopyFrom(new_graph)
+
+    helper.set_model_props(model, dict(
+        [(prop.key, prop.value) for prop in model.metadata_props], input_format=UINT8_NHWC
+    ))
+    onnx.checker.check_model(model)
+    return model
+
+
+def verify_equivalence(original_path, prepared_path, samples=4, atol=1e-4, seed=0):
+    """
+    Orijinal ve hazırlanmış modeli ONNX Runtime (CPU) ile karşılaştır
+
+    Rastgele çözünürlüklerde sentetik frame'ler üretilir; orijinal model
+    CPU preprocessing (letterbox + /255 + CHW) çıktısıyla, hazırlanmış model
+    aynı letterbox canvas'ının uint8 haliyle çalıştırılır.
+
+    Returns:
+        max_diff: En büyük mutlak çıktı farkı
+
+    Raises:
+        AssertionError: Fark atol'dan büyük
+    """
+    import onnxruntime as ort
+    from preprocess import LetterboxPreprocessor
+
+    providers = ["CPUExecutionProvider"]
+    original = ort.InferenceSession(original_path, providers=providers)
+    prepared = ort.InferenceSession(prepared_path, providers=providers)
+    original_input = original.get_inputs()[0]
+    prepared_input = prepared.get_inputs()[0]
+    _, _, h, w = original_input.shape
+
+    rng = np.random.RandomState(seed)
+    preprocessor = LetterboxPreprocessor(new_shape=(h, w))
+    float_input = np.empty((1, 3, h, w), dtype=np.float32)
+    uint8_input = np.empty((1, h, w, 3), dtype=np.uint8)
+
+    max_diff = 0.0
+    for i in range(samples):
+        frame_h, frame_w = rng.randint(240, 1080), rng.randint(320, 1920)
+        frame = rng.randint(0, 256, (frame_h, frame_w, 3)).astype(np.uint8)
+        preprocessor(frame, float_input)
+        preprocessor(frame, uint8_input)
+
+        expected = original.run(None, {original_input.name: float_input})[0]
+        actual = prepared.run(None, {prepared_input.name: uint8_input})[0]
+        diff = float(np.abs(expected - actual).max())
+        max_diff = max(max_diff, diff)
+        print(f"  🔬 Örnek {i + 1}: {frame_w}x{frame_h}, max fark={diff:.2e}")
+
+    assert max_diff <= atol, f"❌ Çıktılar farklı: max fark {max_diff:.2e} > {atol:.0e}"
+    return max_diff
+
+
+def prepare_model(onnx_path, output_path, verify=True):
+    """
+    Normalizasyonu grafa gömülmüş uint8 input'lu model üret
+
+    Host->cihaz kopyası float32 yerine uint8 olur (640x640'ta 4.9 MB -> 1.2 MB)
+    ve CPU'da cast/bölme/transpose yapılmaz.
+
+    Not: TensorRT'de uint8 ağ girişi TensorRT 8.5+ gerektirir (JetPack 5);
+    JetPack 4 (TensorRT 8.2) için orijinal float32 model kullanılmalıdır.
+    """
+    print(f"🔧 Model hazırlanıyor: {onnx_path} -> {output_path}")
+    model = onnx.load(onnx_path)
+    fold_preprocessing(model)
+    onnx.save(model, output_path)
+
+    inp = model.graph.input[0]
+    shape = [d.dim_param or d.dim_value for d in inp.type.tensor_type.shape.dim]
+    print(f"✅ Yeni input: {inp.name}, uint8, shape={shape}")
+
+    if verify:
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            print("⚠️  onnxruntime yok, eşdeğerlik kontrolü atlandı")
+            return True
+        max_diff = verify_equivalence(onnx_path, output_path)
+        print(f"✅ Çıktılar eşdeğer (max fark={max_diff:.2e})")
+    return True
+
+
+if __name__ == "__main__":
+    # Kullanım: python prepare_model.py [model2.onnx] [model2_u8.onnx] [--no-verify]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    onnx_path = args[0] if args else "model2.onnx"
+    output_path = args[1] if len(args) > 1 else os.path.splitext(onnx_path)[0] + "_u8.onnx"
+
+    if not os.path.exists(onnx_path):
+        print(f"❌ ONNX dosyası bulunamadı: {onnx_path}")
+        sys.exit(1)
+
+    try:
+        prepare_model(onnx_path, output_path, verify="--no-verify" not in sys.argv)
+        print(f"🎉 Hazır: {output_path} (build_engine.py --onnx {output_path} ile engine'e dönüştürün)")
+    except (ValueError, AssertionError) as e:
+        print(f"💥 {e}")
+        sys.exit(1)
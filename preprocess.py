@@ -0,0 +1,155 @@
+import numpy as np
+import cv2
+
+
+def letterbox_geometry(h, w, new_shape=(640, 640)):
+    """
+    Letterbox geometrisini hesapla (ölçek ve padding)
+
+    Args:
+        h, w: Kaynak görüntü boyutları
+        new_shape: Hedef (yükseklik, genişlik)
+
+    Returns:
+        params: scale, pad_left, pad_top, original_w, original_h,
+                new_w, new_h, pad_right, pad_bottom
+    """
+    target_h, target_w = new_shape
+
+    scale = min(target_w / w, target_h / h)
+    new_w = int(w * scale)
+    new_h = int(h * scale)
+
+    pad_w = (target_w - new_w) // 2
+    pad_h = (target_h - new_h) // 2
+
+    left = right = pad_w
+    top = bottom = pad_h
+
+    if (target_w - new_w) % 2 != 0:
+        right += 1
+    if (target_h - new_h) % 2 != 0:
+        bottom += 1
+
+    return {
+        'scale': scale,
+        'pad_left': left,
+        'pad_top': top,
+        'original_w': w,
+        'original_h': h,
+        'new_w': new_w,
+        'new_h': new_h,
+        'pad_right': right,
+        'pad_bottom': bottom
+    }
+
+
+def letterbox(img, new_shape=(640, 640), color=(114, 114, 114)):
+    """Letterbox preprocessing (her çağrıda yeni dizi ayırır)"""
+    h, w = img.shape[:2]
+    params = letterbox_geometry(h, w, new_shape)
+
+    resized = cv2.resize(img, (params['new_w'], params['new_h']), interpolation=cv2.INTER_LINEAR)
+
+    letterboxed = cv2.copyMakeBorder(
+        resized, params['pad_top'], params['pad_bottom'], params['pad_left'], params['pad_right'],
+        cv2.BORDER_CONSTANT, value=color
+    )
+
+    return letterboxed, params
+
+
+class LetterboxPreprocessor:
+    def __init__(self, new_shape=(640, 640), color=(114, 114, 114)):
+        """
+        Sıfır kopyalı (fused) letterbox preprocessing
+
+        Frame doğrudan tekrar kullanılan bir canvas'ın içine resize edilir,
+        normalize edilmiş CHW float veri doğrudan hedef buffer'a (ör. page-locked
+        input buffer) yazılır. Geometri her kaynak çözünürlüğü için bir kez hesaplanır.
+
+        Args:
+            new_shape: Hedef (yükseklik, genişlik)
+            color: Padding rengi
+        """
+        self.new_shape = new_shape
+        self.color = color
+        self.canvas = np.empty((new_shape[0], new_shape[1], 3), dtype=np.uint8)
+        self.canvas[:] = color
+        # Dış buffer'ların padding şeritleri için hazır dolgu (memcpy hızında kopya)
+        self.background = self.canvas.copy()
+
+        self._geometry_cache = {}
+        self._last_key = None
+
+    def geometry(self, h, w):
+        """Kaynak çözünürlüğü için önbellekli letterbox geometrisi"""
+        key = (h, w)
+        params = self._geometry_cache.get(key)
+        if params is None:
+            params = letterbox_geometry(h, w, self.new_shape)
+            self._geometry_cache[key] = params
+        return params
+
+    def letterbox(self, frame, canvas=None):
+        """
+        Frame'i canvas'a letterbox et (yeni dizi ayırmadan)
+
+        Args:
+            canvas: Hedef (H, W, 3) uint8 buffer (None: dahili canvas).
+                    Dışarıdan verilen canvas'ın sadece padding şeritleri doldurulur.
+
+        Returns:
+            canvas: (H, W, 3) uint8 - bir sonraki çağrıda üzerine yazılır
+            params: Letterbox parametreleri
+        """
+        h, w = frame.shape[:2]
+        params = self.geometry(h, w)
+        top, left = params['pad_top'], params['pad_left']
+        bottom, right = top + params['new_h'], left + params['new_w']
+
+        if canvas is None:
+            canvas = self.canvas
+            # Geometri değiştiyse padding alanını yeniden doldur
+            if self._last_key != (h, w):
+                canvas[:] = self.color
+                self._last_key = (h, w)
+        else:
+            # Buffer başka geometride kullanılmış olabilir: şeritleri her seferinde doldur
+            background = self.background
+            np.copyto(canvas[:top], background[:top])
+            np.copyto(canvas[bottom:], background[bottom:])
+            np.copyto(canvas[top:bottom, :left], background[top:bottom, :left])
+            np.copyto(canvas[top:bottom, right:], background[top:bottom, right:])
+
+        roi = canvas[top:bottom, left:right]
+        resized = cv2.resize(frame, (params['new_w'], params['new_h']), dst=roi,
+                             interpolation=cv2.INTER_LINEAR)
+        if resized is not roi:
+            # Bazı OpenCV sürümleri dst'yi yeniden ayırabilir
+            np.copyto(roi, resized)
+
+        return canvas, params
+
+    def __call__(self, frame, out):
+        """
+        Letterbox + normalize + HWC->CHW tek geçişte, doğrudan out'a yaz
+
+        uint8 hedefte (normalizasyonu grafa gömülmüş model) frame doğrudan
+        out'a letterbox edilir; cast, /255 ve transpose modelin içinde yapılır.
+
+        Args:
+            frame: BGR görüntü (H, W, 3)
+            out: (1, 3, H, W) / (3, H, W) float32 veya (1, H, W, 3) / (H, W, 3) uint8 hedef buffer
+
+        Returns:
+            params: Letterbox parametreleri
+        """
+        if out.dtype == np.uint8:
+            _, params = self.letterbox(frame, out[0] if out.ndim == 4 else out)
+            return params
+
+        canvas, params = self.letterbox(frame)
+        chw = out[0] if out.ndim == 4 else out
+        np.divide(canvas.transpose(2, 0, 1), np.float32(255.0), out=chw, dtype=np.float32)
+        return params
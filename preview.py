@@ -0,0 +1,296 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+import cv2
+
+BOUNDARY = "frame"
+
+# /control komutları -> klavye kısayolu (LiveDetectionApp._handle_key ile aynı tuşlar)
+COMMANDS = {"quit": ord('q'), "screenshot": ord('s'), "record": ord('r')}
+NO_KEY = 255  # cv2.waitKey(1) & 0xFF: tuşa basılmadı
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Pancar Algılama</title></head>
+<body style="margin:0;background:#111;color:#ddd;font-family:sans-serif">
+<img src="/stream" style="max-width:100%;display:block">
+<form method="post" style="padding:8px">
+<button formaction="/control?cmd=screenshot">Ekran görüntüsü</button>
+<button formaction="/control?cmd=record">Olay kaydı</button>
+<button formaction="/control?cmd=quit">Durdur</button>
+<a href="/stats" style="color:#8c8">istatistikler</a>
+</form>
+</body></html>
+"""
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True        # Açık stream bağlantıları kapanmayı bekletmesin
+    allow_reuse_address = True
+
+
+class _PreviewHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        preview = self.server.preview
+        url = urlparse(self.path)
+        if url.path == "/":
+            self._send(200, "text/html; charset=utf-8", INDEX_PAGE.encode("utf-8"))
+        elif url.path == "/stream":
+            preview.serve_stream(self)
+        elif url.path == "/snapshot.jpg":
+            jpeg = preview.next_jpeg()
+            if jpeg is None:
+                self._send(503, "text/plain", b"frame yok")
+            else:
+                self._send(200, "image/jpeg", jpeg)
+        elif url.path == "/stats":
+            self._send(200, "application/json", json.dumps(preview.get_stats()).encode("utf-8"))
+        elif url.path == "/control":
+            # Durum değiştiren komutlar sadece POST (link önizleme / prefetch üniteyi durdurmasın)
+            self._send(405, "text/plain", b"sadece POST")
+        else:
+            self._send(404, "text/plain", b"bulunamadi")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/control":
+            self._control(url)
+        else:
+            self._send(404, "text/plain", b"bulunamadi")
+
+    def _control(self, url):
+        command = parse_qs(url.query).get("cmd", [""])[0]
+        if not self.server.preview.push_command(command):
+            self._send(400, "application/json", json.dumps({"error": f"bilinmeyen komut: {command}"}).encode("utf-8"))
+            return
+        self._send(202, "application/json", json.dumps({"queued": command}).encode("utf-8"))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.preview.verbose:
+            super().log_message(format, *args)
+
+
+class PreviewServer:
+    def __init__(self, host="127.0.0.1", port=8080, quality=70, max_fps=10.0, workers=2,
+                 clock=time.perf_counter, verbose=False):
+        """
+        Ekransız (headless) çalışma için yerel MJPEG/HTTP önizleme sunucusu
+
+        Çizilen frame'ler küçük bir thread havuzunda JPEG'e çevrilir ve
+        bağlı tüm izleyicilere multipart MJPEG olarak gönderilir. Bağlı
+        izleyici yoksa ya da havuz meşgulse frame kodlanmaz (wants_frame);
+        tespit thread'i kodlamayı veya ağ yazımını hiç beklemez.
+
+        Uç noktalar:
+            /              Önizleme sayfası
+            /stream        MJPEG akışı (çoklu izleyici)
+            /snapshot.jpg  Sonraki frame (tek JPEG)
+            /control?cmd=  quit | screenshot | record (sadece POST, klavye kısayollarının yerine)
+            /stats         JSON istatistikler
+
+        Args:
+            host, port: Dinlenecek adres (varsayılan sadece yerel; "0.0.0.0": tüm arayüzler, kimlik doğrulama yok)
+            quality: JPEG kalitesi (0-100)
+            max_fps: En fazla kodlama hızı
+            workers: JPEG kodlama thread sayısı
+        """
+        self.host = host
+        self.port = port
+        self.quality = quality
+        self.max_fps = max_fps
+        self.workers = workers
+        self.clock = clock
+        self.verbose = verbose
+
+        self.clients = 0
+        self.encoded = 0
+        self.skipped = 0       # İzleyici yok / hız sınırı / havuz meşgul
+        self.sent = 0
+        self._in_flight = 0
+        self._last_publish = None
+        self._seq = 0          # Yayınlanan frame sırası
+        self._jpeg_seq = 0     # En son kodlanan frame'in sırası
+        self._jpeg = None
+        self._running = False
+        self._cond = threading.Condition()
+        self._commands = queue.Queue()
+        self._executor = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host = "localhost" if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self.port}/"
+
+    def start(self):
+        """
+        Sunucuyu arka plan thread'inde başlat
+
+        Raises:
+            OSError: Port kullanımda
+        """
+        self._server = _ThreadingHTTPServer((self.host, self.port), _PreviewHandler)
+        self._server.preview = self
+        self.port = self._server.server_address[1]  # port=0: otomatik
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._running = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="preview-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def wants_frame(self):
+        """
+        Bu frame çizilip yayınlanmalı mı? (izleyici var, hız sınırı ve havuz uygun)
+
+        False dönerse çizim de atlanabilir.
+        """
+        if self._ready():
+            return True
+        self.skipped += 1
+        return False
+
+    def _ready(self):
+        if not self.clients:
+            return False
+        if self._in_flight >= self.workers:
+            return False
+        if self.max_fps and self._last_publish is not None and \
+                self.clock() - self._last_publish < 1.0 / self.max_fps:
+            return False
+        return True
+
+    def publish(self, image):
+        """
+        Frame'i kodlama havuzuna gönder (beklemeden döner)
+
+        image kodlama bitene kadar değiştirilmemeli (her frame yeni dizi ya da kopya).
+
+        Returns:
+            True: kodlamaya gönderildi; False: atlandı
+        """
+        if image is None or not self._ready():
+            self.skipped += 1
+            return False
+        self._last_publish = self.clock()
+        with self._cond:
+            self._seq += 1
+            seq = self._seq
+            self._in_flight += 1
+        self._executor.submit(self._encode, seq, image)
+        return True
+
+    def _encode(self, seq, image):
+        try:
+            ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)])
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+        if not ok:
+            return
+        with self._cond:
+            self.encoded += 1
+            # Havuzda sıra bozulabilir: eski frame yenisinin üzerine yazılmasın
+            if seq > self._jpeg_seq:
+                self._jpeg_seq = seq
+                self._jpeg = buffer.tobytes()
+                self._cond.notify_all()
+
+    def _wait_jpeg(self, after_seq, timeout=1.0):
+        """after_seq'ten yeni bir JPEG bekle; (seq, jpeg) veya (after_seq, None)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._jpeg_seq > after_seq or not self._running, timeout)
+            if self._jpeg_seq > after_seq:
+                return self._jpeg_seq, self._jpeg
+            return after_seq, None
+
+    def _add_client(self, n):
+        with self._cond:
+            self.clients += n
+
+    def next_jpeg(self, timeout=2.0):
+        """Sonraki kodlanan frame (snapshot için geçici izleyici olunur)"""
+        self._add_client(1)
+        try:
+            _, jpeg = self._wait_jpeg(self._jpeg_seq, timeout)
+            return jpeg or self._jpeg
+        finally:
+            self._add_client(-1)
+
+    def serve_stream(self, handler):
+        """Bağlantı kapanana kadar multipart MJPEG yaz (istek thread'inde)"""
+        handler.send_response(200)
+        handler.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        handler.send_header("Cache-Control", "no-store")
+        handler.end_headers()
+
+        self._add_client(1)
+        if self.verbose:
+            print(f"👁️  İzleyici bağlandı: {handler.client_address[0]} (toplam {self.clients})")
+        seq = 0
+        try:
+            while self._running:
+                seq, jpeg = self._wait_jpeg(seq)
+                if jpeg is None:
+                    continue
+                handler.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                )
+                handler.wfile.write(jpeg)
+                handler.wfile.write(b"\r\n")
+                self.sent += 1
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+        finally:
+            self._add_client(-1)
+            if self.verbose:
+                print(f"👁️  İzleyici ayrıldı: {handler.client_address[0]} (toplam {self.clients})")
+
+    def push_command(self, command):
+        """Kontrol komutunu kuyruğa ekle (bilinmeyen komutta False)"""
+        key = COMMANDS.get(command)
+        if key is None:
+            return False
+        self._commands.put(key)
+        if self.verbose:
+            print(f"🎛️  Kontrol komutu: {command}")
+        return True
+
+    def poll_key(self):
+        """cv2.waitKey(1) & 0xFF yerine: bekleyen komutun tuş kodu veya NO_KEY"""
+        try:
+            return self._commands.get_nowait()
+        except queue.Empty:
+            return NO_KEY
+
+    def get_stats(self):
+        return {
+            "clients": self.clients,
+            "encoded": self.encoded,
+            "skipped": self.skipped,
+            "sent": self.sent,
+            "quality": self.quality,
+            "max_fps": self.max_fps
+        }
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,259 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+import cv2
+from metrics import RollingWindow
+
+SNAPSHOT = "snapshot"
+FRAME = "frame"
+CLOSE = "close"
+_STOP = object()
+
+MANUAL = "manual"
+MIN_COUNT = "count"
+COUNT_JUMP = "count_jump"
+CONTINUOUS = "continuous"
+
+
+class Recorder:
+    def __init__(self, output_dir="recordings", fps=10.0, pre_seconds=5.0, post_seconds=5.0, scale=0.5,
+                 min_count=None, count_jump=None, continuous=False, segment_seconds=60.0, queue_size=64,
+                 codec="MJPG", clock=time.monotonic, verbose=False):
+        """
+        Asenkron kayıt: ekran görüntüleri, olay klipleri ve sürekli kayıt
+
+        Disk yazımı (imwrite / VideoWriter) tek bir arka plan thread'inde
+        yapılır; ana döngü sadece sınırlı kuyruğa iş ekler. Kuyruk doluysa
+        (SD kart yetişemiyorsa) iş beklenmeden atılır ve sayılır.
+
+        Son pre_seconds saniyenin frame'leri bellekte (fps hızında örneklenmiş,
+        scale ile küçültülmüş) bir ring buffer'da tutulur. Olay tetiklenince
+        (elle veya tespit sayısı eşiğiyle) ring buffer diske boşaltılır ve kayıt
+        post_seconds boyunca devam eder; kayıt sırasında gelen yeni olay süreyi uzatır.
+
+        Args:
+            output_dir: Kayıt klasörü
+            fps: Kayıt / örnekleme hızı
+            pre_seconds: Olay öncesi tutulacak süre (0: ring buffer yok)
+            post_seconds: Olay sonrası kayıt süresi
+            scale: Kayıt ölçeği (ring buffer belleğini de belirler)
+            min_count: Tespit sayısı bu değere ulaşınca olay (None: kapalı)
+            count_jump: Tespit sayısı bir örnekte bu kadar değişince olay (None: kapalı)
+            continuous: Tüm örnekleri segment_seconds'lık dosyalara kaydet
+            queue_size: Yazıcı kuyruğu kapasitesi (frame / görüntü)
+            codec: VideoWriter FourCC (MJPG: düşük CPU, .avi)
+        """
+        self.output_dir = output_dir
+        self.fps = fps
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.scale = scale
+        self.min_count = min_count
+        self.count_jump = count_jump
+        self.continuous = continuous
+        self.segment_seconds = segment_seconds
+        self.codec = codec
+        self.clock = clock
+        self.verbose = verbose
+
+        self.ring = deque(maxlen=max(1, int(round(pre_seconds * fps)))) if pre_seconds > 0 else None
+        self.events = {MANUAL: 0, MIN_COUNT: 0, COUNT_JUMP: 0}
+        self.dropped = {SNAPSHOT: 0, FRAME: 0}
+        self.written = {SNAPSHOT: 0, FRAME: 0}
+        self.segments = 0
+        self.write_errors = 0
+        self.queue_peak = 0
+        self.write_times = RollingWindow(100)
+
+        # Kapatma işleri hiç atılmamalı: sınır sadece görüntü işlerine uygulanır
+        self.queue_size = queue_size
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._last_sample = None
+        self._last_count = None
+        self._event = None       # (segment yolu, bitiş zamanı)
+        self._segment = None     # (segment yolu, bitiş zamanı) - sürekli kayıt
+        self._writers = {}       # Yazıcı thread'ine ait: yol -> VideoWriter
+
+        self._thread = threading.Thread(target=self._writer_loop, name="recorder", daemon=True)
+        self._thread.start()
+
+    def _enqueue(self, job):
+        """Kuyruğa ekle; görüntü kuyruğu doluysa bekleme, at (True: eklendi)"""
+        kind = job[0]
+        if kind != CLOSE:
+            with self._count_lock:
+                if self._pending >= self.queue_size:
+                    self.dropped[kind] += 1
+                    return False
+                self._pending += 1
+                self.queue_peak = max(self.queue_peak, self._pending)
+        self._queue.put(job)
+        return True
+
+    def snapshot(self, image, path):
+        """
+        Görüntüyü arka planda kaydet (kopyası alınır, çağıran beklemez)
+
+        Returns:
+            True: kuyruğa alındı; False: kuyruk dolu, atıldı
+        """
+        return self._enqueue((SNAPSHOT, path, image.copy()))
+
+    def add(self, frame, count=0, timestamp=None):
+        """
+        Frame'i kayda ver (fps hızında örneklenir) ve otomatik olay eşiklerini kontrol et
+
+        Args:
+            frame: BGR görüntü (örneklenirse küçültülmüş kopyası tutulur)
+            count: Bu frame'deki tespit sayısı
+            timestamp: Frame zamanı (None: şimdi)
+        """
+        now = self.clock() if timestamp is None else timestamp
+        if self._last_sample is not None and now - self._last_sample < 1.0 / self.fps:
+            return
+        self._last_sample = now
+
+        if self.scale != 1.0:
+            sample = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        else:
+            sample = frame.copy()
+
+        with self._lock:
+            reason = self._check_count(count)
+            if reason is not None:
+                self._trigger(reason, now)
+
+            if self.ring is not None:
+                self.ring.append(sample)
+            if self._event is not None:
+                path, until = self._event
+                self._enqueue((FRAME, path, sample))
+                if now >= until:
+                    self._enqueue((CLOSE, path, None))
+                    self._event = None
+            if self.continuous:
+                self._record_continuous(sample, now)
+
+    def _check_count(self, count):
+        previous, self._last_count = self._last_count, count
+        if self.min_count is not None and count >= self.min_count and \
+                (previous is None or previous < self.min_count):
+            return MIN_COUNT
+        if self.count_jump is not None and previous is not None and abs(count - previous) >= self.count_jump:
+            return COUNT_JUMP
+        return None
+
+    def trigger(self, reason=MANUAL):
+        """Olay klibini başlat (kayıt sürüyorsa süreyi uzat)"""
+        with self._lock:
+            return self._trigger(reason, self.clock())
+
+    def _trigger(self, reason, now):
+        self.events[reason] = self.events.get(reason, 0) + 1
+        until = now + self.post_seconds
+        if self._event is not None:
+            self._event = (self._event[0], until)
+            return self._event[0]
+
+        self.segments += 1
+        path = os.path.join(self.output_dir, f"event_{self._stamp()}_{reason}.avi")
+        self._event = (path, until)
+        # Olay öncesi frame'ler (ring buffer) - kuyruk yetmezse fazlası atılır
+        if self.ring is not None:
+            for sample in self.ring:
+                self._enqueue((FRAME, path, sample))
+        if self.verbose:
+            print(f"🔴 Kayıt olayı ({reason}): {path}")
+        return path
+
+    def _stamp(self):
+        """Dosya adı için tarih + segment sırası (aynı saniyedeki klipler çakışmasın)"""
+        return f"{time.strftime('%Y%m%d_%H%M%S')}_{self.segments:04d}"
+
+    def _record_continuous(self, sample, now):
+        if self._segment is not None and now >= self._segment[1]:
+            self._enqueue((CLOSE, self._segment[0], None))
+            self._segment = None
+        if self._segment is None:
+            self.segments += 1
+            path = os.path.join(self.output_dir, f"{CONTINUOUS}_{self._stamp()}.avi")
+            self._segment = (path, now + self.segment_seconds)
+        self._enqueue((FRAME, self._segment[0], sample))
+
+    def _writer_loop(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            kind, path, image = job
+            if kind != CLOSE:
+                with self._count_lock:
+                    self._pending -= 1
+            start = time.perf_counter()
+            try:
+                if kind == SNAPSHOT:
+                    if not cv2.imwrite(path, image):
+                        raise IOError(f"yazılamadı: {path}")
+                elif kind == FRAME:
+                    self._write_frame(path, image)
+                elif kind == CLOSE:
+                    writer = self._writers.pop(path, None)
+                    if writer is not None:
+                        writer.release()
+                    continue
+                self.written[kind] += 1
+                self.write_times.add((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                self.write_errors += 1
+                if self.verbose:
+                    print(f"⚠️  Kayıt hatası: {e}")
+
+        for writer in self._writers.values():
+            writer.release()
+        self._writers.clear()
+
+    def _write_frame(self, path, image):
+        writer = self._writers.get(path)
+        if writer is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            h, w = image.shape[:2]
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.codec), self.fps, (w, h))
+            if not writer.isOpened():
+                raise IOError(f"VideoWriter açılamadı: {path}")
+            self._writers[path] = writer
+        writer.write(image)
+
+    @property
+    def recording(self):
+        return self._event is not None
+
+    def get_stats(self):
+        return {
+            "events": dict(self.events),
+            "segments": self.segments,
+            "written": dict(self.written),
+            "dropped": dict(self.dropped),
+            "write_errors": self.write_errors,
+            "queue": self._pending,
+            "queue_peak": self.queue_peak,
+            "write_ms": round(self.write_times.mean(), 2)
+        }
+
+    def stop(self):
+        """Açık klipleri kapat, kuyruktaki işleri bitir ve yazıcıyı durdur"""
+        if not self._thread.is_alive():
+            return
+        with self._lock:
+            if self._event is not None:
+                self._enqueue((CLOSE, self._event[0], None))
+                self._event = None
+            if self._segment is not None:
+                self._enqueue((CLOSE, self._segment[0], None))
+                self._segment = None
+        self._queue.put(_STOP)
+        self._thread.join()
@@ -0,0 +1,382 @@
+import os
+import time
+import threading
+import queue
+import logging
+from collections import namedtuple
+import numpy as np
+import cv2
+
+# Yakalanan frame + meta veri (frame_id: artan sayaç, timestamp: time.monotonic())
+CapturedFrame = namedtuple("CapturedFrame", ["frame_id", "timestamp", "frame"])
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")
+
+
+class EndOfStream(StopIteration):
+    """Kaynakta okunacak frame kalmadı (video/klasör sonu)"""
+
+
+def _make_logger(name, verbose):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+    if not logger.handlers:
+        console_handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+    return logger
+
+
+class FrameSource:
+    """
+    Ortak frame kaynağı arayüzü
+
+    Camera, CSICamera, VideoFileSource, ImageFolderSource ve SyntheticSource bu
+    arayüzü uygular; LiveDetectionApp hangisi verilirse onunla çalışır.
+    """
+    threaded = False
+
+    def read_next(self, timeout=1.0):
+        """
+        Sıradaki frame
+
+        Returns:
+            CapturedFrame(frame_id, timestamp, frame)
+
+        Raises:
+            EndOfStream: Kaynak bitti
+        """
+        raise NotImplementedError
+
+    def read_latest(self, timeout=1.0):
+        """En güncel frame (varsayılan: sıradaki frame)"""
+        return self.read_next(timeout)
+
+    def get_frame(self, latest=True):
+        """
+        Returns:
+            frame: BGR formatında görüntü (H, W, 3)
+        """
+        packet = self.read_latest() if latest else self.read_next()
+        return packet.frame
+
+    def get_resolution(self):
+        """
+        Returns:
+            (width, height)
+        """
+        return self.width, self.height
+
+    def get_capture_stats(self):
+        return {}
+
+    def release(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class _Pacer:
+    def __init__(self, fps, speed=1.0):
+        """Frame'leri kaynak FPS'ine göre gerçek zamanlı teslim etmek için zamanlayıcı"""
+        self.interval = 1.0 / (fps * speed) if fps and fps > 0 else 0.0
+        self.reset(0)
+
+    def reset(self, index):
+        self.start_time = time.monotonic()
+        self.start_index = index
+
+    def due_time(self, index):
+        return self.start_time + (index - self.start_index) * self.interval
+
+    def due_index(self):
+        """Şu ana kadar teslim edilmiş olması gereken frame indeksi"""
+        if self.interval <= 0:
+            return self.start_index
+        return self.start_index + int((time.monotonic() - self.start_time) / self.interval)
+
+    def wait(self, index):
+        delay = self.due_time(index) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, realtime=False, speed=1.0, loop=False, start_frame=0, verbose=False):
+        """
+        Video dosyası kaynağı - saha kayıtlarını tekrar oynatmak için
+
+        Args:
+            path: Video dosyası
+            realtime: True: kaynak FPS'inde teslim et (kamera gibi),
+                      False: olabildiğince hızlı (throughput ölçümü)
+            speed: Gerçek zamanlı modda oynatma hızı çarpanı
+            loop: Sona gelince başa dön
+            start_frame: Başlangıç frame'i
+        """
+        self.logger = _make_logger("VideoFileSource", verbose)
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"❌ Video açılamadı: {path}")
+
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_total = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        self.position = 0
+        self.captured_frames = 0
+        self.dropped_frames = 0
+        self._pacer = _Pacer(self.fps, speed)
+
+        if start_frame:
+            self.seek(start_frame)
+
+        self.logger.info(f"🎞️  Video: {path} ({self.width}x{self.height}, {self.fps:.1f} FPS, "
+                         f"{self.frame_total} frame, {'gerçek zamanlı' if realtime else 'maksimum hız'})")
+
+    def seek(self, frame_index):
+        """Belirtilen frame'e atla"""
+        frame_index = max(0, min(int(frame_index), max(self.frame_total - 1, 0)))
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        self.position = frame_index
+        self._pacer.reset(frame_index)
+
+    def seek_time(self, seconds):
+        """Belirtilen saniyeye atla"""
+        self.seek(seconds * self.fps)
+
+    def _read(self):
+        ret, frame = self.cap.read()
+        if not ret or frame is None:
+            if not self.loop or self.position == 0:
+                raise EndOfStream()
+            self.seek(0)
+            ret, frame = self.cap.read()
+            if not ret or frame is None:
+                raise EndOfStream()
+
+        packet = CapturedFrame(self.position, time.monotonic(), frame)
+        self.position += 1
+        self.captured_frames += 1
+        return packet
+
+    def read_next(self, timeout=1.0):
+        if self.realtime:
+            self._pacer.wait(self.position)
+        return self._read()
+
+    def read_latest(self, timeout=1.0):
+        if not self.realtime:
+            return self._read()
+
+        # Gerçek zamanlı modda tüketici gecikmişse kamera gibi eski frame'leri atla
+        due = self._pacer.due_index()
+        while self.position < due and (self.frame_total <= 0 or self.position < self.frame_total - 1):
+            if not self.cap.grab():
+                break
+            self.position += 1
+            self.dropped_frames += 1
+
+        self._pacer.wait(self.position)
+        return self._read()
+
+    def get_capture_stats(self):
+        return {
+            "captured": self.captured_frames,
+            "dropped": self.dropped_frames,
+            "position": self.position,
+            "total": self.frame_total
+        }
+
+    def release(self):
+        if getattr(self, "cap", None) is not None and self.cap.isOpened():
+            self.cap.release()
+            self.logger.info("🎞️  Video kapatıldı")
+
+
+class ImageFolderSource(FrameSource):
+    def __init__(self, directory, extensions=IMAGE_EXTENSIONS, prefetch=8, fps=None, loop=False, verbose=False):
+        """
+        Görüntü klasörü kaynağı - arka plan thread'i ile önden yükleme
+
+        Args:
+            directory: Görüntü klasörü (dosya adına göre sıralı okunur)
+            extensions: Kabul edilen uzantılar
+            prefetch: Önden decode edilecek görüntü sayısı
+            fps: Teslim hızı (None: olabildiğince hızlı)
+            loop: Sona gelince başa dön
+        """
+        self.logger = _make_logger("ImageFolderSource", verbose)
+        self.directory = directory
+        self.loop = loop
+
+        self.files = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(tuple(extensions))
+        )
+        if not self.files:
+            raise RuntimeError(f"❌ Klasörde görüntü bulunamadı: {directory}")
+
+        first = cv2.imread(self.files[0])
+        if first is None:
+            raise RuntimeError(f"❌ Görüntü okunamadı: {self.files[0]}")
+        self.height, self.width = first.shape[:2]
+
+        self.captured_frames = 0
+        self.read_errors = 0
+        self._pacer = _Pacer(fps)
+        self._queue = queue.Queue(maxsize=max(1, prefetch))
+        self._running = True
+        self._thread = threading.Thread(target=self._prefetch_loop, name="ImageFolderSource-prefetch", daemon=True)
+        self._thread.start()
+
+        self.logger.info(f"🖼️  Klasör: {directory} ({len(self.files)} görüntü, prefetch={prefetch})")
+
+    def _prefetch_loop(self):
+        index = 0
+        while self._running:
+            if index >= len(self.files):
+                if not self.loop:
+                    break
+                index = 0
+
+            frame = cv2.imread(self.files[index])
+            if frame is None:
+                self.read_errors += 1
+                index += 1
+                continue
+
+            item = (index, frame)
+            while self._running:
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            index += 1
+
+        self._put_end()
+
+    def _put_end(self):
+        while self._running:
+            try:
+                self._queue.put(None, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read_next(self, timeout=1.0):
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError("❌ Görüntü önden yükleme zaman aşımı!")
+
+        if item is None:
+            # Diğer okuyucular için bitiş işaretini geri koy
+            self._queue.put(None)
+            raise EndOfStream()
+
+        self._pacer.wait(self.captured_frames)
+        self.captured_frames += 1
+        index, frame = item
+        return CapturedFrame(index, time.monotonic(), frame)
+
+    def get_capture_stats(self):
+        return {
+            "captured": self.captured_frames,
+            "read_errors": self.read_errors,
+            "buffered": self._queue.qsize(),
+            "total": len(self.files)
+        }
+
+    def release(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+
+class SyntheticSource(FrameSource):
+    def __init__(self, width=1280, height=720, num_frames=None, num_objects=20, speed=4,
+                 fps=None, seed=0, verbose=False):
+        """
+        Deterministik sentetik kaynak - kamera/kayıt olmadan tekrarlanabilir test
+
+        Toprak dokulu arka plan üzerinde aşağı doğru kayan yeşil "pancarlar" çizer.
+        Aynı seed ve frame_id her zaman aynı görüntüyü üretir.
+
+        Args:
+            width, height: Frame boyutu
+            num_frames: Toplam frame (None: sonsuz)
+            num_objects: Sahnedeki nesne sayısı
+            speed: Nesnelerin frame başına dikey kayması (piksel)
+            fps: Teslim hızı (None: olabildiğince hızlı)
+            seed: Rastgelelik tohumu
+        """
+        self.logger = _make_logger("SyntheticSource", verbose)
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.speed = speed
+
+        rng = np.random.RandomState(seed)
+        noise = rng.randint(-20, 20, (height, width, 1), dtype=np.int16)
+        base = np.array([40, 70, 110], dtype=np.int16)  # BGR toprak rengi
+        self.background = np.clip(base + noise, 0, 255).astype(np.uint8)
+
+        self.centers = np.stack([
+            rng.randint(20, max(21, width - 20), num_objects),
+            rng.randint(0, height, num_objects)
+        ], axis=1)
+        self.radii = rng.randint(8, 40, num_objects)
+
+        self.frame_id = 0
+        self._pacer = _Pacer(fps)
+
+        self.logger.info(f"🧪 Sentetik kaynak: {width}x{height}, {num_objects} nesne, seed={seed}")
+
+    def get_boxes(self, frame_id):
+        """
+        Frame'deki nesnelerin gerçek kutuları (doğrulama için)
+
+        Returns:
+            boxes: (N, 4) int32 [x1, y1, x2, y2]
+        """
+        x = self.centers[:, 0]
+        y = (self.centers[:, 1] + frame_id * self.speed) % self.height
+        r = self.radii
+        boxes = np.stack([x - r, y - r, x + r, y + r], axis=1)
+        boxes[:, 0::2] = np.clip(boxes[:, 0::2], 0, self.width - 1)
+        boxes[:, 1::2] = np.clip(boxes[:, 1::2], 0, self.height - 1)
+        return boxes.astype(np.int32)
+
+    def render(self, frame_id):
+        """frame_id için görüntüyü üret"""
+        frame = self.background.copy()
+        y = (self.centers[:, 1] + frame_id * self.speed) % self.height
+        for (cx, _), cy, r in zip(self.centers, y, self.radii):
+            cv2.circle(frame, (int(cx), int(cy)), int(r), (40, 160, 60), -1)
+        return frame
+
+    def read_next(self, timeout=1.0):
+        if self.num_frames is not None and self.frame_id >= self.num_frames:
+            raise EndOfStream()
+
+        self._pacer.wait(self.frame_id)
+        packet = CapturedFrame(self.frame_id, time.monotonic(), self.render(self.frame_id))
+        self.frame_id += 1
+        return packet
+
+    def get_capture_stats(self):
+        return {"captured": self.frame_id}
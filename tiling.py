@@ -0,0 +1,147 @@
+import time
+import math
+import numpy as np
+from detections import Detections
+from nms import NMS
+
+
+def _axis_starts(length, tile, count):
+    """Bir eksende count adet tile'ın eşit aralıklı başlangıçları (kenarlar dahil)"""
+    if count <= 1 or length <= tile:
+        return [0]
+    step = (length - tile) / (count - 1)
+    return [int(round(i * step)) for i in range(count)]
+
+
+def tile_grid(width, height, tile_size=640, overlap=0.2, max_tiles=None):
+    """
+    Frame'i örtüşen tile'lara böl
+
+    Tile'lar kenarlara yaslanır ve aradaki adım eşit dağıtılır; gerçek örtüşme
+    en az overlap kadardır. max_tiles aşılırsa tile boyutu büyütülür (tile'lar
+    model girişine letterbox ile küçültülür).
+
+    Args:
+        width, height: Frame boyutu
+        tile_size: Tile kenarı (piksel)
+        overlap: Minimum komşu tile örtüşmesi (tile kenarına oranla)
+        max_tiles: Maksimum tile sayısı (None: sınırsız)
+
+    Returns:
+        tiles: [(x1, y1, x2, y2), ...]
+    """
+    def counts(size):
+        step = max(size * (1.0 - overlap), 1.0)
+        cols = 1 if width <= size else int(math.ceil((width - size) / step)) + 1
+        rows = 1 if height <= size else int(math.ceil((height - size) / step)) + 1
+        return cols, rows
+
+    size = tile_size
+    cols, rows = counts(size)
+    while max_tiles is not None and cols * rows > max_tiles and size < max(width, height):
+        size = int(size * 1.1) + 1
+        cols, rows = counts(size)
+
+    tile_w = min(size, width)
+    tile_h = min(size, height)
+    return [
+        (x, y, x + tile_w, y + tile_h)
+        for y in _axis_starts(height, tile_h, rows)
+        for x in _axis_starts(width, tile_w, cols)
+    ]
+
+
+class TiledDetector:
+    def __init__(self, detector, tile_size=640, overlap=0.2, max_tiles=6, merge_iou=None,
+                 include_full_frame=False, verbose=False):
+        """
+        Döşemeli (sliced) inference - yüksek çözünürlüklü kameralarda küçük pancarlar için
+
+        Frame örtüşen tile'lara bölünür, tile'lar Detector.infer_batch ile tek
+        batch'te çalıştırılır, kutular frame koordinatlarına taşınır ve tile
+        sınırlarındaki tekrarlar NMS ile birleştirilir. Detector ile aynı
+        infer()/stage_times arayüzünü sunar (TrackedDetector ile kullanılabilir).
+
+        Args:
+            detector: Detector (max_batch >= tile sayısı ise tek execution)
+            tile_size: Tile kenarı (piksel, model girişiyle aynı olması önerilir)
+            overlap: Minimum tile örtüşmesi (0-1)
+            max_tiles: Maksimum tile sayısı
+            merge_iou: Birleştirme NMS eşiği (None: detector.iou)
+            include_full_frame: Büyük nesneler için tüm frame'i de batch'e ekle
+        """
+        self.detector = detector
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.max_tiles = max_tiles
+        self.include_full_frame = include_full_frame
+        self.verbose = verbose
+        self.merge = NMS(
+            iou_threshold=merge_iou if merge_iou is not None else detector.iou,
+            max_det=detector.max_det,
+            class_aware=detector.nms.class_aware
+        )
+
+        self._grid_cache = {}
+        self.stage_times = {}
+        self.tile_times = []  # Son çağrıda tile başına süreler (ms)
+        self.frame_count = 0
+
+    def tiles(self, width, height):
+        """Frame boyutu için (önbellekli) tile listesi"""
+        key = (width, height)
+        tiles = self._grid_cache.get(key)
+        if tiles is None:
+            tiles = tile_grid(width, height, self.tile_size, self.overlap, self.max_tiles)
+            self._grid_cache[key] = tiles
+            if self.verbose:
+                print(f"🧩 {width}x{height}: {len(tiles)} tile ({tiles[0][2] - tiles[0][0]}px)")
+        return tiles
+
+    def infer(self, frame):
+        """
+        Returns:
+            Detections: Frame koordinatlarında birleştirilmiş tespitler
+        """
+        if frame is None or frame.size == 0:
+            return Detections.empty()
+
+        self.frame_count += 1
+        h, w = frame.shape[:2]
+        tiles = self.tiles(w, h)
+
+        # Tile'lar kopyasız görünümler; letterbox doğrudan backend buffer'ına yazar
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+        offsets = list(tiles)
+        if self.include_full_frame and len(tiles) > 1:
+            crops.append(frame)
+            offsets.append((0, 0, w, h))
+
+        per_tile = self.detector.infer_batch(crops)
+        self.stage_times = dict(self.detector.stage_times)
+        self.tile_times = [
+            dict(times, tile=offset) for times, offset in zip(self.detector.batch_times, offsets)
+        ]
+        tile_totals = [t.get("preprocess", 0.0) + t.get("infer", 0.0) + t.get("postprocess", 0.0)
+                       for t in self.tile_times]
+        self.stage_times["tile_max"] = max(tile_totals) if tile_totals else 0.0
+
+        # Frame koordinatlarına taşı ve tile sınırlarındaki tekrarları birleştir
+        start = time.perf_counter()
+        shifted = []
+        for detections, (x1, y1, _, _) in zip(per_tile, offsets):
+            if len(detections):
+                boxes = detections.boxes + np.array([x1, y1, x1, y1], dtype=np.int32)
+                shifted.append(Detections(boxes, detections.scores, detections.class_ids))
+        merged = Detections.concatenate(shifted)
+
+        if len(merged) > 1:
+            keep, scores = self.merge(merged.boxes, merged.scores, merged.class_ids)
+            merged = Detections(merged.boxes[keep], scores, merged.class_ids[keep])
+        self.stage_times["merge"] = (time.perf_counter() - start) * 1000
+
+        if self.verbose and self.frame_count % 30 == 0:
+            tile_ms = ", ".join(f"{t:.1f}" for t in tile_totals)
+            print(f"🧩 Frame {self.frame_count}: {len(tiles)} tile [{tile_ms}] ms, {len(merged)} tespit")
+
+        return merged
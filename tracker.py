@@ -0,0 +1,345 @@
+import time
+import numpy as np
+from detections import Detections
+from nms import box_iou_matrix
+
+
+def expand_boxes(boxes, scale):
+    """Kutuları her yönde (genişlik/yükseklik * scale) kadar büyüt (buffered IoU)"""
+    if not scale:
+        return boxes
+    margin = (boxes[:, 2:] - boxes[:, :2]) * scale
+    return np.concatenate([boxes[:, :2] - margin, boxes[:, 2:] + margin], axis=1)
+
+
+def greedy_match(iou, threshold):
+    """
+    IoU matrisinde greedy eşleştirme (azalan IoU sırasıyla)
+
+    Her turda karşılıklı en iyi (satırın en iyisi = sütunun en iyisi) tüm çiftler
+    birlikte seçilir; bu, çiftleri tek tek azalan IoU sırasıyla seçmekle aynı
+    sonucu verir ama turlar vektörel ve az sayıdadır.
+
+    Args:
+        iou: (T, D) track x tespit IoU matrisi
+        threshold: Minimum IoU
+
+    Returns:
+        rows, cols: Eşleşen track ve tespit indeksleri
+    """
+    if iou.size == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    iou = np.where(iou >= threshold, iou, 0.0)
+    all_rows = np.arange(iou.shape[0])
+    rows = []
+    cols = []
+    while True:
+        best_col = iou.argmax(axis=1)
+        best_row = iou.argmax(axis=0)
+        mutual = (best_row[best_col] == all_rows) & (iou[all_rows, best_col] > 0)
+        if not mutual.any():
+            break
+
+        matched_rows = all_rows[mutual]
+        matched_cols = best_col[mutual]
+        rows.append(matched_rows)
+        cols.append(matched_cols)
+        iou[matched_rows, :] = 0
+        iou[:, matched_cols] = 0
+
+    if not rows:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+class Tracker:
+    def __init__(self, high_thresh=0.5, low_thresh=0.1, match_iou=0.3, low_match_iou=0.5,
+                 max_age=30, min_hits=2, velocity_smoothing=0.5, buffer_scale=0.3, verbose=False):
+        """
+        Hafif IoU/ByteTrack tarzı çoklu nesne takibi - kalıcı pancar ID'leri
+
+        Track durumu sütunsal dizilerde tutulur; maliyet matrisi ve eşleştirme
+        vektöreldir. Tespitler arasında kutular sabit hızla ilerletilir, böylece
+        inference her frame'de çalışmak zorunda kalmaz.
+
+        Args:
+            high_thresh: Bu skorun üstündeki tespitler ilk eşleştirmeye girer ve yeni track açabilir
+            low_thresh: high_thresh altı, bunun üstü tespitler sadece mevcut track'leri sürdürür
+            match_iou: İlk eşleştirme için minimum IoU
+            low_match_iou: Düşük skorlu tespitler için minimum IoU
+            max_age: Eşleşmeden kaç frame sonra track silinir
+            min_hits: Track'in onaylanıp ID alması için gereken eşleşme sayısı
+            velocity_smoothing: Hız güncellemesinde yeni ölçümün ağırlığı (0-1)
+            buffer_scale: Eşleştirmede kutular bu oranda büyütülür (buffered IoU) - hızı
+                          henüz bilinmeyen track'ler ve seyrek inference'ta büyük kaymalar için
+        """
+        self.high_thresh = high_thresh
+        self.low_thresh = low_thresh
+        self.match_iou = match_iou
+        self.low_match_iou = low_match_iou
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.velocity_smoothing = velocity_smoothing
+        self.buffer_scale = buffer_scale
+        self.verbose = verbose
+        self.reset()
+
+    def reset(self):
+        """Tüm track'leri sil ve sayaçları sıfırla"""
+        self.boxes = np.empty((0, 4), dtype=np.float32)       # Tahmini güncel kutular
+        self.last_boxes = np.empty((0, 4), dtype=np.float32)  # Son eşleşen tespit
+        self.velocities = np.empty((0, 4), dtype=np.float32)  # Frame başına kutu kayması
+        self.ids = np.empty(0, dtype=np.int32)                # Onaylanmamışsa -1
+        self.scores = np.empty(0, dtype=np.float32)
+        self.class_ids = np.empty(0, dtype=np.int32)
+        self.hits = np.empty(0, dtype=np.int32)
+        self.frames_since_update = np.empty(0, dtype=np.int32)
+
+        self.next_id = 1
+        self.frame_id = None
+        self.updates = 0
+        self.predictions = 0
+
+    @property
+    def unique_count(self):
+        """Şimdiye kadar onaylanan farklı nesne sayısı"""
+        return self.next_id - 1
+
+    @property
+    def active_count(self):
+        return int(np.count_nonzero(self.ids > 0))
+
+    def _advance(self, frame_id=None):
+        """Kutuları sabit hızla ilerlet (frame_id verilirse atlanan frame'ler dahil)"""
+        steps = 1
+        if frame_id is not None:
+            if self.frame_id is not None:
+                steps = max(int(frame_id) - self.frame_id, 1)
+            self.frame_id = int(frame_id)
+
+        if len(self.boxes):
+            self.boxes += self.velocities * steps
+            self.frames_since_update += steps
+
+    def _prune(self):
+        alive = self.frames_since_update <= self.max_age
+        if not alive.all():
+            self._select(alive)
+
+    def _select(self, mask):
+        self.boxes = self.boxes[mask]
+        self.last_boxes = self.last_boxes[mask]
+        self.velocities = self.velocities[mask]
+        self.ids = self.ids[mask]
+        self.scores = self.scores[mask]
+        self.class_ids = self.class_ids[mask]
+        self.hits = self.hits[mask]
+        self.frames_since_update = self.frames_since_update[mask]
+
+    def _match(self, track_indices, detections, threshold):
+        """Track alt kümesi ile tespitleri IoU (aynı sınıf) üzerinden eşleştir"""
+        if len(track_indices) == 0 or len(detections) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        iou = box_iou_matrix(
+            expand_boxes(self.boxes[track_indices], self.buffer_scale),
+            expand_boxes(detections.boxes.astype(np.float32), self.buffer_scale)
+        )
+        iou[self.class_ids[track_indices][:, None] != detections.class_ids[None, :]] = 0
+        rows, cols = greedy_match(iou, threshold)
+        return track_indices[rows], cols
+
+    def update(self, detections, frame_id=None):
+        """
+        Yeni tespitlerle track'leri güncelle
+
+        Args:
+            detections: Detections (NMS sonrası)
+            frame_id: Kaynağın frame ID'si (atlanan frame'leri hesaba katmak için)
+
+        Returns:
+            Detections: Eşleşen ve yeni tespitler + track_ids (onaylanmamışsa -1)
+        """
+        self._advance(frame_id)
+        self.updates += 1
+
+        high = detections.scores >= self.high_thresh
+        low = ~high & (detections.scores >= self.low_thresh)
+        high_idx = np.flatnonzero(high)
+        low_idx = np.flatnonzero(low)
+
+        # 1. aşama: yüksek skorlu tespitler <-> tüm track'ler
+        all_tracks = np.arange(len(self.boxes))
+        tracks_a, dets_a = self._match(all_tracks, detections[high_idx], self.match_iou)
+        dets_a = high_idx[dets_a]
+
+        # 2. aşama (ByteTrack): eşleşmeyen track'ler <-> düşük skorlu tespitler
+        remaining = np.setdiff1d(all_tracks, tracks_a, assume_unique=True)
+        tracks_b, dets_b = self._match(remaining, detections[low_idx], self.low_match_iou)
+        dets_b = low_idx[dets_b]
+
+        track_idx = np.concatenate([tracks_a, tracks_b])
+        det_idx = np.concatenate([dets_a, dets_b])
+        self._update_matched(track_idx, detections, det_idx)
+
+        # Eşleşmeyen yüksek skorlu tespitler -> yeni (onaysız) track
+        new_idx = np.setdiff1d(high_idx, dets_a, assume_unique=True)
+        first_new = len(self.boxes)
+        self._spawn(detections, new_idx)
+        self._confirm()
+
+        # Çıktı: bu frame'de tespitle desteklenen track'ler
+        out_det = np.concatenate([det_idx, new_idx])
+        out_tracks = np.concatenate([track_idx, np.arange(first_new, first_new + len(new_idx))])
+        result = detections[out_det].with_track_ids(self.ids[out_tracks])
+
+        # Onaylanmadan eşleşmesi kopan track'ler (tek seferlik yanlış tespitler) hemen silinir
+        alive = np.ones(len(self.boxes), dtype=bool)
+        alive[:first_new] = (self.ids[:first_new] > 0) | (self.frames_since_update[:first_new] == 0)
+        alive &= self.frames_since_update <= self.max_age
+        if not alive.all():
+            self._select(alive)
+
+        order = np.argsort(-result.scores, kind="stable")
+        return result[order]
+
+    def _update_matched(self, track_idx, detections, det_idx):
+        if len(track_idx) == 0:
+            return
+
+        new_boxes = detections.boxes[det_idx].astype(np.float32)
+        elapsed = np.maximum(self.frames_since_update[track_idx], 1).astype(np.float32)[:, None]
+        measured = (new_boxes - self.last_boxes[track_idx]) / elapsed
+
+        # İlk eşleşmede hız doğrudan ölçülür, sonra üstel yumuşatma
+        alpha = np.where(self.hits[track_idx] > 1, self.velocity_smoothing, 1.0).astype(np.float32)[:, None]
+        self.velocities[track_idx] = alpha * measured + (1 - alpha) * self.velocities[track_idx]
+
+        self.boxes[track_idx] = new_boxes
+        self.last_boxes[track_idx] = new_boxes
+        self.scores[track_idx] = detections.scores[det_idx]
+        self.hits[track_idx] += 1
+        self.frames_since_update[track_idx] = 0
+
+    def _spawn(self, detections, det_idx):
+        if len(det_idx) == 0:
+            return
+
+        n = len(det_idx)
+        boxes = detections.boxes[det_idx].astype(np.float32)
+        self.boxes = np.concatenate([self.boxes, boxes])
+        self.last_boxes = np.concatenate([self.last_boxes, boxes])
+        self.velocities = np.concatenate([self.velocities, np.zeros((n, 4), dtype=np.float32)])
+        self.ids = np.concatenate([self.ids, np.full(n, -1, dtype=np.int32)])
+        self.scores = np.concatenate([self.scores, detections.scores[det_idx]])
+        self.class_ids = np.concatenate([self.class_ids, detections.class_ids[det_idx]])
+        self.hits = np.concatenate([self.hits, np.ones(n, dtype=np.int32)])
+        self.frames_since_update = np.concatenate([self.frames_since_update, np.zeros(n, dtype=np.int32)])
+
+    def _confirm(self):
+        """min_hits'e ulaşan track'lere kalıcı ID ver"""
+        new = (self.ids < 0) & (self.hits >= self.min_hits)
+        count = int(np.count_nonzero(new))
+        if count:
+            self.ids[new] = np.arange(self.next_id, self.next_id + count, dtype=np.int32)
+            self.next_id += count
+            if self.verbose:
+                print(f"🆔 {count} yeni pancar (toplam benzersiz: {self.unique_count})")
+
+    def predict(self, frame_id=None):
+        """
+        Tespit olmadan bir frame ilerlet (detect-every-N modunda aradaki frame'ler)
+
+        Returns:
+            Detections: Onaylı track'lerin tahmini kutuları + track_ids
+        """
+        self._advance(frame_id)
+        self.predictions += 1
+        self._prune()
+
+        confirmed = self.ids > 0
+        return Detections(
+            np.round(self.boxes[confirmed]),
+            self.scores[confirmed],
+            self.class_ids[confirmed],
+            self.ids[confirmed]
+        )
+
+    def get_stats(self):
+        return {
+            "unique": self.unique_count,
+            "active": self.active_count,
+            "tentative": int(np.count_nonzero(self.ids < 0)),
+            "updates": self.updates,
+            "predictions": self.predictions
+        }
+
+
+class TrackedDetector:
+    def __init__(self, detector, tracker=None, detect_every=1, detect_fps=None, clock=time.perf_counter):
+        """
+        Detector + Tracker: tam inference sadece her N frame'de (veya hedef
+        hızda) çalışır, aradaki frame'lerde tracker kutuları ilerletir
+
+        Args:
+            detector: Detector
+            tracker: Tracker (None: varsayılan ayarlarla oluşturulur)
+            detect_every: Kaç frame'de bir inference (1: her frame)
+            detect_fps: Hedef inference hızı (verilirse detect_every yerine kullanılır)
+            clock: Monotonik saat
+        """
+        self.detector = detector
+        self.tracker = tracker if tracker is not None else Tracker()
+        self.detect_every = max(1, int(detect_every))
+        self.detect_interval = 1.0 / detect_fps if detect_fps else None
+        self.clock = clock
+
+        self.frame_count = 0
+        self.detect_count = 0
+        self.last_detected = False  # Son infer() çağrısında tam inference çalıştı mı
+        self._last_detect = None
+        self.stage_times = {}
+
+    def should_detect(self):
+        """Bu frame'de tam inference çalışmalı mı? (çağrı frame'i sayar)"""
+        self.frame_count += 1
+        if self.detect_interval is not None:
+            now = self.clock()
+            due = self._last_detect is None or now - self._last_detect >= self.detect_interval
+            if due:
+                self._last_detect = now
+        else:
+            due = (self.frame_count - 1) % self.detect_every == 0
+
+        if due:
+            self.detect_count += 1
+        return due
+
+    def infer(self, frame, frame_id=None):
+        """
+        Returns:
+            Detections (track_ids ile)
+        """
+        self.last_detected = self.should_detect()
+        if self.last_detected:
+            results = self.detector.infer(frame)
+            start = time.perf_counter()
+            results = self.tracker.update(results, frame_id)
+            self.stage_times = dict(self.detector.stage_times)
+        else:
+            start = time.perf_counter()
+            results = self.tracker.predict(frame_id)
+            self.stage_times = {}
+        self.stage_times["track"] = (time.perf_counter() - start) * 1000
+        return results
+
+    @property
+    def unique_count(self):
+        return self.tracker.unique_count
+
+    def get_stats(self):
+        stats = self.tracker.get_stats()
+        stats["frames"] = self.frame_count
+        stats["detected_frames"] = self.detect_count
+        return stats
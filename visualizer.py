@@ -1,55 +1,241 @@
+import time
 import cv2
 import numpy as np # Manuel çizim için gerekli
+from detections import Detections
+
+RENDER_COPY = "copy"        # Frame kopyasına çiz (frame değişmez)
+RENDER_INPLACE = "inplace"  # Frame'in üzerine çiz (kopya yok - frame sonra kullanılmamalı)
+RENDER_BUFFER = "buffer"    # Yeniden kullanılan tek buffer'a çiz (tahsis yok - tek tüketici)
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_SCALE = 0.6
+HUD_SCALE = 0.5
+HUD_COLOR = (0, 255, 0)
+
 
 class Visualizer:
-    def __init__(self, class_names):
+    def __init__(self, class_names, mode=RENDER_COPY, scale=1.0, max_fps=None, score_step=0.01,
+                 hud_interval=0.5, max_sprites=1024, clock=time.perf_counter):
+        """
+        Tespit kutuları, etiketler ve metrik paneli (HUD) çizimi
+
+        Etiketler (arka plan + yazı) bir kez render edilip sprite olarak
+        önbelleğe alınır, her frame'de sadece kopyalanır. HUD hud_interval
+        saniyede bir küçük bir overlay'e çizilir, arada aynı overlay
+        maskeyle yapıştırılır.
+
+        Args:
+            class_names: Sınıf adları
+            mode: RENDER_COPY, RENDER_INPLACE veya RENDER_BUFFER
+            scale: Çizim/gösterim ölçeği (ör. 0.5: 1080p frame 960x540 çizilir)
+            max_fps: Gösterim hızı sınırı (None: her frame) - bkz. due()
+            score_step: Etiketteki skor adımı (sprite sayısını sınırlar)
+            hud_interval: HUD yenileme aralığı (saniye, 0: her frame)
+            max_sprites: Önbellekteki en fazla sprite (dolunca temizlenir)
+        """
         self.class_names = class_names
         # çoklu sınıf tespitleri için rastgele bir renk oluşturma
-        #np.random.seed(42) 
+        #np.random.seed(42)
         #self.colors = np.random.randint(0, 255, size=(len(class_names), 3), dtype="uint8")
-        
+
         # Tek sınıf için sabit bir renk
         self.colors = np.array([[0, 255, 0]], dtype="uint8")
 
+        if mode not in (RENDER_COPY, RENDER_INPLACE, RENDER_BUFFER):
+            raise ValueError(f"❌ Bilinmeyen çizim modu: {mode}")
+        self.mode = mode
+        self.scale = scale
+        self.max_fps = max_fps
+        self.score_step = score_step
+        self.hud_interval = hud_interval
+        self.max_sprites = max_sprites
+        self.clock = clock
+
+        self.last = None              # Son çizilen görüntü (ekran görüntüsü için)
+        self.rendered = 0
+        self.skipped = 0
+        self._buffer = None
+        self._last_render = None
+        self._sprites = {}            # (tür, anahtar) -> sprite veya yazı ofseti
+        self._hud = None              # (overlay, mask)
+        self._hud_time = None
+
+        # Etiket yüksekliği yazıdan bağımsız sabit (glyph metrikleri bir kez ölçülür)
+        (_, self._label_h), _ = cv2.getTextSize("#0123456789", FONT, LABEL_SCALE, 1)
+
+    def due(self):
+        """
+        Bu frame çizilip gösterilmeli mi? (max_fps sınırı, inference hızından bağımsız)
+
+        Returns:
+            True: çiz ve göster; False: bu frame'i atla
+        """
+        if self.max_fps is None:
+            return True
+        now = self.clock()
+        if self._last_render is not None and now - self._last_render < 1.0 / self.max_fps:
+            self.skipped += 1
+            return False
+        # Sabit aralıklı zamanlama - geç kalan frame sonraki hedefi kaydırmasın
+        if self._last_render is None or now - self._last_render > 2.0 / self.max_fps:
+            self._last_render = now
+        else:
+            self._last_render += 1.0 / self.max_fps
+        return True
+
+    def _canvas(self, frame):
+        """Çizilecek görüntü (moda ve ölçeğe göre kopya, frame'in kendisi veya buffer)"""
+        if self.scale != 1.0:
+            h, w = frame.shape[:2]
+            size = (max(1, int(round(w * self.scale))), max(1, int(round(h * self.scale))))
+            # Küçültme zaten yeni görüntü üretir; paylaşılan buffer sadece RENDER_BUFFER'da
+            if self.mode != RENDER_BUFFER:
+                return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            if self._buffer is None or self._buffer.shape[:2] != (size[1], size[0]):
+                self._buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            return cv2.resize(frame, size, dst=self._buffer, interpolation=cv2.INTER_AREA)
+
+        if self.mode == RENDER_INPLACE:
+            return frame
+        if self.mode == RENDER_BUFFER:
+            if self._buffer is None or self._buffer.shape != frame.shape:
+                self._buffer = np.empty_like(frame)
+            np.copyto(self._buffer, frame)
+            return self._buffer
+        return frame.copy()
+
+    def _sprite(self, kind, key, text, color):
+        """Önbellekten etiket sprite'ı (yoksa render et)"""
+        sprite = self._sprites.get((kind, key))
+        if sprite is None:
+            if len(self._sprites) >= self.max_sprites:
+                self._sprites.clear()
+            (w, _), _ = cv2.getTextSize(text, FONT, LABEL_SCALE, 1)
+            h = self._label_h
+            sprite = np.empty((h + 11, w + 1, 3), dtype=np.uint8)
+            sprite[:] = color
+            cv2.putText(sprite, text, (0, h + 5), FONT, LABEL_SCALE, (255, 255, 255), 1, cv2.LINE_AA)
+            self._sprites[(kind, key)] = sprite
+        return sprite
+
+    def _advance(self, prefix, class_id):
+        """Önek sonrası yazının başlangıç ofseti (alt piksel yuvarlama tam etiketle aynı olsun)"""
+        key = ("advance", (prefix, class_id))
+        advance = self._sprites.get(key)
+        if advance is None:
+            name = self.class_names[class_id]
+            advance = cv2.getTextSize(prefix + name, FONT, LABEL_SCALE, 1)[0][0] - \
+                cv2.getTextSize(name, FONT, LABEL_SCALE, 1)[0][0]
+            self._sprites[key] = advance
+        return advance
+
+    @staticmethod
+    def _paste(image, sprite, x, y):
+        """Sprite'ı (x, y) sol üst köşeye kırparak kopyala"""
+        h, w = sprite.shape[:2]
+        img_h, img_w = image.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, img_w), min(y + h, img_h)
+        if x1 <= x0 or y1 <= y0:
+            return
+        image[y0:y1, x0:x1] = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+
     def draw(self, frame, results, metrics):
-        annotated = frame.copy() 
-        
-        
-        for detection in results:
-            box = detection['box']
-            score = detection['score']
-            
+        annotated = self._canvas(frame)
+
+        # Detections (veya eski liste-sözlük formatı) sütunlarını tek seferde Python'a al
+        detections = Detections.from_dicts(results)
+        track_ids = detections.track_ids.tolist() if detections.track_ids is not None else None
+        boxes = detections.boxes
+        if self.scale != 1.0 and len(detections):
+            boxes = (boxes * self.scale).astype(np.int32)
+        # Skorlar score_step adımına yuvarlanır (her adım için tek sprite)
+        buckets = np.rint(detections.scores / self.score_step).astype(np.int64).tolist()
+
+        for i, (box, bucket) in enumerate(zip(boxes.tolist(), buckets)):
             #tek sınıf için
             class_id = 0
-            #class_id = detection['class_id']
+            #class_id = detections.class_ids[i]
 
             # Kutu Koordinatları (x1, y1, x2, y2)
             x1, y1, x2, y2 = box
-            
+
             # Renk ve Sınıf Adı
             color = [int(c) for c in self.colors[class_id]]
-            class_name = self.class_names[class_id]
-            label = f"{class_name}: {score:.2f}"
 
             # Kutuyu Çizme
             cv2.rectangle(annotated, (x1, y1), (x2, y2), color, 2)
-            
-            # Etiket için arka planı çizme
-            (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)
-            cv2.rectangle(annotated, (x1, y1 - h - 10), (x1 + w, y1), color, -1)
-            
-            # Etiketi kutunun üzerine yazma
-            cv2.putText(annotated, label, (x1, y1 - 5),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
-
-        # Metrikleri Çizme 
+
+            # Etiket: "#id " ve "sınıf: skor" parçaları ayrı sprite (track ID'ler skorla çoğalmasın)
+            # Onaylanmamış track'ler (-1) ID'siz etiketlenir
+            x = x1
+            top = y1 - self._label_h - 10
+            track_id = track_ids[i] if track_ids is not None else -1
+            if track_id >= 0:
+                prefix = f"#{track_id} "
+                sprite = self._sprite("track", (track_id, class_id), prefix, color)
+                self._paste(annotated, sprite, x, top)
+                x += self._advance(prefix, class_id)
+            label = f"{self.class_names[class_id]}: {bucket * self.score_step:.2f}"
+            self._paste(annotated, self._sprite("label", (class_id, bucket), label, color), x, top)
+
+        # Metrikleri Çizme
         if annotated is not None:
-            cv2.putText(annotated, f"FPS {metrics['fps']:.2f}", (10, 25),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            cv2.putText(annotated, f"Image Acquisition {metrics['img_acq']:.2f} ms", (10, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            cv2.putText(annotated, f"Inference {metrics['inf']:.2f} ms", (10, 75),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            cv2.putText(annotated, f"Latency {metrics['latency']:.2f} ms", (10, 100),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-        return annotated
\ No newline at end of file
+            self._draw_hud(annotated, metrics)
+        self.last = annotated
+        self.rendered += 1
+        return annotated
+
+    def _draw_hud(self, annotated, metrics):
+        """Metrik panelini önbellekteki overlay'den uygula (hud_interval'de bir yeniden çiz)"""
+        now = self.clock()
+        if self._hud is None or self._hud_time is None or now - self._hud_time >= self.hud_interval:
+            self._hud = self._render_hud(metrics)
+            self._hud_time = now
+
+        # Sadece yazı pikselleri harmanlanır (panel arka planı görüntüyü örtmez)
+        ys, xs, tint, inverse = self._hud
+        img_h, img_w = annotated.shape[:2]
+        if ys.size and (ys[-1] >= img_h or xs.max() >= img_w):
+            inside = (ys < img_h) & (xs < img_w)
+            ys, xs, tint, inverse = ys[inside], xs[inside], tint[inside], inverse[inside]
+        pixels = annotated[ys, xs].astype(np.uint16)
+        annotated[ys, xs] = ((pixels * inverse + tint + 127) // 255).astype(np.uint8)
+
+    def _render_hud(self, metrics):
+        """
+        HUD yazılarını alfa maskesine çiz
+
+        Returns:
+            ys, xs: Yazı piksellerinin koordinatları
+            tint: alfa * renk (piksel başına, uint16)
+            inverse: 255 - alfa
+        """
+        # Kuyruk gecikmesi (p95) varsa ortalamanın yanında göster
+        latency_p95 = metrics.get('stages', {}).get('latency', {}).get('p95')
+        latency_text = f"Latency {metrics['latency']:.2f} ms"
+        if latency_p95 is not None:
+            latency_text += f" (p95 {latency_p95:.2f})"
+        lines = [
+            f"FPS {metrics['fps']:.2f}",
+            f"Image Acquisition {metrics['img_acq']:.2f} ms",
+            f"Inference {metrics['inf']:.2f} ms",
+            latency_text
+        ]
+
+        width = max(cv2.getTextSize(line, FONT, HUD_SCALE, 1)[0][0] for line in lines) + 12
+        alpha = np.zeros((110, width), dtype=np.uint8)
+        for i, line in enumerate(lines):
+            cv2.putText(alpha, line, (10, 25 * (i + 1)), FONT, HUD_SCALE, 255, 1)
+
+        ys, xs = np.nonzero(alpha)
+        weights = alpha[ys, xs].astype(np.uint16)[:, None]
+        tint = weights * np.array(HUD_COLOR, dtype=np.uint16)
+        return ys, xs, tint, 255 - weights
+
+    def get_stats(self):
+        return {
+            "rendered": self.rendered,
+            "skipped": self.skipped,
+            "sprites": len(self._sprites)
+        }